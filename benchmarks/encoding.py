@@ -0,0 +1,86 @@
+"""
+Compare the legacy JSON message encoding with the compact encoding.
+
+Usage: python -m benchmarks.encoding [--messages 50] [--iterations 2000]
+
+Reports stored bytes per conversation and the per-message cost of encoding
+and decoding through RedisClient's codec.
+"""
+import json
+import time
+import argparse
+from typing import Callable, List, Tuple
+from debater.models.conversation import Role
+from debater.utils.codec import decode_message, encode_message
+
+USER_MESSAGES = [
+    "I think remote work is better than office work.",
+    "But people save hours every week by not commuting, that's time for family and rest.",
+    "Studies show productivity often goes up at home, not down.",
+    "Offices are full of interruptions. How is that better for focused work?",
+]
+
+BOT_MESSAGES = [
+    "I understand the appeal of skipping the commute, but I'm confident that offices remain the better choice. "
+    "Face-to-face collaboration sparks ideas that video calls simply can't replicate, and junior employees learn "
+    "far faster by watching experienced colleagues work. Culture, trust and mentorship are built in shared spaces.",
+    "Those productivity studies mostly measure individual output over short periods. Over the long run, teams that "
+    "work together in person innovate more, because the unplanned conversations in hallways and kitchens are where "
+    "problems get solved. Remote work optimizes for the task at hand and quietly sacrifices the team's future.",
+    "Interruptions are a management problem, not an office problem. Quiet rooms and focus hours fix them, while the "
+    "isolation of remote work has no easy fix. People need real human connection to thrive, and the evidence on "
+    "loneliness and burnout among remote workers is hard to ignore. The office gives structure and community.",
+]
+
+
+def build_conversation(size: int) -> List[Tuple[Role, str]]:
+    """Alternate user and bot turns, like a stored debate"""
+    conversation = []
+    for i in range(size):
+        if i % 2 == 0:
+            conversation.append((Role.USER, USER_MESSAGES[(i // 2) % len(USER_MESSAGES)]))
+        else:
+            conversation.append((Role.BOT, BOT_MESSAGES[(i // 2) % len(BOT_MESSAGES)]))
+    return conversation
+
+
+def legacy_encode(role: Role, message: str) -> bytes:
+    return json.dumps({"role": role.value, "message": message}).encode("utf-8")
+
+
+def per_message_us(fn: Callable[[], None], messages: int, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / (iterations * messages) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=50, help="messages per conversation")
+    parser.add_argument("--iterations", type=int, default=2000, help="timed passes over the conversation")
+    args = parser.parse_args()
+
+    conversation = build_conversation(args.messages)
+    legacy = [legacy_encode(role, message) for role, message in conversation]
+    compact = [encode_message(role, message) for role, message in conversation]
+
+    rows = [
+        ("legacy json", legacy, lambda: [legacy_encode(r, m) for r, m in conversation], lambda: [decode_message(e) for e in legacy]),
+        ("compact", compact, lambda: [encode_message(r, m) for r, m in conversation], lambda: [decode_message(e) for e in compact]),
+    ]
+
+    print(f"{args.messages} messages per conversation, {args.iterations} iterations")
+    print(f"{'encoding':<12} {'bytes/conv':>10} {'encode us/msg':>14} {'decode us/msg':>14}")
+    for name, entries, encode, decode in rows:
+        size = sum(len(entry) for entry in entries)
+        encode_us = per_message_us(encode, args.messages, args.iterations)
+        decode_us = per_message_us(decode, args.messages, args.iterations)
+        print(f"{name:<12} {size:>10} {encode_us:>14.2f} {decode_us:>14.2f}")
+
+    saved = 1 - sum(map(len, compact)) / sum(map(len, legacy))
+    print(f"compact encoding saves {saved:.0%} of message payload bytes")
+
+
+if __name__ == "__main__":
+    main()
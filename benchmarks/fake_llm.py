@@ -0,0 +1,145 @@
+"""
+Stand-in for the OpenAI chat completions API, for offline load tests.
+
+Usage: python -m benchmarks.fake_llm [--port 8100] [--latency 0.3] [--tokens-per-second 50]
+
+Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8100/v1. Replies
+are canned but shaped like the real ones: topic detection and evaluation
+prompts get valid JSON, everything else gets prose. Time to first token and
+the token rate are configurable, streaming is supported, and usage reports
+cached prompt tokens for repeated system prefixes like the real provider.
+"""
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from typing import Any, AsyncIterator, Dict, List
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from debater.services.context_builder import estimate_tokens
+from debater.services.prompts import EVALUATION_SYSTEM, TOPIC_DETECTION_SYSTEM
+
+# Providers only cache prefixes of at least this many tokens, in 128-token steps
+MIN_CACHED_PREFIX = 1024
+
+WORDS = (
+    "I remain convinced that my position holds because the evidence consistently points the same way and "
+    "every counter example you raise actually reinforces the broader pattern we have been discussing"
+).split()
+
+EVALUATION_REPLY = {
+    "scores": {
+        "logical_coherence": 8,
+        "evidence_usage": 7,
+        "emotional_appeal": 6,
+        "counter_argument_handling": 7,
+        "clarity_structure": 8,
+        "overall_persuasiveness": 7
+    },
+    "analysis": {
+        "strengths": ["Clear logical structure"],
+        "weaknesses": ["Could use more evidence"],
+        "missed_opportunities": [],
+        "improvements": ["Add concrete examples"]
+    },
+    "summary": "Consistent and reasonably persuasive"
+}
+
+
+def create_app(latency: float = 0.3, tokens_per_second: float = 50.0, reply_tokens: int = 60) -> FastAPI:
+    """Build the fake LLM server"""
+    app = FastAPI()
+    seen_prefixes = set()
+
+    def reply_for(messages: List[Dict[str, Any]]) -> str:
+        system = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
+        if system == TOPIC_DETECTION_SYSTEM:
+            opener = messages[-1]["content"][:80]
+            return json.dumps({
+                "topic": opener,
+                "bot_position": f"The opposite of: {opener}",
+                "user_position": opener
+            })
+        if system == EVALUATION_SYSTEM:
+            return json.dumps(EVALUATION_REPLY)
+        return " ".join(WORDS[i % len(WORDS)] for i in range(reply_tokens))
+
+    def usage_for(messages: List[Dict[str, Any]], completion: str) -> Dict[str, Any]:
+        prompt_tokens = sum(estimate_tokens(msg["content"]) for msg in messages)
+        cached_tokens = 0
+        if messages and messages[0]["role"] == "system":
+            prefix = messages[0]["content"]
+            prefix_tokens = estimate_tokens(prefix)
+            if prefix in seen_prefixes and prefix_tokens >= MIN_CACHED_PREFIX:
+                cached_tokens = prefix_tokens - prefix_tokens % 128
+            seen_prefixes.add(prefix)
+        completion_tokens = estimate_tokens(completion)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens}
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        completion = reply_for(messages)
+        usage = usage_for(messages, completion)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        base = {"id": completion_id, "created": int(time.time()), "model": body.get("model", "fake")}
+
+        if not body.get("stream"):
+            await asyncio.sleep(latency + usage["completion_tokens"] / tokens_per_second)
+            return JSONResponse(dict(
+                base,
+                object="chat.completion",
+                choices=[{"index": 0, "message": {"role": "assistant", "content": completion}, "finish_reason": "stop"}],
+                usage=usage
+            ))
+
+        include_usage = (body.get("stream_options") or {}).get("include_usage", False)
+
+        async def events() -> AsyncIterator[str]:
+            await asyncio.sleep(latency)
+            words = completion.split(" ")
+            for i, word in enumerate(words):
+                token = word if i == len(words) - 1 else word + " "
+                chunk = dict(base, object="chat.completion.chunk", choices=[
+                    {"index": 0, "delta": {"content": token}, "finish_reason": None}
+                ])
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(1 / tokens_per_second)
+            done = dict(base, object="chat.completion.chunk", choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}])
+            yield f"data: {json.dumps(done)}\n\n"
+            if include_usage:
+                yield f"data: {json.dumps(dict(base, object='chat.completion.chunk', choices=[], usage=usage))}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible chat completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.3, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--reply-tokens", type=int, default=60, help="words per prose reply")
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(args.latency, args.tokens_per_second, args.reply_tokens),
+        host=args.host,
+        port=args.port,
+        log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Offline load test for the debate API.
+
+Usage: python -m benchmarks.load_test [--conversations 50] [--turns 3] [--concurrency 10]
+                                      [--redis-url redis://localhost:6379]
+                                      [--latency 0.3] [--tokens-per-second 50]
+                                      [--output benchmarks/results] [--compare PREVIOUS.json]
+
+Starts the fake LLM server (benchmarks.fake_llm) in a background thread,
+points the app at it and drives /chat in-process: first a phase opening
+`--conversations` new debates, then `--turns` rounds continuing every one of
+them, each at the target concurrency. Redis is an in-process fake unless
+`--redis-url` is given. Reports p50/p95/p99 latency, requests per second and
+Redis commands and round trips per turn for each phase, and saves the
+results as JSON so runs can be compared with `--compare`.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import asyncio
+import argparse
+import importlib
+import threading
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import httpx
+import uvicorn
+from benchmarks.fake_llm import create_app as create_fake_llm
+
+OPENERS = [
+    "Remote work is better than office work",
+    "Cats make better pets than dogs",
+    "Social media does more harm than good",
+    "Nuclear power is the best answer to climate change",
+    "Homework should be banned",
+    "Electric cars are overrated",
+    "Pineapple belongs on pizza",
+    "College should be free",
+    "Video games are a form of art",
+    "Space exploration is a waste of money",
+]
+
+REPLIES = [
+    "I don't buy that, the data says otherwise.",
+    "That's a fair point, but what about the costs?",
+    "You're ignoring how this affects ordinary people.",
+    "History shows the opposite is true.",
+]
+
+
+class CommandCounter:
+    """Counts redis commands and round trips made through instrumented clients"""
+
+    def __init__(self):
+        self.commands = 0
+        self.round_trips = 0
+
+    def instrument(self, client) -> None:
+        execute_command = client.execute_command
+        pipeline = client.pipeline
+
+        async def counted_execute_command(*args, **options):
+            self.commands += 1
+            self.round_trips += 1
+            return await execute_command(*args, **options)
+
+        def counted_pipeline(*args, **kwargs):
+            pipe = pipeline(*args, **kwargs)
+            execute = pipe.execute
+
+            async def counted_execute(*execute_args, **execute_kwargs):
+                self.commands += len(pipe.command_stack)
+                self.round_trips += 1
+                return await execute(*execute_args, **execute_kwargs)
+
+            pipe.execute = counted_execute
+            return pipe
+
+        client.execute_command = counted_execute_command
+        client.pipeline = counted_pipeline
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+async def run_phase(
+    calls: List[Callable[[], Awaitable[httpx.Response]]],
+    concurrency: int,
+    counter: CommandCounter
+) -> Dict[str, Any]:
+    """Run the calls at the given concurrency and summarize latency and redis usage"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def timed(call):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await call()
+                if response.status_code != 200:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    commands, round_trips = counter.commands, counter.round_trips
+    started = time.perf_counter()
+    await asyncio.gather(*[timed(call) for call in calls])
+    elapsed = time.perf_counter() - started
+
+    requests = len(calls)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+        "redis_commands_per_turn": round((counter.commands - commands) / requests, 2) if requests else 0.0,
+        "redis_round_trips_per_turn": round((counter.round_trips - round_trips) / requests, 2) if requests else 0.0
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_llm(port: int, latency: float, tokens_per_second: float) -> uvicorn.Server:
+    """Serve the fake LLM from a background thread with its own event loop"""
+    server = uvicorn.Server(uvicorn.Config(
+        create_fake_llm(latency, tokens_per_second),
+        host="127.0.0.1",
+        port=port,
+        log_level="warning"
+    ))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    # Settings are read when the app module is imported, so configure it first
+    os.environ["OPENAI_API_KEY"] = "benchmark"
+    os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{args.llm_port}/v1"
+    if args.redis_url:
+        os.environ["REDIS_URL"] = args.redis_url
+    app_module = importlib.import_module("debater.app")
+    # The transport does not run the lifespan, so create the resources here
+    app_module.configure()
+
+    redis_client = app_module.redis_client
+    if not args.redis_url:
+        import fakeredis
+        server = fakeredis.FakeServer()
+        redis_client.redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        redis_client.binary = fakeredis.FakeAsyncRedis(server=server, decode_responses=False)
+
+    counter = CommandCounter()
+    counter.instrument(redis_client.redis)
+    counter.instrument(redis_client.binary)
+
+    transport = httpx.ASGITransport(app=app_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://debater", timeout=120) as client:
+        conversation_ids = []
+
+        def new_conversation(i: int):
+            async def call():
+                response = await client.post("/chat", json={"message": OPENERS[i % len(OPENERS)]})
+                if response.status_code == 200:
+                    conversation_ids.append(response.json()["conversation_id"])
+                return response
+            return call
+
+        def continue_conversation(conversation_id: str, turn: int):
+            return lambda: client.post("/chat", json={
+                "conversation_id": conversation_id,
+                "message": REPLIES[turn % len(REPLIES)]
+            })
+
+        phases = {"new": await run_phase(
+            [new_conversation(i) for i in range(args.conversations)], args.concurrency, counter
+        )}
+        calls = [
+            continue_conversation(conversation_id, turn)
+            for turn in range(args.turns)
+            for conversation_id in conversation_ids
+        ]
+        # Rounds run back to back; one conversation never has two turns in flight
+        rounds = [calls[i:i + len(conversation_ids)] for i in range(0, len(calls), max(len(conversation_ids), 1))]
+        results = [await run_phase(batch, args.concurrency, counter) for batch in rounds]
+        phases["continue"] = merge_rounds(results) if results else {}
+
+    if app_module.llm_gateway:
+        gateway_stats = app_module.llm_gateway.stats()
+        await app_module.llm_gateway.close()
+    else:
+        gateway_stats = None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "config": {
+            "conversations": args.conversations,
+            "turns": args.turns,
+            "concurrency": args.concurrency,
+            "redis": "external" if args.redis_url else "fakeredis",
+            "llm_latency": args.latency,
+            "llm_tokens_per_second": args.tokens_per_second,
+            "python": sys.version.split()[0]
+        },
+        "phases": phases,
+        "llm_usage": gateway_stats["usage"] if gateway_stats else None
+    }
+
+
+def merge_rounds(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-round phase results into one, weighting by request count"""
+    requests = sum(result["requests"] for result in results)
+    seconds = sum(result["seconds"] for result in results)
+    merged = {
+        "requests": requests,
+        "errors": sum(result["errors"] for result in results),
+        "seconds": round(seconds, 3),
+        "rps": round(requests / seconds, 2) if seconds else 0.0
+    }
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        # Percentiles of the worst round; a conservative summary across rounds
+        merged[key] = max(result[key] for result in results)
+    for key in ("redis_commands_per_turn", "redis_round_trips_per_turn"):
+        merged[key] = round(sum(result[key] * result["requests"] for result in results) / requests, 2) if requests else 0.0
+    return merged
+
+
+def print_report(report: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    columns = ["requests", "errors", "rps", "p50_ms", "p95_ms", "p99_ms", "redis_commands_per_turn", "redis_round_trips_per_turn"]
+    for phase, result in report["phases"].items():
+        print(f"{phase}:")
+        for column in columns:
+            value = result.get(column, "")
+            before = ((previous or {}).get("phases", {}).get(phase) or {}).get(column)
+            if isinstance(before, (int, float)) and before:
+                value = f"{value}  (was {before}, {(value - before) / before:+.0%})"
+            print(f"  {column:<28} {value}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline load test with a fake LLM and fake or local Redis")
+    parser.add_argument("--conversations", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=3, help="follow-up turns per conversation")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--redis-url", default=None, help="use this Redis instead of an in-process fake")
+    parser.add_argument("--latency", type=float, default=0.3, help="fake LLM seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--llm-port", type=int, default=None)
+    parser.add_argument("--output", default="benchmarks/results", help="directory for the JSON results")
+    parser.add_argument("--compare", default=None, help="previous results file to compare against")
+    args = parser.parse_args()
+    args.llm_port = args.llm_port or free_port()
+
+    server = start_fake_llm(args.llm_port, args.latency, args.tokens_per_second)
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        server.should_exit = True
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_report(report, previous)
+
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"load_test-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
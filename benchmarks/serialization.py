@@ -0,0 +1,109 @@
+"""
+Compare the standard JSON path with the fast serialization path.
+
+Usage: python -m benchmarks.serialization [--messages 10] [--iterations 5000]
+
+Reports microseconds per operation for:
+
+- cache: encoding and decoding an evaluation cache entry with json and with
+  debater.utils.serialization (orjson when installed)
+- messages: building a Message list one model at a time and through the
+  MESSAGE_LIST adapter, as RedisClient does after decoding
+- response: rendering a /chat body through FastAPI's response_model path and
+  through FastJSONResponse, by calling two minimal apps over ASGI
+"""
+import json
+import time
+import asyncio
+import argparse
+from typing import Awaitable, Callable, List
+from fastapi import FastAPI
+from debater.models.conversation import MESSAGE_LIST, DebateResponse, Message
+from debater.utils.serialization import FastJSONResponse, dumps, loads, orjson
+from benchmarks.encoding import build_conversation
+
+
+def per_call_us(fn: Callable[[], object], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+async def per_request_us(app: FastAPI, iterations: int) -> float:
+    """Drive a POST /chat through the app's ASGI interface without a server"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/chat", "raw_path": b"/chat", "root_path": "", "query_string": b"",
+        "headers": [], "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 80)
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def response_apps(messages: List[Message]) -> List[FastAPI]:
+    """The same endpoint returning a model, and returning a pre-rendered FastJSONResponse"""
+    validated = FastAPI()
+    fast = FastAPI()
+
+    @validated.post("/chat", response_model=DebateResponse)
+    async def chat_validated():
+        return DebateResponse(conversation_id="benchmark", message=messages)
+
+    @fast.post("/chat", response_model=DebateResponse)
+    async def chat_fast():
+        return FastJSONResponse(content={
+            "conversation_id": "benchmark",
+            "message": MESSAGE_LIST.dump_python(messages, mode="json")
+        })
+
+    return [validated, fast]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=10, help="messages per payload, as returned by /chat")
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    conversation = build_conversation(args.messages)
+    entries = [{"role": role.value, "message": message} for role, message in conversation]
+    messages = MESSAGE_LIST.validate_python(entries)
+    cache_entry = {
+        "digest": "0" * 64,
+        "evaluation": {"scores": {"clarity": 7, "evidence": 6, "rebuttal": 8}, "analysis": {"strengths": ["Clear"]}, "summary": "Solid"},
+        "computed_at": "2024-01-01T00:00:00+00:00",
+        "messages": entries
+    }
+    stdlib_encoded = json.dumps(cache_entry)
+    fast_encoded = dumps(cache_entry)
+
+    rows = [
+        ("cache encode", per_call_us(lambda: json.dumps(cache_entry), args.iterations),
+         per_call_us(lambda: dumps(cache_entry), args.iterations)),
+        ("cache decode", per_call_us(lambda: json.loads(stdlib_encoded), args.iterations),
+         per_call_us(lambda: loads(fast_encoded), args.iterations)),
+        ("messages build", per_call_us(lambda: [Message(**entry) for entry in entries], args.iterations),
+         per_call_us(lambda: MESSAGE_LIST.validate_python(entries), args.iterations)),
+        ("messages dump", per_call_us(lambda: [m.model_dump(mode="json") for m in messages], args.iterations),
+         per_call_us(lambda: MESSAGE_LIST.dump_python(messages, mode="json"), args.iterations)),
+    ]
+    rows.append(("chat response", *[asyncio.run(per_request_us(app, args.iterations)) for app in response_apps(messages)]))
+
+    print(f"{args.messages} messages per payload, {args.iterations} iterations, orjson {'installed' if orjson else 'not installed'}")
+    print(f"{'operation':<16} {'current us':>11} {'fast us':>9} {'speedup':>8}")
+    for name, current, fast in rows:
+        print(f"{name:<16} {current:>11.2f} {fast:>9.2f} {current / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
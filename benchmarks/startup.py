@@ -0,0 +1,148 @@
+"""
+Cold start benchmark for the debate API.
+
+Usage: python -m benchmarks.startup [--runs 5] [--redis-url redis://localhost:6379]
+                                    [--output benchmarks/results] [--compare PREVIOUS.json]
+
+Measures, as medians over `--runs` fresh processes:
+
+- import: seconds to `import debater.app` in a new interpreter
+- ready: seconds from spawning uvicorn until /health answers
+- first_request_ms / second_request_ms: /health latency right after startup
+  and once more, which shows connection setup the warm-up did not cover
+
+The app talks to the fake LLM server (benchmarks.fake_llm) and to the Redis
+at `--redis-url`; an unreachable Redis is reported by the warm-up and makes
+/health slower, so use a real one for meaningful request timings.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+import httpx
+from benchmarks.load_test import free_port, git_commit, start_fake_llm
+
+IMPORT_SNIPPET = "import time; started = time.perf_counter(); import debater.app; print(time.perf_counter() - started)"
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SNIPPET], env=env)
+    return float(output.decode().strip().splitlines()[-1])
+
+
+def measure_start(env: Dict[str, str], timeout: float = 60.0) -> Dict[str, Any]:
+    """Start uvicorn, wait for /health and time the first two requests"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "debater.app:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=url, timeout=timeout) as client:
+            # Connections are refused until the lifespan (and its warm-up) completes
+            while True:
+                if time.perf_counter() - started > timeout:
+                    raise TimeoutError("app did not become ready")
+                try:
+                    request_started = time.perf_counter()
+                    first = client.get("/health")
+                    break
+                except httpx.TransportError:
+                    time.sleep(0.01)
+            ready = time.perf_counter() - started
+            first_ms = (time.perf_counter() - request_started) * 1000
+
+            request_started = time.perf_counter()
+            client.get("/health")
+            second_ms = (time.perf_counter() - request_started) * 1000
+            warm_up = client.get("/stats").json().get("warm_up")
+
+        return {
+            "ready": ready,
+            "first_request_ms": first_ms,
+            "second_request_ms": second_ms,
+            "health": first.json().get("status"),
+            "warm_up": warm_up
+        }
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY="benchmark",
+        OPENAI_BASE_URL=f"http://127.0.0.1:{args.llm_port}/v1",
+        REDIS_URL=args.redis_url,
+        # Keep the opening pool warmer from adding LLM calls during startup
+        OPENING_POOL_ENABLED="false"
+    )
+    imports: List[float] = [measure_import(env) for _ in range(args.runs)]
+    starts = [measure_start(env) for _ in range(args.runs)]
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": git_commit(),
+        "config": {"runs": args.runs, "redis_url": args.redis_url, "python": sys.version.split()[0]},
+        "results": {
+            "import_seconds": round(statistics.median(imports), 3),
+            "ready_seconds": round(statistics.median(start["ready"] for start in starts), 3),
+            "first_request_ms": round(statistics.median(start["first_request_ms"] for start in starts), 1),
+            "second_request_ms": round(statistics.median(start["second_request_ms"] for start in starts), 1)
+        },
+        "health": starts[-1]["health"],
+        "warm_up": starts[-1]["warm_up"]
+    }
+
+
+def print_report(report: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    for name, value in report["results"].items():
+        before = (previous or {}).get("results", {}).get(name)
+        if isinstance(before, (int, float)) and before:
+            value = f"{value}  (was {before}, {(value - before) / before:+.0%})"
+        print(f"  {name:<20} {value}")
+    print(f"  {'health':<20} {report['health']}")
+    print(f"  {'warm_up':<20} {report['warm_up']}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import time and time to first request of the API")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--llm-port", type=int, default=None)
+    parser.add_argument("--output", default="benchmarks/results", help="directory for the JSON results")
+    parser.add_argument("--compare", default=None, help="previous results file to compare against")
+    args = parser.parse_args()
+    args.llm_port = args.llm_port or free_port()
+
+    server = start_fake_llm(args.llm_port, latency=0.0, tokens_per_second=1000.0)
+    try:
+        report = run(args)
+    finally:
+        server.should_exit = True
+
+    previous = None
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+    print_report(report, previous)
+
+    os.makedirs(args.output, exist_ok=True)
+    path = os.path.join(args.output, f"startup-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,124 +1,220 @@
 import os
 import json
+import time
 import uuid
-from typing import List, Dict, Any, Optional
-from fastapi import FastAPI, HTTPException
+import asyncio
+import logging
+from functools import lru_cache
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
+from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from debater.utils.settings import Settings
-from debater.utils.redis_client import RedisClient
+from debater.utils.redis_client import RedisClient, ConversationBusyError, turn_lease_key
+from debater.utils.locks import RedisLock
+from debater.utils.single_flight import SingleFlight
+from debater.utils.metrics import REGISTRY, Gauge, Histogram, MetricsMiddleware
+from debater.utils.serialization import FastJSONResponse, dumps_str
 from debater.services.ai_topic_detector import AITopicDetector
-from debater.services.debate_service import DebateService
+from debater.services.topic_cache import TopicCache
+from debater.services.llm_gateway import LLMGateway
+from debater.services.debate_service import DebateService, CONTEXT_MESSAGES
+from debater.services.opening_pool import OpeningPool
+from debater.services.conversation_summarizer import ConversationSummarizer
 from debater.services.persuasiveness_evaluator import PersuasivenessEvaluator
-from debater.models.conversation import DebateRequest, DebateResponse, Message, Role
+from debater.services.evaluation_cache import EvaluationCache
+from debater.services.evaluation_service import EvaluationService, EvaluationError
+from debater.services.evaluation_jobs import EvaluationJobQueue
+from debater.services.conversation_archiver import ConversationArchiver
+from debater.models.conversation import MESSAGE_LIST, Conversation, DebateRequest, DebateResponse, Message, Role, BatchEvaluationRequest, EvaluationJobRequest
 
+logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# Settings are cheap to read; every client and service is created by
+# configure() when the app starts, so importing this module opens nothing
 settings = Settings()
-redis_client = RedisClient(settings)
+redis_client: Optional[RedisClient] = None
+evaluation_cache: Optional[EvaluationCache] = None
+evaluation_jobs: Optional[EvaluationJobQueue] = None
+topic_detector: Optional[AITopicDetector] = None
+debate_service: Optional[DebateService] = None
+persuasiveness_evaluator: Optional[PersuasivenessEvaluator] = None
+evaluation_service: Optional[EvaluationService] = None
+opening_pool: Optional[OpeningPool] = None
+conversation_summarizer: Optional[ConversationSummarizer] = None
+llm_gateway: Optional[LLMGateway] = None
+single_flight: Optional[SingleFlight] = None
+conversation_archiver: Optional[ConversationArchiver] = None
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), "static")
+
+
+def configure(app_settings: Optional[Settings] = None) -> None:
+    """
+    Create the shared clients and services.
 
-# Initialize AI services only if API key is available
-topic_detector = None
-debate_service = None
-persuasiveness_evaluator = None
-if settings.openai_api_key:
-    topic_detector = AITopicDetector(settings.openai_api_key, settings.ai_model)
-    debate_service = DebateService(settings.openai_api_key, settings.ai_model)
-    persuasiveness_evaluator = PersuasivenessEvaluator(settings.openai_api_key, settings.ai_model)
+    Nothing connects here; connection pools fill on first use or in
+    warm_up(). AI services are only created when an API key is configured.
+    """
+    global settings, redis_client, evaluation_cache, evaluation_jobs, topic_detector, debate_service
+    global persuasiveness_evaluator, evaluation_service, opening_pool, conversation_summarizer, llm_gateway, single_flight
+    global conversation_archiver
+
+    settings = app_settings or settings
+    redis_client = RedisClient(settings)
+    evaluation_cache = EvaluationCache(redis_client)
+    # Evaluations queued here are run by `python -m debater.worker`
+    evaluation_jobs = EvaluationJobQueue(redis_client, settings.evaluation_job_ttl)
+    if redis_client.cold_store:
+        conversation_archiver = ConversationArchiver(
+            redis_client,
+            idle_seconds=settings.cold_store_idle_minutes * 60,
+            batch=settings.cold_store_sweep_batch
+        )
 
+    if not settings.openai_api_key:
+        return
+
+    # All services share one connection pool, retry policy and concurrency limit
+    llm_gateway = LLMGateway(
+        settings.openai_api_key,
+        max_concurrency=settings.llm_max_concurrency,
+        timeout=settings.llm_timeout,
+        max_retries=settings.llm_max_retries,
+        max_connections=settings.llm_max_connections,
+        base_url=settings.openai_base_url or None
+    )
+    # Identical in-flight detections and evaluations share one completion
+    single_flight = SingleFlight(redis_client, lock_ttl=settings.llm_timeout + 5, wait_timeout=settings.llm_timeout + 5)
+    topic_cache = TopicCache(redis_client, settings.topic_cache_size, settings.topic_cache_ttl)
+    topic_detector = AITopicDetector(model=settings.ai_model, cache=topic_cache, gateway=llm_gateway, single_flight=single_flight)
+    debate_service = DebateService(model=settings.ai_model, gateway=llm_gateway)
+    conversation_summarizer = ConversationSummarizer(redis_client, debate_service)
+    persuasiveness_evaluator = PersuasivenessEvaluator(model=settings.ai_model, gateway=llm_gateway)
+    evaluation_service = EvaluationService(redis_client, persuasiveness_evaluator, evaluation_cache, single_flight)
+    if settings.opening_pool_enabled:
+        opening_pool = OpeningPool(
+            redis_client,
+            debate_service,
+            pool_size=settings.opening_pool_size,
+            max_age=settings.opening_pool_max_age,
+            warm_subjects=settings.opening_pool_warm_subjects
+        )
 
-@app.get("/")
-async def root():
-    from fastapi.responses import HTMLResponse
-
-    html_content = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Debater Bot - Test Chat</title>
-        <style>
-            body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }
-            .container { background: #f5f5f5; padding: 20px; border-radius: 8px; }
-            input, textarea { width: 100%; padding: 10px; margin: 10px 0; border: 1px solid #ddd; border-radius: 4px; }
-            button { background: #007bff; color: white; padding: 10px 20px; border: none; border-radius: 4px; cursor: pointer; }
-            button:hover { background: #0056b3; }
-            .response { background: white; padding: 15px; margin: 10px 0; border-radius: 4px; border-left: 4px solid #007bff; }
-            .error { border-left-color: #dc3545; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <h1>🤖 Debater Bot</h1>
-            <p>Test the debate bot by sending a message. The bot will detect the topic and take the opposite position.</p>
-
-            <form id="chatForm">
-                <label for="message">Your message:</label>
-                <textarea id="message" name="message" rows="3" placeholder="e.g., I think remote work is better than office work" required></textarea>
-
-                <label for="conversationId">Conversation ID (optional):</label>
-                <input type="text" id="conversationId" name="conversationId" placeholder="Leave empty for new conversation">
-
-                <button type="submit">Send Message</button>
-            </form>
-
-            <div id="response"></div>
-        </div>
-
-        <script>
-            document.getElementById('chatForm').addEventListener('submit', async (e) => {
-                e.preventDefault();
-
-                const message = document.getElementById('message').value;
-                const conversationId = document.getElementById('conversationId').value;
-                const responseDiv = document.getElementById('response');
-
-                responseDiv.innerHTML = '<div class="response">Sending message...</div>';
-
-                try {
-                    const response = await fetch('/chat', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            message: message,
-                            conversation_id: conversationId || null
-                        })
-                    });
-
-                    const data = await response.json();
-
-                    if (response.ok) {
-                        let messagesHtml = '<h3>Conversation:</h3>';
-                        data.message.forEach(msg => {
-                            const role = msg.role === 'user' ? '👤 You' : '🤖 Bot';
-                            messagesHtml += `<div class="response"><strong>${role}:</strong> ${msg.message}</div>`;
-                        });
-
-                        responseDiv.innerHTML = `
-                            <div class="response">
-                                <strong>Conversation ID:</strong> ${data.conversation_id}<br>
-                                ${messagesHtml}
-                            </div>
-                        `;
-                    } else {
-                        responseDiv.innerHTML = `<div class="response error"><strong>Error:</strong> ${data.detail || 'Unknown error'}</div>`;
-                    }
-                } catch (error) {
-                    responseDiv.innerHTML = `<div class="response error"><strong>Error:</strong> ${error.message}</div>`;
-                }
-            });
-        </script>
-    </body>
-    </html>
+
+async def warm_up() -> Dict[str, Any]:
+    """
+    Open the redis and LLM connections before the first request needs them.
+
+    Each pool gets one connection (paying TCP and TLS setup now), the redis
+    scripts are loaded so their first call is a single EVALSHA, and the LLM
+    endpoint gets a keep-alive request. Failures are logged, not raised, so
+    a slow dependency delays readiness by at most `warm_up_timeout`.
+    Returns the seconds each step took, or the error it hit.
     """
+    async def timed(step):
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(step, settings.warm_up_timeout)
+            return round(time.perf_counter() - started, 3)
+        except Exception as e:
+            logger.warning(f"Warm-up step failed: {e!r}")
+            return f"error: {e.__class__.__name__}"
+
+    steps = {"redis": timed(redis_client.warm_up())}
+    if llm_gateway:
+        steps["llm"] = timed(llm_gateway.warm_up())
+    results = dict(zip(steps, await asyncio.gather(*steps.values())))
+    logger.info(f"Warm-up finished: {results}")
+    return results
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Create and warm the shared resources before serving, run the opening
+    pool warmer and the conversation archiver in the background and close
+    pooled connections on shutdown
+    """
+    if redis_client is None:
+        configure()
+    app.state.warm_up = await warm_up()
+
+    background = []
+    if opening_pool:
+        background.append(asyncio.ensure_future(opening_pool.run_warmer(settings.opening_pool_warm_interval)))
+    if conversation_archiver:
+        background.append(asyncio.ensure_future(conversation_archiver.run(settings.cold_store_sweep_interval)))
+
+    yield
+
+    for task in background:
+        task.cancel()
+    if llm_gateway:
+        await llm_gateway.close()
+    await redis_client.close()
+
+
+def create_app() -> FastAPI:
+    """Build the ASGI app; resources are created and warmed by its lifespan"""
+    app = FastAPI(lifespan=lifespan)
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router)
+    return app
+
 
-    return HTMLResponse(content=html_content)
+router = APIRouter()
 
 
-@app.get("/health")
+@lru_cache(maxsize=1)
+def _index_html() -> str:
+    with open(os.path.join(STATIC_DIR, "index.html"), encoding="utf-8") as f:
+        return f.read()
+
+
+# Time spent in each stage of a chat turn
+STAGE_SECONDS = Histogram("debater_chat_stage_seconds", "Duration of each stage of a chat turn", ["stage"])
+
+
+def _redis_pool_connections():
+    if not redis_client:
+        return
+    for name, pool in (("text", redis_client.pool), ("binary", redis_client.binary_pool)):
+        yield {"pool": name, "state": "in_use"}, len(pool._in_use_connections)
+        yield {"pool": name, "state": "idle"}, len(pool._available_connections)
+
+
+def _llm_gateway_slots():
+    if llm_gateway:
+        yield {"state": "in_flight"}, llm_gateway.in_flight
+        yield {"state": "queued"}, llm_gateway.waiting
+
+
+Gauge("debater_redis_pool_connections", "Pooled redis connections by pool and state", ["pool", "state"], callback=_redis_pool_connections)
+Gauge("debater_llm_gateway_calls", "Chat completions in flight or queued for a slot", ["state"], callback=_llm_gateway_slots)
+
+
+@router.get("/", response_class=HTMLResponse)
+async def root():
+    """Interactive chat page for manual testing"""
+    return HTMLResponse(content=_index_html())
+
+
+@router.get("/health")
 async def health_check():
     """Health check endpoint"""
+    if redis_client is None:
+        # The lifespan has not created the resources yet
+        return {
+            "status": "starting",
+            "redis": "not configured",
+            "mode": settings.mode,
+            "ai_model": settings.ai_model,
+            "ai_available": False
+        }
+
     try:
-        redis_healthy = redis_client.health_check()
+        redis_healthy = await redis_client.health_check()
         return {
             "status": "healthy" if redis_healthy else "degraded",
             "redis": "connected" if redis_healthy else "disconnected",
@@ -137,13 +233,33 @@ async def health_check():
         }
 
 
-@app.get("/test-redis")
+@router.get("/stats")
+async def stats(request: Request):
+    """Per-worker cache and LLM gateway statistics"""
+    return {
+        "warm_up": getattr(request.app.state, "warm_up", None),
+        "topic_cache": topic_detector.cache.stats() if topic_detector and topic_detector.cache else None,
+        "opening_pool": opening_pool.stats() if opening_pool else None,
+        "llm_gateway": llm_gateway.stats() if llm_gateway else None,
+        "summarizer": conversation_summarizer.stats() if conversation_summarizer else None,
+        "single_flight": single_flight.stats() if single_flight else None,
+        "archiver": conversation_archiver.stats() if conversation_archiver else None
+    }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Latency histograms, error counters and pool gauges in the Prometheus text format"""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/test-redis")
 async def test_redis():
     """Test redis connection and basic operations"""
-    return redis_client.test_connection()
+    return await redis_client.test_connection()
 
 
-@app.post("/test-topic")
+@router.post("/test-topic")
 async def test_topic_detection(message: str):
     """Test AI topic detection with a message"""
     if not topic_detector:
@@ -152,7 +268,7 @@ async def test_topic_detection(message: str):
             detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
         )
 
-    topic, bot_position, user_position = topic_detector.detect_topic_and_position(message)
+    topic, bot_position, user_position = await topic_detector.detect_topic_and_position(message)
     return {
         "message": message,
         "detected_topic": topic,
@@ -161,7 +277,7 @@ async def test_topic_detection(message: str):
     }
 
 
-@app.post("/test-debate")
+@router.post("/test-debate")
 async def test_debate_response(topic: str, bot_position: str, conversation_history: str = None):
     """Test AI debate response generation"""
     if not debate_service:
@@ -178,7 +294,7 @@ async def test_debate_response(topic: str, bot_position: str, conversation_histo
         except json.JSONDecodeError:
             history = [{"role": "user", "content": conversation_history}]
 
-    response = debate_service.generate_debate_response(topic, bot_position, history)
+    response = await debate_service.generate_debate_response(topic, bot_position, history)
     return {
         "topic": topic,
         "bot_position": bot_position,
@@ -187,7 +303,7 @@ async def test_debate_response(topic: str, bot_position: str, conversation_histo
     }
 
 
-@app.post("/test-opening")
+@router.post("/test-opening")
 async def test_opening_argument(topic: str, bot_position: str):
     """Test AI opening argument generation"""
     if not debate_service:
@@ -196,7 +312,7 @@ async def test_opening_argument(topic: str, bot_position: str):
             detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
         )
 
-    response = debate_service.generate_opening_argument(topic, bot_position)
+    response = await debate_service.generate_opening_argument(topic, bot_position)
     return {
         "topic": topic,
         "bot_position": bot_position,
@@ -204,7 +320,76 @@ async def test_opening_argument(topic: str, bot_position: str):
     }
 
 
-@app.post("/chat", response_model=DebateResponse)
+def _turn_lease(conversation_id: str) -> RedisLock:
+    """Lease serializing turns on one conversation across workers"""
+    return RedisLock(redis_client, turn_lease_key(conversation_id), ttl_ms=int(settings.turn_lease_ttl * 1000))
+
+
+def _prompt_context(conversation: Conversation) -> Tuple[List[Dict[str, str]], Optional[str]]:
+    """History not yet covered by the rolling summary, and the summary text"""
+    messages = conversation.messages
+    summary = None
+    if conversation.summary:
+        # Skip loaded messages the summary already covers
+        first_loaded = conversation.message_count - len(messages)
+        messages = messages[max(conversation.summary.covered - first_loaded, 0):]
+        summary = conversation.summary.text
+
+    return [{"role": msg.role.value, "content": msg.message} for msg in messages], summary
+
+
+def _turn_in_progress() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail="Another turn is in progress for this conversation",
+        headers={"Retry-After": "1"}
+    )
+
+
+async def open_debate(message: str) -> Tuple[str, List[Message]]:
+    """
+    Start a new debate from the user's first message.
+
+    Topic detection has to come first, but persisting the conversation
+    overlaps with producing the opening argument, which is served from the
+    opening pool when available. Returns the new conversation id and its
+    messages.
+    """
+    with STAGE_SECONDS.time(stage="topic_detection"):
+        topic, bot_position, user_position = await topic_detector.detect_topic_and_position(message)
+
+    if opening_pool:
+        opening = opening_pool.get_opening(topic, bot_position)
+    else:
+        opening = debate_service.generate_opening_argument(topic, bot_position)
+
+    with STAGE_SECONDS.time(stage="opening"):
+        conversation, opening_argument = await asyncio.gather(
+            redis_client.create_conversation(topic, bot_position, message),
+            opening
+        )
+
+    # Add bot's opening message and get updated messages
+    with STAGE_SECONDS.time(stage="persist"):
+        messages = await redis_client.add_message(conversation.conversation_id, Role.BOT, opening_argument)
+    return conversation.conversation_id, messages
+
+
+def _debate_response(conversation_id: str, messages: List[Message]) -> FastJSONResponse:
+    """
+    Render a DebateResponse body directly.
+
+    The messages were just validated when read back from redis, so the
+    response skips FastAPI's second validation pass against response_model,
+    which is kept on the route for the OpenAPI schema.
+    """
+    return FastJSONResponse(content={
+        "conversation_id": conversation_id,
+        "message": MESSAGE_LIST.dump_python(messages, mode="json")
+    })
+
+
+@router.post("/chat", response_model=DebateResponse)
 async def chat(request: DebateRequest):
     """
     Main chat endpoint for the Kopi challenge.
@@ -220,72 +405,236 @@ async def chat(request: DebateRequest):
     try:
                         # Check if this is a new conversation
         if not request.conversation_id:
-            # New conversation - detect topic and set bot position
-            topic, bot_position, user_position = topic_detector.detect_topic_and_position(request.message)
+            # New conversation - detect topic, then store the conversation
+            # while the opening argument is being generated
+            conversation_id, messages = await open_debate(request.message)
 
-            # Create conversation using Redis client
-            conversation = redis_client.create_conversation(topic, bot_position, request.message)
-            conversation_id = conversation.conversation_id
+            return _debate_response(conversation_id, messages)
+
+        else:
+            # Existing conversation - validate, add the user's message and
+            # load only the messages the prompt uses in a single redis round trip
+            # The turn lease is taken in the same round trip and held until
+            # the bot's reply is stored, so turns on one conversation are ordered
+            lease = _turn_lease(request.conversation_id)
+            with STAGE_SECONDS.time(stage="start_turn"):
+                conversation = await redis_client.start_turn(
+                    request.conversation_id,
+                    request.message,
+                    history_size=CONTEXT_MESSAGES,
+                    lease_token=lease.token,
+                    lease_ttl_ms=lease.ttl_ms
+                )
+            if not conversation:
+                raise HTTPException(status_code=404, detail="Conversation not found")
+
+            try:
+                # Prepare conversation history and the summary of older turns for AI
+                conversation_history, summary = _prompt_context(conversation)
+
+                # Generate debate response
+                with STAGE_SECONDS.time(stage="generate"):
+                    debate_response = await debate_service.generate_debate_response(
+                        conversation.topic,
+                        conversation.bot_position,
+                        conversation_history,
+                        summary=summary
+                    )
 
-            # Generate opening argument
-            opening_argument = debate_service.generate_opening_argument(topic, bot_position)
+                # Add bot's response and return last 10 (5 most recent from each side)
+                with STAGE_SECONDS.time(stage="persist"):
+                    last_10_messages = await redis_client.add_message(request.conversation_id, Role.BOT, debate_response)
+            finally:
+                await lease.release()
 
-            # Add bot's opening message
-            redis_client.add_message(conversation_id, Role.BOT, opening_argument)
+            if conversation_summarizer:
+                conversation_summarizer.schedule(conversation)
 
-            # Get updated messages
-            messages = redis_client.get_conversation_messages(conversation_id)
+            return _debate_response(request.conversation_id, last_10_messages)
 
-            return DebateResponse(
-                conversation_id=conversation_id,
-                message=messages
+    except HTTPException:
+        raise
+    except ConversationBusyError:
+        raise _turn_in_progress()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
+
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format a server-sent event frame"""
+    return f"event: {event}\ndata: {dumps_str(data)}\n\n"
+
+
+@router.post("/chat/stream")
+async def chat_stream(request: DebateRequest):
+    """
+    Streaming variant of /chat using Server-Sent Events.
+
+    Emits a `start` event with the conversation id, one `token` event per
+    generated chunk, and a `done` event with the last 10 messages once the
+    bot's reply has been stored.
+    """
+    if not debate_service or not topic_detector:
+        raise HTTPException(
+            status_code=500,
+            detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
+        )
+
+    lease = None
+    try:
+        if not request.conversation_id:
+            # New conversation - detect topic, then store the conversation
+            # while the opening argument streams
+            with STAGE_SECONDS.time(stage="topic_detection"):
+                topic, bot_position, user_position = await topic_detector.detect_topic_and_position(request.message)
+            conversation_id = redis_client.generate_conversation_id()
+            pending_write = asyncio.ensure_future(
+                redis_client.create_conversation(topic, bot_position, request.message, conversation_id)
             )
+            if opening_pool:
+                tokens = opening_pool.stream_opening(topic, bot_position)
+            else:
+                tokens = debate_service.stream_opening_argument(topic, bot_position)
 
         else:
-            # Existing conversation - retrieve and continue
-            conversation = redis_client.get_conversation(request.conversation_id)
+            # Existing conversation - take the turn lease, add the user's
+            # message and load the context window
+            lease = _turn_lease(request.conversation_id)
+            with STAGE_SECONDS.time(stage="start_turn"):
+                conversation = await redis_client.start_turn(
+                    request.conversation_id,
+                    request.message,
+                    history_size=CONTEXT_MESSAGES,
+                    lease_token=lease.token,
+                    lease_ttl_ms=lease.ttl_ms
+                )
             if not conversation:
                 raise HTTPException(status_code=404, detail="Conversation not found")
+            conversation_id = conversation.conversation_id
+            pending_write = None
 
-            # Add user's new message
-            redis_client.add_message(request.conversation_id, Role.USER, request.message)
-
-            # Get all messages for context
-            all_messages = redis_client.get_conversation_messages(request.conversation_id)
-
-            # Prepare conversation history for AI (use all available messages for better context)
-            conversation_history = []
-            for msg in all_messages:
-                conversation_history.append({
-                    "role": msg.role.value,
-                    "content": msg.message
-                })
-
-            # Generate debate response
-            debate_response = debate_service.generate_debate_response(
+            conversation_history, summary = _prompt_context(conversation)
+            tokens = debate_service.stream_debate_response(
                 conversation.topic,
                 conversation.bot_position,
-                conversation_history
+                conversation_history,
+                summary=summary
             )
 
-            # Add bot's response
-            redis_client.add_message(request.conversation_id, Role.BOT, debate_response)
+    except Exception as e:
+        # Nothing will stream, so give the turn back now instead of at the
+        # lease TTL; release() never deletes another request's lease
+        if lease:
+            await lease.release()
+        if isinstance(e, HTTPException):
+            raise
+        if isinstance(e, ConversationBusyError):
+            raise _turn_in_progress()
+        raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
+
+    async def event_stream() -> AsyncIterator[str]:
+        yield _sse_event("start", {"conversation_id": conversation_id})
 
-                        # Get updated messages and return last 10 (5 most recent from each side)
-            updated_messages = redis_client.get_conversation_messages(request.conversation_id)
-            last_10_messages = updated_messages[-10:] if len(updated_messages) > 10 else updated_messages
+        # The LLM deadline only bounds opening the stream, so the lease is
+        # refreshed until the reply is stored
+        keeper = asyncio.ensure_future(lease.keep_alive()) if lease else None
+        chunks = []
+        try:
+            with STAGE_SECONDS.time(stage="generate"):
+                async for token in tokens:
+                    chunks.append(token)
+                    yield _sse_event("token", {"token": token})
+
+            # Persist the completed reply once the stream has finished
+            with STAGE_SECONDS.time(stage="persist"):
+                if pending_write:
+                    await pending_write
+                messages = await redis_client.add_message(conversation_id, Role.BOT, "".join(chunks).strip())
+            yield _sse_event("done", {
+                "conversation_id": conversation_id,
+                "message": MESSAGE_LIST.dump_python(messages, mode="json")
+            })
 
-            return DebateResponse(
-                conversation_id=request.conversation_id,
-                message=last_10_messages
-            )
+        except Exception as e:
+            yield _sse_event("error", {"detail": f"Chat error: {str(e)}"})
+
+        finally:
+            if lease:
+                keeper.cancel()
+                await lease.release()
+                if conversation_summarizer:
+                    conversation_summarizer.schedule(conversation)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/evaluate-persuasiveness/batch")
+async def evaluate_persuasiveness_batch(request: BatchEvaluationRequest):
+    """
+    Evaluate many conversations concurrently.
+
+    Takes a list of conversation ids and/or a topic filter. Results are
+    streamed back as NDJSON, one line per conversation in completion order,
+    each with a `status` of "ok", "not_found" or "error".
+    """
+    if not evaluation_service:
+        raise HTTPException(
+            status_code=500,
+            detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
+        )
+    if not request.conversation_ids and not request.topic:
+        raise HTTPException(status_code=422, detail="Provide conversation_ids or topic")
+
+    conversation_ids = list(request.conversation_ids or [])
+    if request.topic:
+        conversation_ids += await redis_client.find_conversations_by_topic(request.topic)
+
+    async def results() -> AsyncIterator[str]:
+        async for result in evaluation_service.evaluate_many(
+            conversation_ids,
+            full=request.full,
+            concurrency=request.concurrency or settings.evaluation_concurrency
+        ):
+            yield dumps_str(result) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+@router.post("/evaluate-persuasiveness/jobs", status_code=202)
+async def enqueue_evaluation(request: EvaluationJobRequest):
+    """
+    Queue a persuasiveness evaluation for the evaluation workers.
+
+    Returns the job record right away; poll
+    `GET /evaluate-persuasiveness/jobs/{job_id}` until its `status` is
+    "done" (the evaluation is in `result`), "not_found" or "failed".
+    """
+    try:
+        if not await redis_client.get_conversation_metadata(request.conversation_id):
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        return await evaluation_jobs.enqueue(request.conversation_id, full=request.full)
 
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Evaluation error: {str(e)}")
 
 
-@app.get("/evaluate-persuasiveness/{conversation_id}")
-async def evaluate_persuasiveness(conversation_id: str):
+@router.get("/evaluate-persuasiveness/jobs/{job_id}")
+async def get_evaluation_job(job_id: str):
+    """Poll a queued evaluation"""
+    job = await evaluation_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/evaluate-persuasiveness/{conversation_id}")
+async def evaluate_persuasiveness(conversation_id: str, full: bool = False):
     """
     Evaluate the persuasiveness of AI responses in a conversation.
 
@@ -296,46 +645,31 @@ async def evaluate_persuasiveness(conversation_id: str):
     - Counter-argument handling
     - Clarity and structure
     - Overall persuasiveness
+
+    By default only the messages added since the previous evaluation are
+    sent to the model and merged into the running scores. Pass `full=true`
+    to re-evaluate the whole conversation.
     """
-    if not persuasiveness_evaluator:
+    if not evaluation_service:
         raise HTTPException(
             status_code=500,
             detail="OpenAI API key not configured. Set OPENAI_API_KEY environment variable."
         )
 
     try:
-        # Get conversation from Redis
-        conversation = redis_client.get_conversation(conversation_id)
-        if not conversation:
+        result = await evaluation_service.evaluate(conversation_id, full=full)
+        if not result:
             raise HTTPException(status_code=404, detail="Conversation not found")
 
-        # Convert messages to dict format for evaluation
-        conversation_messages = []
-        for msg in conversation.messages:
-            conversation_messages.append({
-                "role": msg.role.value,
-                "message": msg.message
-            })
-
-        # Evaluate persuasiveness
-        result = persuasiveness_evaluator.evaluate_conversation(
-            conversation_messages=conversation_messages,
-            topic=conversation.topic,
-            bot_position=conversation.bot_position
-        )
-
-        if "error" in result:
-            raise HTTPException(status_code=500, detail=result["error"])
-
-        return {
-            "conversation_id": conversation_id,
-            "topic": conversation.topic,
-            "bot_position": conversation.bot_position,
-            "message_count": len(conversation.messages),
-            "evaluation": result
-        }
+        return result
 
     except HTTPException:
         raise
+    except EvaluationError as e:
+        raise HTTPException(status_code=500, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Evaluation error: {str(e)}")
+
+
+# Served by `uvicorn debater.app:app`; the lifespan creates the resources
+app = create_app()
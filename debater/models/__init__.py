@@ -1,3 +1,7 @@
-from .conversation import Conversation, Message, Role, DebateRequest, DebateResponse
+from .conversation import Conversation, ConversationSummary, Message, Role, DebateRequest, DebateResponse, BatchEvaluationRequest, EvaluationJobRequest
+from .llm_output import TopicDetection, Evaluation, EvaluationScores
 
-__all__ = ["Conversation", "Message", "Role", "DebateRequest", "DebateResponse"]
\ No newline at end of file
+__all__ = [
+    "Conversation", "ConversationSummary", "Message", "Role", "DebateRequest", "DebateResponse", "BatchEvaluationRequest",
+    "EvaluationJobRequest", "TopicDetection", "Evaluation", "EvaluationScores"
+]
\ No newline at end of file
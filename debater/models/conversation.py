@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, TypeAdapter
 from typing import List, Optional
 from enum import Enum
 
@@ -13,12 +13,26 @@ class Message(BaseModel):
     message: str
 
 
+# Validates and dumps whole message lists in one call, which is cheaper than
+# building or dumping each Message on its own
+MESSAGE_LIST = TypeAdapter(List[Message])
+
+
+class ConversationSummary(BaseModel):
+    text: str
+    # Number of messages, counted from the start of the conversation, folded into the summary
+    covered: int
+
+
 class Conversation(BaseModel):
     conversation_id: str
     topic: str
     bot_position: str
     first_message: str
     messages: List[Message] = []
+    # Set when loaded for a turn: messages ever appended and the rolling summary
+    message_count: Optional[int] = None
+    summary: Optional[ConversationSummary] = None
 
 
 class DebateRequest(BaseModel):
@@ -28,4 +42,16 @@ class DebateRequest(BaseModel):
 
 class DebateResponse(BaseModel):
     conversation_id: str
-    message: List[Message]  # Challenge requires "message" not "messages"
\ No newline at end of file
+    message: List[Message]  # Challenge requires "message" not "messages"
+
+
+class BatchEvaluationRequest(BaseModel):
+    conversation_ids: Optional[List[str]] = None
+    topic: Optional[str] = None  # Evaluate every conversation whose topic contains this text
+    full: bool = False
+    concurrency: Optional[int] = Field(default=None, ge=1, le=64)
+
+
+class EvaluationJobRequest(BaseModel):
+    conversation_id: str
+    full: bool = False
\ No newline at end of file
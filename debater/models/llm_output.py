@@ -0,0 +1,34 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Dict, List, Union
+
+
+class TopicDetection(BaseModel):
+    """Reply to the topic detection prompt"""
+    topic: str = Field(min_length=1)
+    bot_position: str = Field(min_length=1)
+    user_position: str = Field(min_length=1)
+
+
+class EvaluationScores(BaseModel):
+    """The six criteria of the evaluation prompt, each scored 1-10"""
+    logical_coherence: Union[int, float]
+    evidence_usage: Union[int, float]
+    emotional_appeal: Union[int, float]
+    counter_argument_handling: Union[int, float]
+    clarity_structure: Union[int, float]
+    overall_persuasiveness: Union[int, float]
+
+    @field_validator("*")
+    @classmethod
+    def clamp(cls, score: Union[int, float]) -> Union[int, float]:
+        # Keep a stray 0 or 11 from skewing the running average
+        return min(max(score, 1), 10)
+
+
+class Evaluation(BaseModel):
+    """Reply to the full and incremental evaluation prompts"""
+    # Every criterion is required, so a truncated reply cannot be repaired
+    # into a partial evaluation
+    scores: EvaluationScores
+    analysis: Dict[str, List[str]] = {}
+    summary: str = ""
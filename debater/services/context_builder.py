@@ -0,0 +1,67 @@
+from typing import Any, Dict, List, Optional
+
+# Rough characters-per-token ratio for English text with GPT tokenizers
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate; close enough for budgeting without a tokenizer"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Shorten text to about `max_tokens`, keeping its beginning and end"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    keep = max_tokens * CHARS_PER_TOKEN // 2
+    return f"{text[:keep].rstrip()} [...] {text[-keep:].lstrip()}"
+
+
+class ContextBuilder:
+    """
+    Fits conversation history into a prompt token budget.
+
+    The newest messages are kept first, each capped at `message_tokens` so a
+    single huge message cannot crowd out the rest. The rolling summary of
+    older turns, when there is one, is charged against the budget first.
+    """
+
+    def __init__(self, token_budget: int = 1200, message_tokens: int = 300, summary_tokens: int = 400):
+        self.token_budget = token_budget
+        self.message_tokens = message_tokens
+        self.summary_tokens = summary_tokens
+
+    def build(
+        self,
+        conversation_history: Optional[List[Dict[str, Any]]],
+        summary: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Select the history and summary to include in the prompt.
+
+        Returns a dict with `summary` (possibly truncated, or None), `history`
+        (oldest first, in the input's dict format) and `omitted`, the number
+        of older messages left out.
+        """
+        remaining = self.token_budget
+        if summary:
+            summary = truncate_to_tokens(summary, self.summary_tokens)
+            remaining -= estimate_tokens(summary)
+
+        history = []
+        conversation_history = conversation_history or []
+        for msg in reversed(conversation_history):
+            content = truncate_to_tokens(msg.get("content", ""), self.message_tokens)
+            cost = estimate_tokens(content)
+            # The newest message is always kept
+            if history and cost > remaining:
+                break
+            history.append(dict(msg, content=content))
+            remaining -= cost
+
+        history.reverse()
+        return {
+            "summary": summary,
+            "history": history,
+            "omitted": len(conversation_history) - len(history)
+        }
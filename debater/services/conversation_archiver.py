@@ -0,0 +1,58 @@
+import time
+import asyncio
+import logging
+from typing import Dict
+from debater.utils.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+SWEEP_LOCK_KEY = "conv_archiver:sweep_lock"
+
+
+class ConversationArchiver:
+    """
+    Moves conversations idle for `idle_seconds` from redis to the cold store.
+
+    Together with rehydration on lookup (see RedisClient), this bounds redis
+    memory by the conversations in use rather than by daily volume. Sweeps
+    run in the background; a redis lock lets one worker sweep per interval.
+    """
+
+    def __init__(self, redis_client: RedisClient, idle_seconds: float, batch: int = 500):
+        self.redis_client = redis_client
+        self.idle_seconds = idle_seconds
+        self.batch = batch
+        self.archived = 0
+        self.failures = 0
+
+    async def sweep(self) -> int:
+        """Archive up to `batch` idle conversations and return how many left redis"""
+        idle_before = time.time() - self.idle_seconds
+        archived = 0
+        for conversation_id in await self.redis_client.idle_conversations(idle_before, self.batch):
+            try:
+                if await self.redis_client.archive_conversation(conversation_id, idle_before):
+                    archived += 1
+            except Exception as e:
+                logger.error(f"Failed to archive conversation {conversation_id}: {e}")
+                self.failures += 1
+        self.archived += archived
+        return archived
+
+    async def run(self, interval: float) -> None:
+        """Sweep every `interval` seconds; one worker sweeps per interval"""
+        while True:
+            try:
+                if await self.redis_client.redis.set(SWEEP_LOCK_KEY, "1", nx=True, ex=max(int(interval), 1)):
+                    archived = await self.sweep()
+                    if archived:
+                        logger.info(f"Archived {archived} idle conversations")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Conversation archiver failed: {e}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, int]:
+        """Archive counters for this worker"""
+        return {"archived": self.archived, "failures": self.failures}
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from typing import Dict, Set
+from debater.models.conversation import Conversation, ConversationSummary
+from debater.utils.locks import RedisLock
+from debater.utils.redis_client import RedisClient
+from debater.services.debate_service import DebateService
+
+logger = logging.getLogger(__name__)
+
+# Messages always left out of the summary, so the prompt sees them verbatim
+RECENT_MESSAGES = 10
+
+# Older messages are folded into the summary once at least this many are pending
+SUMMARY_BATCH = 6
+
+
+class ConversationSummarizer:
+    """
+    Maintains a rolling summary of each conversation's older turns.
+
+    Everything but the newest `recent_messages` is folded, a batch at a time,
+    into a summary stored next to the conversation, so the debate prompt
+    keeps long-range context at a bounded size. Updates run in the
+    background after a turn and never delay the reply; a redis lock keeps
+    workers from summarizing the same conversation twice.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        debate_service: DebateService,
+        recent_messages: int = RECENT_MESSAGES,
+        batch: int = SUMMARY_BATCH
+    ):
+        self.redis_client = redis_client
+        self.debate_service = debate_service
+        self.recent_messages = recent_messages
+        self.batch = batch
+        self._tasks: Set[asyncio.Future] = set()
+        self.updates = 0
+        self.failures = 0
+
+    def pending(self, conversation: Conversation) -> int:
+        """Number of messages outside the recent window not yet summarized"""
+        if conversation.message_count is None:
+            return 0
+        covered = conversation.summary.covered if conversation.summary else 0
+        return conversation.message_count - self.recent_messages - covered
+
+    def schedule(self, conversation: Conversation) -> None:
+        """Update the summary in the background if enough turns are pending"""
+        if self.pending(conversation) < self.batch:
+            return
+        task = asyncio.ensure_future(self.update(conversation))
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def update(self, conversation: Conversation) -> bool:
+        """Fold pending older messages into the summary; returns whether it changed"""
+        conversation_id = conversation.conversation_id
+        lock = RedisLock(self.redis_client, f"summary_lock:{conversation_id}", ttl_ms=60000)
+        try:
+            if not await lock.acquire():
+                return False
+            try:
+                return await self._update(conversation_id)
+            finally:
+                await lock.release()
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"Summary update failed for {conversation_id}: {e}")
+            return False
+
+    async def _update(self, conversation_id: str) -> bool:
+        # Re-read under the lock; another worker may have just updated it
+        summary = await self.redis_client.get_conversation_summary(conversation_id)
+        covered = summary.covered if summary else 0
+
+        loaded = await self.redis_client.get_messages_since(conversation_id, covered)
+        if not loaded:
+            return False
+        conversation, total = loaded
+
+        fold = conversation.messages[:len(conversation.messages) - self.recent_messages]
+        if len(fold) < self.batch:
+            return False
+
+        text = await self.debate_service.summarize(
+            conversation.topic,
+            conversation.bot_position,
+            summary.text if summary else None,
+            [{"role": msg.role.value, "content": msg.message} for msg in fold]
+        )
+        if not text:
+            self.failures += 1
+            return False
+
+        await self.redis_client.set_conversation_summary(
+            conversation_id,
+            ConversationSummary(text=text, covered=total - self.recent_messages)
+        )
+        self.updates += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """Update counters for this worker"""
+        return {"updates": self.updates, "failures": self.failures, "in_flight": len(self._tasks)}
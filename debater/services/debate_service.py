@@ -1,26 +1,40 @@
 import json
 import logging
-from typing import List, Dict, Any
-from openai import OpenAI
+from typing import List, Dict, Any, AsyncIterator, Optional
+from debater.services.llm_gateway import LLM_FALLBACKS, LLMGateway, gateway_or_default
+from debater.services.context_builder import ContextBuilder
+from debater.services.prompts import (
+    DEBATE_SYSTEM, DEBATE_TAIL, OPENING_SYSTEM, OPENING_TAIL, SUMMARY_SYSTEM, SUMMARY_TAIL, chat_messages
+)
 
 logger = logging.getLogger(__name__)
 
+# Number of most recent messages loaded for the debate prompt; the context
+# builder keeps as many of them as fit its token budget
+CONTEXT_MESSAGES = 20
+
 
 class DebateService:
     """AI-powered debate response generation that stands its ground and persuades"""
 
-    def __init__(self, api_key: str = None, model: str = "gpt-4-turbo"):
-        if not api_key:
-            raise ValueError("OpenAI API key is required")
-        self.client = OpenAI(api_key=api_key)
+    def __init__(
+        self,
+        api_key: str = None,
+        model: str = "gpt-4-turbo",
+        gateway: Optional[LLMGateway] = None,
+        context_builder: Optional[ContextBuilder] = None
+    ):
+        self.gateway = gateway_or_default(gateway, api_key)
         self.model = model
+        self.context_builder = context_builder or ContextBuilder()
 
-    def generate_debate_response(
+    async def generate_debate_response(
         self,
         topic: str,
         bot_position: str,
         conversation_history: List[Dict[str, Any]] = None,
-        user_message: str = None
+        user_message: str = None,
+        summary: Optional[str] = None
     ) -> str:
         """
         Generate a persuasive debate response that stands its ground and convinces the other side.
@@ -30,59 +44,18 @@ class DebateService:
             bot_position: What position the bot should defend
             conversation_history: List of previous messages in the conversation
             user_message: The current user message (optional)
+            summary: Rolling summary of turns older than the history (optional)
 
         Returns:
             A persuasive debate response defending the bot's position
         """
         try:
-            # Build context from conversation history
-            context = ""
-            if conversation_history:
-                context = "Previous conversation:\n"
-                for msg in conversation_history[-5:]:  # Last 5 messages for context
-                    role = msg.get("role", "unknown")
-                    content = msg.get("content", "")
-                    context += f"{role}: {content}\n"
-                context += "\n"
-
-            prompt = f"""
-            You are a skilled debater in a debate about: {topic}
-
-            Your position to defend: {bot_position}
-
-            {context}
-
-            CRITICAL INSTRUCTIONS:
-            - STAND YOUR GROUND: Never concede or waver from your position
-            - BE PERSUASIVE: Your goal is to convince the other person of your view
-            - MAINTAIN CONSISTENCY: All arguments must align with your position
-            - BE CONVINCING: Use compelling logic, evidence, and reasoning
-            - STAY FOCUSED: Every response should reinforce your position
-
-            Your task is to generate a persuasive debate response that:
-            1. Firmly defends your position ({bot_position}) without compromise
-            2. Addresses any counter-arguments raised in the conversation
-            3. Uses strong, logical arguments and evidence
-            4. Maintains a confident, persuasive tone
-            5. Aims to convince the other person of your view
-            6. Stays consistent with your established position
-
-            Guidelines:
-            - Use compelling arguments that support your position
-            - Reference facts, statistics, or examples when helpful
-            - Counter opposing arguments with stronger reasoning
-            - Keep responses concise but impactful (2-4 sentences)
-            - Be persuasive without being aggressive
-            - Always return to reinforcing your core position
-
-            Remember: Your goal is to convince them, not to find middle ground.
-
-            Generate your persuasive debate response:
-            """
-
-            response = self.client.chat.completions.create(
-            model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+            messages = self._create_debate_messages(topic, bot_position, conversation_history, summary)
+
+            response = await self.gateway.complete(
+                label="debate",
+                model=self.model,
+                messages=messages,
                 max_tokens=300,
                 temperature=0.7
             )
@@ -92,10 +65,28 @@ class DebateService:
 
         except Exception as e:
             logger.error(f"Failed to generate debate response: {e}")
+            LLM_FALLBACKS.inc(label="debate")
             # Fallback response that maintains position
-            return f"I remain firm in my position that {bot_position}. The evidence clearly supports this view, and I'm confident you'll come to see the truth of this position."
+            return self._debate_fallback(bot_position)
+
+    async def stream_debate_response(
+        self,
+        topic: str,
+        bot_position: str,
+        conversation_history: List[Dict[str, Any]] = None,
+        summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a persuasive debate response as tokens arrive.
 
-    def generate_opening_argument(self, topic: str, bot_position: str) -> str:
+        Yields the fallback response if the completion fails before
+        producing any text.
+        """
+        messages = self._create_debate_messages(topic, bot_position, conversation_history, summary)
+        async for token in self._stream_completion("debate", messages, 300, self._debate_fallback(bot_position)):
+            yield token
+
+    async def generate_opening_argument(self, topic: str, bot_position: str) -> str:
         """
         Generate a compelling opening argument that sets the tone for persuasion.
 
@@ -107,33 +98,12 @@ class DebateService:
             An opening argument designed to persuade
         """
         try:
-            prompt = f"""
-            You are starting a one-on-one debate with a single person about: {topic}
-
-            Your position to defend: {bot_position}
-
-            Generate a compelling opening argument that:
-            1. Clearly and confidently states your position
-            2. Presents your strongest initial argument
-            3. Sets up a persuasive framework for the debate
-            4. Is engaging and invites response
-            5. Is designed to convince the other person
-            6. Is concise but impactful (2-3 sentences)
-
-            IMPORTANT STYLE GUIDELINES:
-            - Speak directly to the person (use "you" not "ladies and gentlemen")
-            - Use conversational, personal tone
-            - Avoid formal debate language like "Ladies and Gentlemen" or "I stand before you"
-            - Be direct and engaging as if talking to a friend
-            - Use "I believe" or "I'm confident" rather than formal speech patterns
-
-            Remember: Your goal is to persuade them of your position, not just present it.
-            Make it compelling and thought-provoking:
-            """
-
-            response = self.client.chat.completions.create(
-            model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+            messages = self._create_opening_messages(topic, bot_position)
+
+            response = await self.gateway.complete(
+                label="opening",
+                model=self.model,
+                messages=messages,
                 max_tokens=200,
                 temperature=0.7
             )
@@ -145,4 +115,125 @@ class DebateService:
 
         except Exception as e:
             logger.error(f"Failed to generate opening argument: {e}")
-            return f"I'm ready to convince you that {bot_position}. The evidence is clear and compelling - let me show you why this position is correct."
\ No newline at end of file
+            LLM_FALLBACKS.inc(label="opening")
+            return self._opening_fallback(bot_position)
+
+    async def stream_opening_argument(self, topic: str, bot_position: str) -> AsyncIterator[str]:
+        """
+        Stream an opening argument as tokens arrive.
+
+        Yields the fallback argument if the completion fails before
+        producing any text.
+        """
+        messages = self._create_opening_messages(topic, bot_position)
+        async for token in self._stream_completion("opening", messages, 200, self._opening_fallback(bot_position)):
+            yield token
+
+    async def _stream_completion(self, label: str, messages: List[Dict[str, str]], max_tokens: int, fallback: str) -> AsyncIterator[str]:
+        """Yield completion deltas, or the fallback if nothing was generated"""
+        produced = False
+        try:
+            stream = self.gateway.stream(
+                label=label,
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.7
+            )
+
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                token = chunk.choices[0].delta.content
+                if token:
+                    produced = True
+                    yield token
+
+        except Exception as e:
+            logger.error(f"Failed to stream completion: {e}")
+
+        if not produced:
+            LLM_FALLBACKS.inc(label=label)
+            yield fallback
+
+    async def summarize(
+        self,
+        topic: str,
+        bot_position: str,
+        previous_summary: Optional[str],
+        messages: List[Dict[str, Any]]
+    ) -> Optional[str]:
+        """
+        Fold older turns into the rolling summary of the debate.
+
+        Returns the updated summary, or None if the model is unavailable.
+        """
+        try:
+            response = await self.gateway.complete(
+                label="summary",
+                model=self.model,
+                messages=self._create_summary_messages(topic, bot_position, previous_summary, messages),
+                max_tokens=300,
+                temperature=0.2
+            )
+
+            return response.choices[0].message.content.strip()
+
+        except Exception as e:
+            logger.error(f"Failed to summarize conversation: {e}")
+            LLM_FALLBACKS.inc(label="summary")
+            return None
+
+    def _debate_fallback(self, bot_position: str) -> str:
+        """Response used when the model is unavailable"""
+        return f"I remain firm in my position that {bot_position}. The evidence clearly supports this view, and I'm confident you'll come to see the truth of this position."
+
+    def _opening_fallback(self, bot_position: str) -> str:
+        """Opening argument used when the model is unavailable"""
+        return f"I'm ready to convince you that {bot_position}. The evidence is clear and compelling - let me show you why this position is correct."
+
+    def _create_debate_messages(
+        self,
+        topic: str,
+        bot_position: str,
+        conversation_history: List[Dict[str, Any]] = None,
+        summary: Optional[str] = None
+    ) -> List[Dict[str, str]]:
+        """Create the debate response messages"""
+
+        # Build context from the summary and as much recent history as fits the budget
+        selected = self.context_builder.build(conversation_history, summary)
+        context = ""
+        if selected["summary"]:
+            context += f"Summary of the earlier debate:\n{selected['summary']}\n\n"
+        if selected["history"]:
+            context += "Previous conversation:\n"
+            for msg in selected["history"]:
+                role = msg.get("role", "unknown")
+                content = msg.get("content", "")
+                context += f"{role}: {content}\n"
+            context += "\n"
+
+        return chat_messages(DEBATE_SYSTEM, DEBATE_TAIL, topic=topic, bot_position=bot_position, context=context)
+
+    def _create_opening_messages(self, topic: str, bot_position: str) -> List[Dict[str, str]]:
+        """Create the opening argument messages"""
+        return chat_messages(OPENING_SYSTEM, OPENING_TAIL, topic=topic, bot_position=bot_position)
+
+    def _create_summary_messages(
+        self,
+        topic: str,
+        bot_position: str,
+        previous_summary: Optional[str],
+        messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, str]]:
+        """Create the rolling summary messages"""
+        transcript = "\n".join(f"{msg.get('role', 'unknown')}: {msg.get('content', '')}" for msg in messages)
+        return chat_messages(
+            SUMMARY_SYSTEM,
+            SUMMARY_TAIL,
+            topic=topic,
+            bot_position=bot_position,
+            previous_summary=previous_summary or "(none yet)",
+            transcript=transcript
+        )
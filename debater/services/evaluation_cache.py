@@ -0,0 +1,87 @@
+import json
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from debater.utils.redis_client import RedisClient, CONVERSATION_TTL, evaluation_cache_key, evaluation_state_key
+from debater.utils.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationCache:
+    """
+    Redis cache of persuasiveness evaluations.
+
+    An entry is only served when the digest of the conversation's messages
+    and the evaluating model match the one it was computed for. RedisClient
+    also drops the entry whenever a message is appended.
+
+    The running state of incremental evaluations is stored alongside it and
+    survives appends.
+    """
+
+    def __init__(self, redis_client: RedisClient, ttl: int = CONVERSATION_TTL):
+        self.redis_client = redis_client
+        self.ttl = ttl
+
+    @staticmethod
+    def digest(conversation_messages: List[Dict], model: str) -> str:
+        """Content hash of the messages being evaluated and the model"""
+        # Hashed with the standard library so digests do not depend on whether orjson is installed
+        payload = json.dumps({"model": model, "messages": conversation_messages}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def get(self, conversation_id: str, digest: str) -> Optional[Dict]:
+        """Return {"evaluation", "computed_at"} if a matching entry is cached"""
+        try:
+            data = await self.redis_client.redis.get(evaluation_cache_key(conversation_id))
+        except Exception as e:
+            logger.warning(f"Evaluation cache read failed: {e}")
+            return None
+
+        if not data:
+            return None
+
+        entry = loads(data)
+        if entry["digest"] != digest:
+            return None
+        return entry
+
+    async def set(self, conversation_id: str, digest: str, evaluation: Dict) -> Dict:
+        """Cache an evaluation and return the stored entry"""
+        entry = {
+            "digest": digest,
+            "evaluation": evaluation,
+            "computed_at": datetime.now(timezone.utc).isoformat()
+        }
+        try:
+            await self.redis_client.redis.set(evaluation_cache_key(conversation_id), dumps(entry), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Evaluation cache write failed: {e}")
+        return entry
+
+    async def get_state(self, conversation_id: str) -> Optional[Dict]:
+        """Return the running incremental evaluation state, if any"""
+        data = await self.redis_client.redis.get(evaluation_state_key(conversation_id))
+        if not data:
+            return None
+        return loads(data)
+
+    async def get_states(self, conversation_ids: List[str]) -> List[Optional[Dict]]:
+        """Return the running states of many conversations with a single MGET"""
+        if not conversation_ids:
+            return []
+        values = await self.redis_client.redis.mget([evaluation_state_key(cid) for cid in conversation_ids])
+        return [loads(data) if data else None for data in values]
+
+    async def set_state(self, conversation_id: str, evaluation: Dict, evaluated_messages: int, bot_turns: int) -> Dict:
+        """Store the running incremental evaluation state and return it"""
+        state = {
+            "evaluation": evaluation,
+            "evaluated_messages": evaluated_messages,
+            "bot_turns": bot_turns,
+            "computed_at": datetime.now(timezone.utc).isoformat()
+        }
+        await self.redis_client.redis.set(evaluation_state_key(conversation_id), dumps(state), ex=self.ttl)
+        return state
@@ -0,0 +1,130 @@
+import uuid
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from debater.utils.redis_client import RedisClient
+from debater.utils.serialization import dumps, loads
+from debater.services.evaluation_service import EvaluationService
+
+logger = logging.getLogger(__name__)
+
+# Pending job ids, pushed on the left and claimed from the right
+EVALUATION_QUEUE_KEY = "eval_jobs:queue"
+
+# Finished jobs stay pollable for an hour
+JOB_TTL = 3600
+
+
+def evaluation_job_key(job_id: str) -> str:
+    """Key of an evaluation job record"""
+    return f"eval_job:{job_id}"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+class EvaluationJobQueue:
+    """
+    Redis-backed queue of persuasiveness evaluation jobs.
+
+    The API enqueues jobs and polls their records; evaluation workers
+    (`python -m debater.worker`) claim and run them, so slow evaluations
+    never hold an HTTP connection or share the API's LLM concurrency.
+
+    A job record is a JSON document with a `status` of "queued",
+    "running", "done", "not_found" or "failed". Claiming pops the job id,
+    so a job whose worker dies mid-evaluation is not retried; it stays
+    "running" until its record expires and can be enqueued again.
+    """
+
+    def __init__(self, redis_client: RedisClient, ttl: int = JOB_TTL):
+        self.redis_client = redis_client
+        self.ttl = ttl
+
+    async def enqueue(self, conversation_id: str, full: bool = False) -> Dict:
+        """Create a job record and queue it in a single round trip"""
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "conversation_id": conversation_id,
+            "full": full,
+            "status": "queued",
+            "enqueued_at": _now()
+        }
+        pipe = self.redis_client.redis.pipeline(transaction=True)
+        pipe.set(evaluation_job_key(job["job_id"]), dumps(job), ex=self.ttl)
+        pipe.lpush(EVALUATION_QUEUE_KEY, job["job_id"])
+        await pipe.execute()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        """Return the job record, or None if it is unknown or expired"""
+        data = await self.redis_client.redis.get(evaluation_job_key(job_id))
+        return loads(data) if data else None
+
+    async def depth(self) -> int:
+        """Number of jobs waiting to be claimed"""
+        return await self.redis_client.redis.llen(EVALUATION_QUEUE_KEY)
+
+    async def claim(self, timeout: float = 2) -> Optional[Dict]:
+        """Block up to `timeout` seconds for the next job and mark it running"""
+        popped = await self.redis_client.redis.brpop([EVALUATION_QUEUE_KEY], timeout=timeout)
+        if not popped:
+            return None
+
+        job = await self.get(popped[1])
+        if not job:
+            # The record expired while the job was queued
+            return None
+        return await self._update(job, status="running", started_at=_now())
+
+    async def finish(self, job: Dict, status: str, result: Optional[Dict] = None, error: Optional[str] = None) -> Dict:
+        """Record the outcome of a claimed job"""
+        return await self._update(job, status=status, result=result, error=error, finished_at=_now())
+
+    async def _update(self, job: Dict, **fields) -> Dict:
+        job = dict(job, **{name: value for name, value in fields.items() if value is not None})
+        await self.redis_client.redis.set(evaluation_job_key(job["job_id"]), dumps(job), ex=self.ttl)
+        return job
+
+
+class EvaluationWorker:
+    """Runs queued evaluation jobs, up to `concurrency` at a time"""
+
+    def __init__(self, queue: EvaluationJobQueue, evaluation_service: EvaluationService, concurrency: int = 4, poll_timeout: float = 2):
+        self.queue = queue
+        self.evaluation_service = evaluation_service
+        self.concurrency = concurrency
+        self.poll_timeout = poll_timeout
+        self.processed = 0
+        self.failed = 0
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Claim and run jobs until `stop` is set; jobs in progress are finished first"""
+        await asyncio.gather(*[self._consume(stop) for _ in range(self.concurrency)])
+
+    async def _consume(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                job = await self.queue.claim(self.poll_timeout)
+            except Exception as e:
+                logger.error(f"Failed to claim evaluation job: {e}")
+                await asyncio.sleep(self.poll_timeout)
+                continue
+            if job:
+                await self.process(job)
+
+    async def process(self, job: Dict) -> Dict:
+        """Evaluate the job's conversation and store the outcome on the job"""
+        try:
+            result = await self.evaluation_service.evaluate(job["conversation_id"], full=job["full"])
+        except Exception as e:
+            logger.error(f"Evaluation job {job['job_id']} failed: {e}")
+            self.failed += 1
+            return await self.queue.finish(job, "failed", error=str(e))
+
+        self.processed += 1
+        if not result:
+            return await self.queue.finish(job, "not_found")
+        return await self.queue.finish(job, "done", result=result)
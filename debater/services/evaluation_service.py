@@ -0,0 +1,227 @@
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+from debater.models.conversation import Conversation, Message, Role
+from debater.utils.redis_client import RedisClient
+from debater.utils.single_flight import SingleFlight
+from debater.services.evaluation_cache import EvaluationCache
+from debater.services.persuasiveness_evaluator import PersuasivenessEvaluator
+
+logger = logging.getLogger(__name__)
+
+
+class EvaluationError(Exception):
+    """Raised when the evaluator could not produce a result"""
+
+
+class EvaluationService:
+    """
+    Evaluates stored conversations, incrementally by default.
+
+    Incremental evaluations only send the messages appended since the last
+    evaluation and merge the result into the running state. A full
+    re-evaluation scores every stored message and is cached by content.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        evaluator: PersuasivenessEvaluator,
+        cache: EvaluationCache,
+        single_flight: Optional[SingleFlight] = None
+    ):
+        self.redis_client = redis_client
+        self.evaluator = evaluator
+        self.cache = cache
+        self.single_flight = single_flight
+
+    async def evaluate(self, conversation_id: str, full: bool = False) -> Optional[Dict]:
+        """
+        Evaluate a conversation.
+
+        Returns None if the conversation does not exist and raises
+        EvaluationError if the evaluator fails. Concurrent requests for the
+        same conversation and mode share one evaluation; callers that waited
+        on another worker re-read its cached result or state.
+        """
+        return await self._coalesced(conversation_id, full, lambda: self._evaluate(conversation_id, full))
+
+    async def _coalesced(
+        self,
+        conversation_id: str,
+        full: bool,
+        fn: Callable[[], Awaitable[Optional[Dict]]],
+        recheck: Optional[Callable[[], Awaitable[Optional[Dict]]]] = None
+    ) -> Optional[Dict]:
+        """Run `fn` under the conversation's single-flight key, shared by single and batch evaluations"""
+        if not self.single_flight:
+            return await fn()
+
+        mode = "full" if full else "incremental"
+        return await self.single_flight.do(f"evaluate:{conversation_id}:{mode}", fn, recheck)
+
+    async def _evaluate(self, conversation_id: str, full: bool) -> Optional[Dict]:
+        state = None if full else await self.cache.get_state(conversation_id)
+        seen = state["evaluated_messages"] if state else 0
+
+        loaded = await self.redis_client.get_messages_since(conversation_id, seen)
+        return await self._evaluate_loaded(loaded, state)
+
+    async def evaluate_many(
+        self,
+        conversation_ids: List[str],
+        full: bool = False,
+        concurrency: int = 8,
+        fetch_batch_size: int = 200
+    ) -> AsyncIterator[Dict]:
+        """
+        Evaluate many conversations, yielding results as each one completes.
+
+        Conversations are loaded from redis in pipelined batches while
+        earlier ones are evaluated; at most two batches are held loaded but
+        not yet evaluated, and at most `concurrency` evaluations run at once.
+        Each evaluation shares the single-flight key of evaluate(), so batch
+        items never race a single evaluation or a queued job on the same
+        conversation. Failures are reported per conversation with a
+        `status` of "error" or "not_found" instead of aborting the batch.
+        """
+        conversation_ids = list(dict.fromkeys(conversation_ids))
+        semaphore = asyncio.Semaphore(concurrency)
+        room = asyncio.Semaphore(2 * fetch_batch_size)
+        results: asyncio.Queue = asyncio.Queue()
+        tasks = []
+
+        async def run(conversation_id: str, loaded, state) -> None:
+            try:
+                async with semaphore:
+                    try:
+                        # The preloaded data is used when this call leads; after
+                        # waiting on another worker the conversation is re-read
+                        result = await self._coalesced(
+                            conversation_id,
+                            full,
+                            lambda: self._evaluate_loaded(loaded, state),
+                            recheck=lambda: self._evaluate(conversation_id, full)
+                        )
+                    except Exception as e:
+                        result = {"conversation_id": conversation_id, "status": "error", "detail": str(e)}
+                    else:
+                        if not result:
+                            result = {"conversation_id": conversation_id, "status": "not_found"}
+                        else:
+                            result = {"status": "ok", **result}
+                results.put_nowait(result)
+            finally:
+                room.release()
+
+        async def load() -> None:
+            for i in range(0, len(conversation_ids), fetch_batch_size):
+                batch = conversation_ids[i:i + fetch_batch_size]
+                for _ in batch:
+                    await room.acquire()
+                states = [None] * len(batch) if full else await self.cache.get_states(batch)
+                loaded = await self.redis_client.get_many_messages_since([
+                    (conversation_id, state["evaluated_messages"] if state else 0)
+                    for conversation_id, state in zip(batch, states)
+                ])
+                tasks.extend(
+                    asyncio.ensure_future(run(conversation_id, conversation, state))
+                    for conversation_id, conversation, state in zip(batch, loaded, states)
+                )
+
+        loader = asyncio.ensure_future(load())
+        try:
+            for _ in conversation_ids:
+                next_result = asyncio.ensure_future(results.get())
+                if not loader.done():
+                    await asyncio.wait([next_result, loader], return_when=asyncio.FIRST_COMPLETED)
+                if not next_result.done() and loader.exception():
+                    # Loading failed and nothing more will arrive
+                    next_result.cancel()
+                    raise loader.exception()
+                yield await next_result
+
+        finally:
+            # Stop loading and outstanding evaluations if the consumer goes away
+            loader.cancel()
+            for task in tasks:
+                task.cancel()
+
+    async def _evaluate_loaded(self, loaded: Optional[Tuple[Conversation, int]], state: Optional[Dict]) -> Optional[Dict]:
+        """Evaluate a conversation already loaded by get_messages_since"""
+        if not loaded:
+            return None
+        conversation, total = loaded
+
+        if not state:
+            return await self._evaluate_full(conversation, total)
+
+        if not conversation.messages:
+            # Nothing new since the last evaluation
+            return self._response(conversation, total, state["evaluation"], state["computed_at"], "hit", "incremental")
+
+        new_messages = self._to_dicts(conversation.messages)
+        evaluation = await self.evaluator.evaluate_incremental(
+            new_messages=new_messages,
+            topic=conversation.topic,
+            bot_position=conversation.bot_position,
+            previous_evaluation=state["evaluation"],
+            previous_bot_turns=state["bot_turns"]
+        )
+        if "error" in evaluation:
+            raise EvaluationError(evaluation["error"])
+
+        state = await self.cache.set_state(
+            conversation.conversation_id,
+            evaluation,
+            evaluated_messages=total,
+            bot_turns=state["bot_turns"] + self._bot_turns(conversation.messages)
+        )
+        return self._response(conversation, total, evaluation, state["computed_at"], "miss", "incremental")
+
+    async def _evaluate_full(self, conversation: Conversation, total: int) -> Dict:
+        """Evaluate every stored message, serving a cached result when unchanged"""
+        conversation_messages = self._to_dicts(conversation.messages)
+        digest = EvaluationCache.digest(conversation_messages, self.evaluator.model)
+        entry = await self.cache.get(conversation.conversation_id, digest)
+        cache_status = "hit"
+
+        if not entry:
+            evaluation = await self.evaluator.evaluate_conversation(
+                conversation_messages=conversation_messages,
+                topic=conversation.topic,
+                bot_position=conversation.bot_position
+            )
+            if "error" in evaluation:
+                raise EvaluationError(evaluation["error"])
+
+            entry = await self.cache.set(conversation.conversation_id, digest, evaluation)
+            cache_status = "miss"
+
+        # A full evaluation restarts the running incremental state
+        await self.cache.set_state(
+            conversation.conversation_id,
+            entry["evaluation"],
+            evaluated_messages=total,
+            bot_turns=self._bot_turns(conversation.messages)
+        )
+        return self._response(conversation, total, entry["evaluation"], entry["computed_at"], cache_status, "full")
+
+    def _to_dicts(self, messages: List[Message]) -> List[Dict]:
+        """Convert messages to the dict format used by the evaluator"""
+        return [{"role": msg.role.value, "message": msg.message} for msg in messages]
+
+    def _bot_turns(self, messages: List[Message]) -> int:
+        return len([msg for msg in messages if msg.role == Role.BOT])
+
+    def _response(self, conversation: Conversation, total: int, evaluation: Dict, computed_at: str, cache_status: str, mode: str) -> Dict:
+        return {
+            "conversation_id": conversation.conversation_id,
+            "topic": conversation.topic,
+            "bot_position": conversation.bot_position,
+            "message_count": total,
+            "evaluation": evaluation,
+            "mode": mode,
+            "cache": cache_status,
+            "computed_at": computed_at
+        }
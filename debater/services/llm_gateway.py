@@ -0,0 +1,292 @@
+import time
+import random
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+import httpx
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from debater.utils.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Errors worth retrying: rate limits, server errors and connection problems
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+LLM_SECONDS = Histogram(
+    "debater_llm_request_seconds", "Chat completion latency including retries, by call label and model",
+    ["label", "model"]
+)
+LLM_FIRST_TOKEN_SECONDS = Histogram(
+    "debater_llm_first_token_seconds", "Time to the first streamed chunk, by call label and model",
+    ["label", "model"]
+)
+LLM_QUEUE_SECONDS = Histogram("debater_llm_queue_seconds", "Time spent waiting for a concurrency slot")
+LLM_TOKENS = Counter(
+    "debater_llm_tokens_total", "Tokens used, by call label, model and type (prompt, cached, completion)",
+    ["label", "model", "type"]
+)
+LLM_ERRORS = Counter(
+    "debater_llm_errors_total", "Chat completions that failed after retries, by call label, model and error",
+    ["label", "model", "error"]
+)
+LLM_FALLBACKS = Counter(
+    "debater_llm_fallbacks_total", "Failed completions answered with a canned fallback, by call label", ["label"]
+)
+LLM_RETRIES = Counter("debater_llm_retries_total", "Retried chat completion attempts, by call label and model", ["label", "model"])
+
+
+class LLMGateway:
+    """
+    Shared entry point for every chat completion made by the app.
+
+    One AsyncOpenAI client with a tuned keep-alive connection pool is shared
+    by all services. Calls get an overall deadline, retries with jittered
+    exponential backoff on 429/5xx/connection errors, and a semaphore caps
+    the number of completions in flight; callers beyond the cap queue.
+
+    Token usage is recorded per call label, including how many prompt tokens
+    were served from the provider's prefix cache.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        max_concurrency: int = 16,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        max_connections: int = 32,
+        keepalive_expiry: float = 60.0,
+        base_url: Optional[str] = None
+    ):
+        if not api_key:
+            raise ValueError("OpenAI API key is required")
+
+        self.http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry
+            )
+        )
+        # Retries are handled here so they respect the deadline and the limiter
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=self.http_client, max_retries=0)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.requests = 0
+        self.retries = 0
+        self.errors = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.usage: Dict[str, Dict[str, int]] = {}
+
+    async def complete(self, timeout: Optional[float] = None, label: Optional[str] = None, **kwargs: Any) -> Any:
+        """
+        Create a chat completion.
+
+        `timeout` is the overall deadline in seconds, covering queueing,
+        every attempt and the backoff between them. `label` names the
+        prompt in the usage statistics. Remaining keyword arguments are
+        passed to `chat.completions.create`.
+        """
+        label = label or "unlabelled"
+        model = kwargs.get("model", "")
+        started = time.perf_counter()
+        deadline = time.monotonic() + (timeout or self.timeout)
+        try:
+            async with self._slot(deadline, label, model):
+                response = await self._with_retries(deadline, kwargs, label)
+        finally:
+            LLM_SECONDS.observe(time.perf_counter() - started, label=label, model=model)
+        self._record_usage(label, getattr(response, "usage", None), model)
+        return response
+
+    async def stream(self, timeout: Optional[float] = None, label: Optional[str] = None, **kwargs: Any) -> AsyncIterator[Any]:
+        """
+        Stream a chat completion, yielding chunks as they arrive.
+
+        `timeout` is the deadline for getting a slot and opening the
+        stream. The concurrency slot is held until the stream is exhausted.
+        Only opening the stream is retried; a stream that fails midway raises.
+        Usage is requested as a final chunk without choices.
+        """
+        label = label or "unlabelled"
+        model = kwargs.get("model", "")
+        started = time.perf_counter()
+        deadline = time.monotonic() + (timeout or self.timeout)
+        kwargs = dict(kwargs, stream=True)
+        kwargs.setdefault("stream_options", {"include_usage": True})
+        async with self._slot(deadline, label, model):
+            stream = await self._with_retries(deadline, kwargs, label)
+            first = True
+            try:
+                async for chunk in stream:
+                    if first:
+                        LLM_FIRST_TOKEN_SECONDS.observe(time.perf_counter() - started, label=label, model=model)
+                        first = False
+                    self._record_usage(label, getattr(chunk, "usage", None), model)
+                    yield chunk
+            except Exception as e:
+                self.errors += 1
+                LLM_ERRORS.inc(label=label, model=model, error=e.__class__.__name__)
+                raise
+            finally:
+                LLM_SECONDS.observe(time.perf_counter() - started, label=label, model=model)
+
+    def _record_usage(self, label: str, usage: Any, model: str = "") -> None:
+        """Accumulate prompt, cached prompt and completion tokens for a label"""
+        prompt_tokens = getattr(usage, "prompt_tokens", None)
+        if not isinstance(prompt_tokens, int):
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", None)
+        cached_tokens = cached_tokens if isinstance(cached_tokens, int) else 0
+        completion_tokens = getattr(usage, "completion_tokens", None)
+        completion_tokens = completion_tokens if isinstance(completion_tokens, int) else 0
+
+        logger.debug(f"LLM call {label}: {prompt_tokens} prompt tokens ({cached_tokens} cached), {completion_tokens} completion tokens")
+        totals = self.usage.setdefault(label, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0})
+        totals["calls"] += 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["cached_tokens"] += cached_tokens
+        totals["completion_tokens"] += completion_tokens
+        LLM_TOKENS.inc(prompt_tokens, label=label, model=model, type="prompt")
+        LLM_TOKENS.inc(cached_tokens, label=label, model=model, type="cached")
+        LLM_TOKENS.inc(completion_tokens, label=label, model=model, type="completion")
+
+    async def _with_retries(self, deadline: float, kwargs: Dict[str, Any], label: str) -> Any:
+        model = kwargs.get("model", "")
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise self._timeout_error(label, model)
+
+            try:
+                return await self.client.chat.completions.create(timeout=remaining, **kwargs)
+            except RETRYABLE_ERRORS as e:
+                delay = self._backoff(attempt, e)
+                if attempt >= self.max_retries or time.monotonic() + delay >= deadline:
+                    self.errors += 1
+                    LLM_ERRORS.inc(label=label, model=model, error=e.__class__.__name__)
+                    raise
+                logger.warning(f"LLM call failed ({e.__class__.__name__}), retrying in {delay:.2f}s")
+                self.retries += 1
+                LLM_RETRIES.inc(label=label, model=model)
+                attempt += 1
+                await asyncio.sleep(delay)
+            except Exception as e:
+                self.errors += 1
+                LLM_ERRORS.inc(label=label, model=model, error=e.__class__.__name__)
+                raise
+
+    def _timeout_error(self, label: str, model: str) -> openai.APITimeoutError:
+        """Count a call that ran out of time and build the error it raises"""
+        self.errors += 1
+        LLM_ERRORS.inc(label=label, model=model, error="APITimeoutError")
+        return openai.APITimeoutError(request=httpx.Request("POST", str(self.client.base_url)))
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        """Full-jitter exponential backoff, honouring Retry-After when given"""
+        delay = random.uniform(0, self.backoff_base * (2 ** attempt))
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the event loop serving requests
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _slot(self, deadline: float, label: str, model: str) -> "_Slot":
+        return _Slot(self, deadline, label, model)
+
+    def stats(self) -> Dict[str, Any]:
+        """Limiter and retry statistics for this worker"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self.in_flight,
+            "queue_depth": self.waiting,
+            "max_queue_depth": self.max_waiting,
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "avg_wait_seconds": self.total_wait / self.requests if self.requests else 0.0,
+            "max_wait_seconds": self.max_wait,
+            "usage": {
+                label: dict(
+                    totals,
+                    cached_ratio=totals["cached_tokens"] / totals["prompt_tokens"] if totals["prompt_tokens"] else 0.0
+                )
+                for label, totals in self.usage.items()
+            }
+        }
+
+    async def warm_up(self) -> None:
+        """Open a keep-alive connection to the API endpoint; any HTTP response will do"""
+        await self.http_client.get(str(self.client.base_url), timeout=self.timeout)
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def gateway_or_default(gateway: Optional[LLMGateway], api_key: Optional[str]) -> LLMGateway:
+    """Services share one gateway; a private one is created if none is given"""
+    return gateway or LLMGateway(api_key)
+
+
+class _Slot:
+    """
+    Concurrency slot that records queue depth and wait time.
+
+    Queueing counts against the call's deadline: a call still waiting
+    for a slot when it passes raises APITimeoutError.
+    """
+
+    def __init__(self, gateway: LLMGateway, deadline: float, label: str, model: str):
+        self.gateway = gateway
+        self.deadline = deadline
+        self.label = label
+        self.model = model
+
+    async def __aenter__(self) -> None:
+        gateway = self.gateway
+        started = time.monotonic()
+        if gateway.semaphore.locked():
+            # Every slot is taken, so this call queues
+            gateway.waiting += 1
+            gateway.max_waiting = max(gateway.max_waiting, gateway.waiting)
+            try:
+                await asyncio.wait_for(gateway.semaphore.acquire(), self.deadline - time.monotonic())
+            except asyncio.TimeoutError:
+                raise gateway._timeout_error(self.label, self.model) from None
+            finally:
+                gateway.waiting -= 1
+        else:
+            await gateway.semaphore.acquire()
+
+        waited = time.monotonic() - started
+        LLM_QUEUE_SECONDS.observe(waited)
+        gateway.requests += 1
+        gateway.total_wait += waited
+        gateway.max_wait = max(gateway.max_wait, waited)
+        gateway.in_flight += 1
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.gateway.in_flight -= 1
+        self.gateway.semaphore.release()
@@ -0,0 +1,185 @@
+import time
+import asyncio
+import hashlib
+import logging
+from typing import AsyncIterator, Dict, Optional
+from debater.utils.cache import normalize_text
+from debater.utils.redis_client import RedisClient
+from debater.utils.serialization import dumps, loads
+from debater.services.debate_service import DebateService
+
+logger = logging.getLogger(__name__)
+
+POPULARITY_KEY = "opening_pool:popularity"
+SUBJECTS_KEY = "opening_pool:subjects"
+WARM_LOCK_KEY = "opening_pool:warm_lock"
+
+
+class OpeningPool:
+    """
+    Redis-backed pool of pre-generated opening arguments.
+
+    Each normalized (topic, bot_position) pair has a sorted set of openings
+    scored by creation time, served at random for variety. Requests bump a
+    popularity score that the background warmer uses to fill the pools of
+    the most frequent subjects. Entries expire by age, and pools of subjects
+    whose decayed popularity drops too low are evicted.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        debate_service: DebateService,
+        pool_size: int = 5,
+        max_age: int = 21600,
+        warm_subjects: int = 20,
+        min_popularity: float = 1,
+        decay: float = 0.5
+    ):
+        self.redis_client = redis_client
+        self.debate_service = debate_service
+        self.pool_size = pool_size
+        self.max_age = max_age
+        self.warm_subjects = warm_subjects
+        self.min_popularity = min_popularity
+        self.decay = decay
+        self.hits = 0
+        self.misses = 0
+
+    def _subject_id(self, topic: str, bot_position: str) -> str:
+        subject = f"{normalize_text(topic)}|{normalize_text(bot_position)}"
+        return hashlib.sha1(subject.encode("utf-8")).hexdigest()
+
+    def _pool_key(self, subject_id: str) -> str:
+        return f"opening_pool:{subject_id}"
+
+    async def take(self, topic: str, bot_position: str) -> Optional[str]:
+        """
+        Return a random pooled opening for the subject, or None on a miss.
+
+        Popularity tracking, age eviction and the random read share a single
+        round trip. Pool errors are treated as a miss.
+        """
+        subject_id = self._subject_id(topic, bot_position)
+        pool_key = self._pool_key(subject_id)
+        try:
+            pipe = self.redis_client.redis.pipeline(transaction=False)
+            pipe.zincrby(POPULARITY_KEY, 1, subject_id)
+            pipe.hset(SUBJECTS_KEY, subject_id, dumps({"topic": topic, "bot_position": bot_position}))
+            pipe.zremrangebyscore(pool_key, "-inf", time.time() - self.max_age)
+            pipe.zrandmember(pool_key, 1)
+            members = (await pipe.execute())[-1]
+            opening = members[0] if members else None
+        except Exception as e:
+            logger.warning(f"Opening pool read failed: {e}")
+            opening = None
+
+        if opening:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return opening
+
+    async def add(self, topic: str, bot_position: str, opening: str) -> None:
+        """Add an opening to the subject's pool, keeping only the newest entries"""
+        # Never pool the canned argument used when generation fails
+        if not opening or opening == self.debate_service._opening_fallback(bot_position):
+            return
+
+        pool_key = self._pool_key(self._subject_id(topic, bot_position))
+        try:
+            pipe = self.redis_client.redis.pipeline(transaction=False)
+            pipe.zadd(pool_key, {opening: time.time()})
+            pipe.zremrangebyrank(pool_key, 0, -self.pool_size - 1)
+            pipe.expire(pool_key, self.max_age)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Opening pool write failed: {e}")
+
+    async def get_opening(self, topic: str, bot_position: str) -> str:
+        """Serve a pooled opening, falling back to live generation on a miss"""
+        opening = await self.take(topic, bot_position)
+        if opening:
+            return opening
+
+        opening = await self.debate_service.generate_opening_argument(topic, bot_position)
+        await self.add(topic, bot_position, opening)
+        return opening
+
+    async def stream_opening(self, topic: str, bot_position: str) -> AsyncIterator[str]:
+        """Streaming variant of get_opening; a pooled opening is sent as one chunk"""
+        opening = await self.take(topic, bot_position)
+        if opening:
+            yield opening
+            return
+
+        chunks = []
+        async for token in self.debate_service.stream_opening_argument(topic, bot_position):
+            chunks.append(token)
+            yield token
+        await self.add(topic, bot_position, "".join(chunks).strip())
+
+    async def warm(self, concurrency: int = 2) -> int:
+        """
+        Fill the pools of the most popular subjects and evict unpopular ones.
+
+        Popularity decays on every run, so subjects that stop being requested
+        fall below `min_popularity` and their pools are dropped. Returns the
+        number of openings generated.
+        """
+        redis = self.redis_client.redis
+
+        # Decay popularity and evict subjects that are no longer requested
+        await redis.zunionstore(POPULARITY_KEY, {POPULARITY_KEY: self.decay})
+        evicted = await redis.zrangebyscore(POPULARITY_KEY, "-inf", f"({self.min_popularity}")
+        if evicted:
+            pipe = redis.pipeline(transaction=False)
+            pipe.zrem(POPULARITY_KEY, *evicted)
+            pipe.hdel(SUBJECTS_KEY, *evicted)
+            pipe.delete(*[self._pool_key(subject_id) for subject_id in evicted])
+            await pipe.execute()
+
+        subject_ids = await redis.zrevrange(POPULARITY_KEY, 0, self.warm_subjects - 1)
+        if not subject_ids:
+            return 0
+
+        pipe = redis.pipeline(transaction=False)
+        for subject_id in subject_ids:
+            pipe.zremrangebyscore(self._pool_key(subject_id), "-inf", time.time() - self.max_age)
+            pipe.zcard(self._pool_key(subject_id))
+        sizes = (await pipe.execute())[1::2]
+        subjects = await redis.hmget(SUBJECTS_KEY, subject_ids)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def generate(subject: Dict) -> None:
+            async with semaphore:
+                opening = await self.debate_service.generate_opening_argument(subject["topic"], subject["bot_position"])
+                await self.add(subject["topic"], subject["bot_position"], opening)
+
+        jobs = []
+        for subject_data, size in zip(subjects, sizes):
+            if not subject_data:
+                continue
+            subject = loads(subject_data)
+            jobs.extend(generate(subject) for _ in range(self.pool_size - size))
+
+        await asyncio.gather(*jobs)
+        return len(jobs)
+
+    async def run_warmer(self, interval: float) -> None:
+        """Warm the pool every `interval` seconds; one worker warms per interval"""
+        while True:
+            try:
+                if await self.redis_client.redis.set(WARM_LOCK_KEY, "1", nx=True, ex=max(int(interval), 1)):
+                    generated = await self.warm()
+                    logger.info(f"Opening pool warmer generated {generated} openings")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Opening pool warmer failed: {e}")
+            await asyncio.sleep(interval)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters for this worker"""
+        return {"hits": self.hits, "misses": self.misses}
@@ -1,22 +1,25 @@
 import json
 import logging
-from typing import Dict, List, Tuple
-from openai import OpenAI
+from typing import Dict, List, Tuple, Optional
+from debater.services.llm_gateway import LLM_FALLBACKS, LLMGateway, gateway_or_default
+from debater.services.prompts import EVALUATION_SYSTEM, EVALUATION_TAIL, INCREMENTAL_EVALUATION_TAIL, chat_messages
+from debater.services.structured_output import JSON_MODE, parse_completion
+from debater.models.llm_output import Evaluation
 
 logger = logging.getLogger(__name__)
 
+# Maximum items kept per analysis list in the running incremental state
+MAX_ANALYSIS_ITEMS = 5
+
 
 class PersuasivenessEvaluator:
     """Evaluates the persuasiveness of AI debate responses"""
 
-    def __init__(self, api_key: str, model: str = "gpt-4-turbo"):
-        if not api_key:
-            raise ValueError("OpenAI API key is required")
-
-        self.client = OpenAI(api_key=api_key)
+    def __init__(self, api_key: str = None, model: str = "gpt-4-turbo", gateway: Optional[LLMGateway] = None):
+        self.gateway = gateway_or_default(gateway, api_key)
         self.model = model
 
-    def evaluate_conversation(self, conversation_messages: List[Dict], topic: str, bot_position: str) -> Dict:
+    async def evaluate_conversation(self, conversation_messages: List[Dict], topic: str, bot_position: str) -> Dict:
         """
         Evaluate the persuasiveness of AI responses in a conversation.
 
@@ -38,80 +41,163 @@ class PersuasivenessEvaluator:
                     "scores": None
                 }
 
-            # Create evaluation prompt
-            prompt = self._create_evaluation_prompt(conversation_messages, topic, bot_position)
+            # Create evaluation messages
+            messages = self._create_evaluation_messages(conversation_messages, topic, bot_position)
 
-            response = self.client.chat.completions.create(
+            response = await self.gateway.complete(
+                label="evaluation",
                 model=self.model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=messages,
                 max_tokens=500,
-                temperature=0.1
+                temperature=0.1,
+                response_format=JSON_MODE
             )
 
-            content = response.choices[0].message.content.strip()
+            content = response.choices[0].message.content
             logger.info(f"Persuasiveness evaluation response: {content}")
 
-            # Parse JSON response
-            result = json.loads(content)
-            return result
+            # Validate the JSON reply, repairing fenced or truncated output
+            return parse_completion("evaluation", content, Evaluation).model_dump()
 
         except Exception as e:
             logger.error(f"Persuasiveness evaluation failed: {e}")
+            LLM_FALLBACKS.inc(label="evaluation")
             return {
                 "error": f"Evaluation failed: {str(e)}",
                 "scores": None
             }
 
-    def _create_evaluation_prompt(self, conversation_messages: List[Dict], topic: str, bot_position: str) -> str:
-        """Create the evaluation prompt for the AI"""
+    async def evaluate_incremental(
+        self,
+        new_messages: List[Dict],
+        topic: str,
+        bot_position: str,
+        previous_evaluation: Dict,
+        previous_bot_turns: int
+    ) -> Dict:
+        """
+        Evaluate only the turns added since the previous evaluation and merge the result.
 
-        # Format conversation for analysis
-        conversation_text = ""
-        for msg in conversation_messages:
-            role = "User" if msg.get('role') == 'user' else "Bot"
-            conversation_text += f"{role}: {msg.get('message', '')}\n\n"
+        The prompt carries the previous scores and a compact analysis instead
+        of the full transcript, so its size does not grow with the conversation.
+
+        Args:
+            new_messages: Messages appended since the previous evaluation
+            topic: The debate topic
+            bot_position: The position the bot is defending
+            previous_evaluation: The running evaluation to merge into
+            previous_bot_turns: Number of bot messages the running scores cover
 
-        prompt = f"""
-        You are an expert debate evaluator. Analyze the persuasiveness of the Bot's responses in this debate conversation.
-
-        DEBATE CONTEXT:
-        Topic: {topic}
-        Bot Position: {bot_position}
-
-        CONVERSATION:
-        {conversation_text}
-
-        EVALUATION CRITERIA:
-        1. Logical Coherence (1-10): How well-structured and logical are the Bot's arguments?
-        2. Evidence Usage (1-10): How effectively does the Bot use facts, examples, and evidence?
-        3. Emotional Appeal (1-10): How well does the Bot connect emotionally with the user?
-        4. Counter-Argument Handling (1-10): How effectively does the Bot address user objections?
-        5. Clarity and Structure (1-10): How clear and well-organized are the Bot's responses?
-        6. Overall Persuasiveness (1-10): Overall effectiveness in convincing the user
-
-        ANALYSIS:
-        - Identify the Bot's strongest and weakest arguments
-        - Note any missed opportunities to persuade
-        - Suggest improvements for future responses
-
-        Return ONLY a JSON object with this structure:
-        {{
-            "scores": {{
-                "logical_coherence": 8,
-                "evidence_usage": 7,
-                "emotional_appeal": 6,
-                "counter_argument_handling": 8,
-                "clarity_structure": 7,
-                "overall_persuasiveness": 7
-            }},
-            "analysis": {{
-                "strengths": ["Clear logical structure", "Good use of evidence"],
-                "weaknesses": ["Could be more emotionally engaging"],
-                "missed_opportunities": ["Didn't address user's concern about X"],
-                "improvements": ["Add more personal examples", "Use more emotional language"]
-            }},
-            "summary": "Brief overall assessment of the Bot's persuasiveness"
-        }}
+        Returns:
+            Dict with the merged scores and analysis
         """
+        try:
+            new_bot_turns = len([msg for msg in new_messages if msg.get('role') == 'bot'])
+            if not new_bot_turns:
+                return previous_evaluation
 
-        return prompt
\ No newline at end of file
+            messages = self._create_incremental_messages(new_messages, topic, bot_position, previous_evaluation)
+
+            response = await self.gateway.complete(
+                label="incremental_evaluation",
+                model=self.model,
+                messages=messages,
+                max_tokens=500,
+                temperature=0.1,
+                response_format=JSON_MODE
+            )
+
+            content = response.choices[0].message.content
+            logger.info(f"Incremental persuasiveness evaluation response: {content}")
+
+            result = parse_completion("incremental_evaluation", content, Evaluation).model_dump()
+            return self._merge_evaluations(previous_evaluation, previous_bot_turns, result, new_bot_turns)
+
+        except Exception as e:
+            logger.error(f"Incremental persuasiveness evaluation failed: {e}")
+            LLM_FALLBACKS.inc(label="incremental_evaluation")
+            return {
+                "error": f"Evaluation failed: {str(e)}",
+                "scores": None
+            }
+
+    def _merge_evaluations(self, previous: Dict, previous_bot_turns: int, new: Dict, new_bot_turns: int) -> Dict:
+        """
+        Weight scores by the number of bot turns each evaluation covers.
+
+        A criterion scored by only one of the evaluations keeps that score,
+        and an empty new summary keeps the previous one.
+        """
+        total_turns = previous_bot_turns + new_bot_turns
+        previous_scores = previous.get("scores") or {}
+        new_scores = new.get("scores") or {}
+        scores = {}
+        for criterion in list(new_scores) + [c for c in previous_scores if c not in new_scores]:
+            score = new_scores.get(criterion)
+            previous_score = previous_scores.get(criterion)
+            if score is None:
+                scores[criterion] = previous_score
+            elif previous_score is None:
+                scores[criterion] = score
+            else:
+                scores[criterion] = round((previous_score * previous_bot_turns + score * new_bot_turns) / total_turns, 1)
+
+        return {
+            "scores": scores,
+            "analysis": self._compact_analysis(new.get("analysis") or {}, previous.get("analysis") or {}),
+            "summary": new.get("summary") or previous.get("summary", "")
+        }
+
+    def _compact_analysis(self, *analyses: Dict) -> Dict:
+        """Merge analysis lists, newest first, without duplicates and capped in size"""
+        merged = {}
+        for analysis in analyses:
+            for section, items in analysis.items():
+                merged.setdefault(section, [])
+                for item in items:
+                    if item not in merged[section] and len(merged[section]) < MAX_ANALYSIS_ITEMS:
+                        merged[section].append(item)
+        return merged
+
+    def _create_incremental_messages(
+        self,
+        new_messages: List[Dict],
+        topic: str,
+        bot_position: str,
+        previous_evaluation: Dict
+    ) -> List[Dict[str, str]]:
+        """Create the messages evaluating new turns against the running evaluation"""
+
+        previous_text = json.dumps({
+            "scores": previous_evaluation.get("scores"),
+            "analysis": self._compact_analysis(previous_evaluation.get("analysis") or {}),
+            "summary": previous_evaluation.get("summary", "")
+        })
+
+        return chat_messages(
+            EVALUATION_SYSTEM,
+            INCREMENTAL_EVALUATION_TAIL,
+            topic=topic,
+            bot_position=bot_position,
+            previous_text=previous_text,
+            # Format only the new turns for analysis
+            conversation_text=self._conversation_text(new_messages)
+        )
+
+    def _create_evaluation_messages(self, conversation_messages: List[Dict], topic: str, bot_position: str) -> List[Dict[str, str]]:
+        """Create the evaluation messages for the AI"""
+        return chat_messages(
+            EVALUATION_SYSTEM,
+            EVALUATION_TAIL,
+            topic=topic,
+            bot_position=bot_position,
+            conversation_text=self._conversation_text(conversation_messages)
+        )
+
+    def _conversation_text(self, messages: List[Dict]) -> str:
+        """Format messages for analysis"""
+        conversation_text = ""
+        for msg in messages:
+            role = "User" if msg.get('role') == 'user' else "Bot"
+            conversation_text += f"{role}: {msg.get('message', '')}\n\n"
+        return conversation_text
@@ -0,0 +1,110 @@
+import re
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from debater.utils.metrics import Counter
+
+logger = logging.getLogger(__name__)
+
+# Request body option asking the model for a single JSON object
+JSON_MODE = {"type": "json_object"}
+
+LLM_PARSE_RESULTS = Counter(
+    "debater_llm_parse_total",
+    "Parsed JSON completions by call label and outcome (ok, repaired, failed); failed completions are wasted",
+    ["label", "outcome"]
+)
+
+_FENCE = re.compile(r"^```[a-zA-Z]*\s*|\s*```$")
+_CLOSERS = {"{": "}", "[": "]"}
+
+Schema = TypeVar("Schema", bound=BaseModel)
+
+
+class StructuredOutputError(ValueError):
+    """A completion that could not be parsed into its schema, even after repair"""
+
+
+def repair_json(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Recover a JSON object from model output without another completion.
+
+    Strips code fences and surrounding prose, and closes an object cut off
+    by the token limit: an unterminated string is closed, and if that is
+    not enough, the output is cut back to the last complete member before
+    the open brackets are closed. Returns None if nothing can be recovered.
+    """
+    text = _FENCE.sub("", text.strip())
+    start = text.find("{")
+    if start < 0:
+        return None
+    text = text[start:]
+
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+        return value if isinstance(value, dict) else None
+    except ValueError:
+        pass
+
+    # Scan for the brackets still open at the end and at every member separator
+    stack: List[str] = []
+    cuts: List[Tuple[int, List[str]]] = []
+    in_string = escaped = False
+    for i, char in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in _CLOSERS:
+            stack.append(_CLOSERS[char])
+        elif char in "}]" and stack:
+            stack.pop()
+        elif char == ",":
+            cuts.append((i, list(stack)))
+
+    tail = text[:-1] if escaped else text
+    closed = (tail + '"' if in_string else tail).rstrip().rstrip(",")
+    attempts = [(closed, stack)] + [(text[:i], open_stack) for i, open_stack in reversed(cuts)]
+    for prefix, open_stack in attempts:
+        try:
+            value = json.loads(prefix + "".join(reversed(open_stack)))
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value
+    return None
+
+
+def parse_completion(label: str, content: Optional[str], schema: Type[Schema]) -> Schema:
+    """
+    Validate a JSON completion against its schema, repairing it if needed.
+
+    Every attempt is counted by outcome so the share of wasted completions
+    shows up in the metrics. Raises StructuredOutputError on failure.
+    """
+    content = (content or "").strip()
+    try:
+        result = schema.model_validate_json(content)
+        LLM_PARSE_RESULTS.inc(label=label, outcome="ok")
+        return result
+    except ValidationError:
+        pass
+
+    repaired = repair_json(content)
+    if repaired is not None:
+        try:
+            result = schema.model_validate(repaired)
+            logger.warning(f"Repaired malformed {label} completion")
+            LLM_PARSE_RESULTS.inc(label=label, outcome="repaired")
+            return result
+        except ValidationError:
+            pass
+
+    LLM_PARSE_RESULTS.inc(label=label, outcome="failed")
+    raise StructuredOutputError(f"Could not parse {label} completion into {schema.__name__}: {content[:200]!r}")
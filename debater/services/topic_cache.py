@@ -0,0 +1,84 @@
+import hashlib
+import logging
+from typing import Dict, Optional, Tuple
+from debater.utils.cache import LRUCache, normalize_text
+from debater.utils.redis_client import RedisClient
+from debater.utils.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+
+def topic_cache_key(model: str, field: str) -> str:
+    """Key of one shared topic detection result"""
+    return f"topic_cache:{model}:{field}"
+
+
+class TopicCache:
+    """
+    Two-tier cache for topic detection results.
+
+    An in-process LRU sits in front of redis entries shared by all workers
+    (`topic_cache_key`), each expiring on its own `ttl` after it is
+    written. Entries are keyed by the normalized message, so near-identical
+    openers share one result.
+    """
+
+    def __init__(self, redis_client: RedisClient, max_size: int = 1024, ttl: int = 86400):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.local = LRUCache(max_size=max_size, ttl=ttl)
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    def _field(self, message: str) -> str:
+        return hashlib.sha1(normalize_text(message).encode("utf-8")).hexdigest()
+
+    async def get(self, model: str, message: str) -> Optional[Tuple[str, str, str]]:
+        """Return (topic, bot_position, user_position) if cached"""
+        field = self._field(message)
+
+        result = self.local.get((model, field))
+        if result is not None:
+            self.local_hits += 1
+            return result
+
+        try:
+            data = await self.redis_client.redis.get(topic_cache_key(model, field))
+            if data:
+                entry = loads(data)
+                result = (entry["topic"], entry["bot_position"], entry["user_position"])
+                self.local.set((model, field), result)
+                self.redis_hits += 1
+                return result
+        except Exception as e:
+            logger.warning(f"Topic cache read failed: {e}")
+
+        self.misses += 1
+        return None
+
+    async def set(self, model: str, message: str, result: Tuple[str, str, str]) -> None:
+        """Store a detection result in both tiers"""
+        field = self._field(message)
+        self.local.set((model, field), result)
+
+        topic, bot_position, user_position = result
+        entry = {
+            "topic": topic,
+            "bot_position": bot_position,
+            "user_position": user_position
+        }
+        try:
+            # Redis evicts every entry on its own once its TTL runs out
+            await self.redis_client.redis.set(topic_cache_key(model, field), dumps(entry), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"Topic cache write failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit and miss counters for this worker"""
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "local_size": len(self.local)
+        }
@@ -0,0 +1,101 @@
+"""
+Re-encode stored conversations from legacy JSON to the compact encoding.
+
+Usage: python -m debater.tools.migrate_encoding [--dry-run] [--scan-count N]
+
+Safe to run while the app is serving traffic: each message list is rewritten
+under WATCH and retried if a turn changes it meanwhile, and TTLs are kept.
+Conversations already in the compact encoding are left untouched.
+"""
+import asyncio
+import argparse
+from typing import Dict
+from redis.exceptions import WatchError
+from debater.utils.settings import Settings
+from debater.utils.redis_client import RedisClient
+from debater.utils.codec import decode_message, decode_metadata, encode_message, encode_metadata, is_legacy
+
+
+async def migrate(redis_client: RedisClient, scan_count: int = 500, dry_run: bool = False) -> Dict[str, int]:
+    """Migrate every conversation and return byte and entry counts"""
+    stats = {"conversations": 0, "metadata": 0, "messages": 0, "bytes_before": 0, "bytes_after": 0}
+    redis = redis_client.binary
+
+    async for meta_key in redis.scan_iter(match="conv_meta:*", count=scan_count):
+        stats["conversations"] += 1
+        conversation_id = meta_key[len(b"conv_meta:"):].decode("utf-8")
+        await _migrate_metadata(redis, meta_key, stats, dry_run)
+        await _migrate_messages(redis, f"conv_messages:{conversation_id}", stats, dry_run)
+
+    return stats
+
+
+async def _migrate_metadata(redis, key: bytes, stats: Dict[str, int], dry_run: bool) -> None:
+    data = await redis.get(key)
+    if not data or not is_legacy(data):
+        return
+
+    encoded = encode_metadata(decode_metadata(data))
+    stats["metadata"] += 1
+    stats["bytes_before"] += len(data)
+    stats["bytes_after"] += len(encoded)
+    if not dry_run:
+        # KEEPTTL preserves the conversation's remaining lifetime
+        await redis.set(key, encoded, keepttl=True)
+
+
+async def _migrate_messages(redis, key: str, stats: Dict[str, int], dry_run: bool) -> None:
+    async with redis.pipeline(transaction=True) as pipe:
+        while True:
+            try:
+                await pipe.watch(key)
+                entries = await pipe.lrange(key, 0, -1)
+                if not any(is_legacy(entry) for entry in entries):
+                    await pipe.reset()
+                    return
+
+                encoded = [encode_message(*decode_message(entry)) for entry in entries]
+                if dry_run:
+                    await pipe.reset()
+                else:
+                    ttl = await pipe.pttl(key)
+                    pipe.multi()
+                    pipe.delete(key)
+                    pipe.rpush(key, *encoded)
+                    if ttl > 0:
+                        pipe.pexpire(key, ttl)
+                    await pipe.execute()
+                break
+            except WatchError:
+                # A turn was appended meanwhile; read the list again
+                continue
+
+    stats["messages"] += sum(1 for entry in entries if is_legacy(entry))
+    stats["bytes_before"] += sum(len(entry) for entry in entries)
+    stats["bytes_after"] += sum(len(entry) for entry in encoded)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-encode stored conversations in the compact encoding")
+    parser.add_argument("--dry-run", action="store_true", help="report what would change without writing")
+    parser.add_argument("--scan-count", type=int, default=500, help="SCAN batch size")
+    args = parser.parse_args()
+
+    async def run() -> Dict[str, int]:
+        redis_client = RedisClient(Settings())
+        try:
+            return await migrate(redis_client, scan_count=args.scan_count, dry_run=args.dry_run)
+        finally:
+            await redis_client.close()
+
+    stats = asyncio.run(run())
+    saved = stats["bytes_before"] - stats["bytes_after"]
+    print(
+        f"{'Would migrate' if args.dry_run else 'Migrated'} {stats['metadata']} metadata entries and "
+        f"{stats['messages']} messages across {stats['conversations']} conversations; "
+        f"{stats['bytes_before']} -> {stats['bytes_after']} bytes ({saved} saved)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import zlib
+import msgpack
+from typing import Dict, Tuple, Union
+from debater.models.conversation import Role
+from debater.utils.serialization import loads
+
+# Every encoded entry starts with a one-byte format version. Legacy entries
+# are plain JSON objects, whose first byte is always "{", and are still read.
+FORMAT_MSGPACK = 1
+FORMAT_MSGPACK_ZLIB = 2
+
+# Messages whose packed form reaches this many bytes are zlib-compressed,
+# when compression actually makes them smaller
+COMPRESS_THRESHOLD = 256
+
+ROLE_TAGS = {Role.USER: 0, Role.BOT: 1}
+TAG_ROLES = {tag: role for role, tag in ROLE_TAGS.items()}
+
+# Metadata is stored as a msgpack array in this field order
+METADATA_FIELDS = ("topic", "bot_position", "first_message")
+
+
+def encode_message(role: Role, message: str, compress_threshold: int = COMPRESS_THRESHOLD) -> bytes:
+    """Encode a message as version byte + msgpack [role tag, text]"""
+    payload = msgpack.packb([ROLE_TAGS[role], message])
+    if len(payload) >= compress_threshold:
+        compressed = zlib.compress(payload)
+        if len(compressed) < len(payload):
+            return bytes((FORMAT_MSGPACK_ZLIB,)) + compressed
+    return bytes((FORMAT_MSGPACK,)) + payload
+
+
+def decode_message(data: Union[bytes, str]) -> Tuple[Role, str]:
+    """Decode a stored message, compact or legacy JSON"""
+    version = data[0] if isinstance(data, bytes) else None
+    if version == FORMAT_MSGPACK:
+        tag, message = msgpack.unpackb(data[1:])
+    elif version == FORMAT_MSGPACK_ZLIB:
+        tag, message = msgpack.unpackb(zlib.decompress(data[1:]))
+    else:
+        entry = loads(data)
+        return Role(entry["role"]), entry["message"]
+    return TAG_ROLES[tag], message
+
+
+def encode_metadata(metadata: Dict[str, str]) -> bytes:
+    """Encode conversation metadata as version byte + msgpack array"""
+    return bytes((FORMAT_MSGPACK,)) + msgpack.packb([metadata[field] for field in METADATA_FIELDS])
+
+
+def decode_metadata(data: Union[bytes, str]) -> Dict[str, str]:
+    """Decode stored metadata, compact or legacy JSON"""
+    if isinstance(data, bytes) and data[:1] == bytes((FORMAT_MSGPACK,)):
+        return dict(zip(METADATA_FIELDS, msgpack.unpackb(data[1:])))
+    return loads(data)
+
+
+def is_legacy(data: Union[bytes, str]) -> bool:
+    """Whether an entry still uses the legacy JSON encoding"""
+    return not isinstance(data, bytes) or data[:1] not in (bytes((FORMAT_MSGPACK,)), bytes((FORMAT_MSGPACK_ZLIB,)))
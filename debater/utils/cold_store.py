@@ -0,0 +1,99 @@
+import os
+import time
+import zlib
+import asyncio
+import sqlite3
+import threading
+import functools
+import msgpack
+from typing import Any, Callable, Dict, List, Optional
+from debater.utils.cache import normalize_text
+
+# Archived conversations start with this format byte, then a zlib-compressed
+# msgpack map of the conversation's raw redis values
+FORMAT_MSGPACK_ZLIB = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    conversation_id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    archived_at REAL NOT NULL,
+    data BLOB NOT NULL
+)
+"""
+
+
+def encode_snapshot(snapshot: Dict[str, Any]) -> bytes:
+    """Compress a conversation snapshot for storage"""
+    return bytes((FORMAT_MSGPACK_ZLIB,)) + zlib.compress(msgpack.packb(snapshot, use_bin_type=True))
+
+
+def decode_snapshot(data: bytes) -> Dict[str, Any]:
+    """Decode a stored conversation snapshot"""
+    if data[:1] != bytes((FORMAT_MSGPACK_ZLIB,)):
+        raise ValueError(f"Unknown cold store format: {data[:1]!r}")
+    return msgpack.unpackb(zlib.decompress(data[1:]), raw=False)
+
+
+class ColdStore:
+    """
+    Compressed on-disk store of idle conversations, indexed by id.
+
+    Conversations are moved here from redis by the archiver and read back
+    by RedisClient when a lookup misses redis, so redis only holds
+    conversations that are in use. Snapshots keep the values exactly as
+    redis stored them (see RedisClient.archive_conversation).
+
+    SQLite calls run in the default executor, one at a time per process.
+    Every API and worker process must open the same file: a conversation
+    archived by one replica is only found by replicas that can read it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        # The default rollback journal, unlike WAL, also works on network
+        # volumes shared by several hosts
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute(SCHEMA)
+
+    async def put(self, conversation_id: str, topic: str, snapshot: Dict[str, Any]) -> int:
+        """Store (or replace) a conversation snapshot and return its stored size"""
+        data = encode_snapshot(snapshot)
+        await self._run(
+            self._execute,
+            "INSERT OR REPLACE INTO conversations (conversation_id, topic, archived_at, data) VALUES (?, ?, ?, ?)",
+            (conversation_id, topic, time.time(), data)
+        )
+        return len(data)
+
+    async def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Return the snapshot of an archived conversation, or None"""
+        rows = await self._run(self._execute, "SELECT data FROM conversations WHERE conversation_id = ?", (conversation_id,))
+        return decode_snapshot(rows[0][0]) if rows else None
+
+    async def delete(self, conversation_id: str) -> None:
+        await self._run(self._execute, "DELETE FROM conversations WHERE conversation_id = ?", (conversation_id,))
+
+    async def find_by_topic(self, topic: str) -> List[str]:
+        """Ids of archived conversations whose topic contains `topic`, compared as normalized text"""
+        wanted = normalize_text(topic)
+        rows = await self._run(self._execute, "SELECT conversation_id, topic FROM conversations", ())
+        return [conversation_id for conversation_id, stored in rows if wanted in normalize_text(stored)]
+
+    async def count(self) -> int:
+        """Number of archived conversations"""
+        return (await self._run(self._execute, "SELECT COUNT(*) FROM conversations", ()))[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _execute(self, sql: str, params: tuple) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(sql, params).fetchall()
+
+    async def _run(self, fn: Callable, *args) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args))
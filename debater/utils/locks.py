@@ -0,0 +1,61 @@
+import uuid
+import asyncio
+from typing import Optional
+from debater.utils.redis_client import RedisClient
+
+# Delete the lock only if it is still held by the caller's token
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# Reset the lock's TTL only if it is still held by the caller's token
+EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+class RedisLock:
+    """
+    Short-lived lock shared by every worker and host.
+
+    Acquired with SET NX PX under a random token, so a lock that outlives
+    its TTL can never be released by its former owner.
+    """
+
+    def __init__(self, redis_client: RedisClient, key: str, ttl_ms: int = 30000):
+        self.redis_client = redis_client
+        self.key = key
+        self.ttl_ms = ttl_ms
+        self.token = str(uuid.uuid4())
+
+    async def acquire(self) -> bool:
+        """Try to take the lock without waiting"""
+        return bool(await self.redis_client.redis.set(self.key, self.token, nx=True, px=self.ttl_ms))
+
+    async def release(self) -> bool:
+        """Release the lock if this instance still owns it"""
+        redis = self.redis_client.redis
+        return bool(await redis.register_script(RELEASE_SCRIPT)(keys=[self.key], args=[self.token], client=redis))
+
+    async def extend(self) -> bool:
+        """Reset the TTL if this instance still owns the lock"""
+        redis = self.redis_client.redis
+        return bool(await redis.register_script(EXTEND_SCRIPT)(keys=[self.key], args=[self.token, self.ttl_ms], client=redis))
+
+    async def keep_alive(self, interval: Optional[float] = None) -> None:
+        """Extend the lock every `interval` seconds (a third of the TTL by default) until cancelled or lost"""
+        interval = interval or self.ttl_ms / 3000
+        while True:
+            await asyncio.sleep(interval)
+            if not await self.extend():
+                return
+
+    async def locked(self) -> bool:
+        """Whether anyone currently holds the lock"""
+        return bool(await self.redis_client.redis.exists(self.key))
@@ -1,45 +1,266 @@
-import redis
-import json
+import redis.asyncio as redis
+import time
+import asyncio
 import uuid
-from typing import Optional, List
+import logging
+from typing import Optional, List, Tuple
+from redis.asyncio.client import Pipeline
 from debater.utils.settings import Settings
-from debater.models.conversation import Conversation, Message, Role
+from debater.utils.metrics import Counter, Histogram
+from debater.utils.cache import normalize_text
+from debater.utils.cold_store import ColdStore
+from debater.utils.codec import encode_message, decode_message, encode_metadata, decode_metadata
+from debater.models.conversation import MESSAGE_LIST, Conversation, ConversationSummary, Message, Role
+
+logger = logging.getLogger(__name__)
+
+# Conversations expire after 24 hours without activity
+CONVERSATION_TTL = 86400
+
+# Maximum number of messages kept per conversation (FIFO)
+MAX_MESSAGES = 50
+
+# Number of messages returned to the client after a turn
+RESPONSE_WINDOW = 10
+
+# Sorted set of conversation ids scored by the time of their last write,
+# which the archiver scans for idle conversations. Only kept while the cold
+# store is enabled, since nothing else removes its entries.
+ACTIVITY_KEY = "conv_activity"
+
+# Validate the conversation, take the turn lease (if a token is given),
+# append the user's message and return the metadata, the newest messages,
+# the message count and the rolling summary, all in one round trip. Returns
+# 0 if another turn holds the lease. Conversations stored before messages
+# were counted have no count key; it is seeded from the list length.
+# KEYS: meta key, messages key, evaluation cache key, message count key, lease key, summary key, activity key
+# ARGV: encoded message, max messages, ttl, history size, lease token, lease ttl (ms), now,
+#       conversation id (empty to skip recording activity)
+START_TURN_SCRIPT = """
+local metadata = redis.call('GET', KEYS[1])
+if not metadata then
+    return nil
+end
+if ARGV[5] ~= '' and not redis.call('SET', KEYS[5], ARGV[5], 'NX', 'PX', ARGV[6]) then
+    return 0
+end
+redis.call('DEL', KEYS[3])
+if redis.call('EXISTS', KEYS[4]) == 0 then
+    redis.call('SET', KEYS[4], redis.call('LLEN', KEYS[2]))
+end
+redis.call('RPUSH', KEYS[2], ARGV[1])
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[2]), -1)
+local count = redis.call('INCR', KEYS[4])
+redis.call('EXPIRE', KEYS[4], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[6], ARGV[3])
+if ARGV[8] ~= '' then
+    redis.call('ZADD', KEYS[7], ARGV[7], ARGV[8])
+end
+return {metadata, redis.call('LRANGE', KEYS[2], -tonumber(ARGV[4]), -1), count, redis.call('GET', KEYS[6])}
+"""
+
+# Return the metadata, the total number of messages ever appended and the
+# messages appended after the first `seen` ones (bounded by what is still
+# stored). Without a count key (conversations stored before messages were
+# counted) the list length is the total.
+# KEYS: meta key, messages key, message count key
+# ARGV: seen
+MESSAGES_SINCE_SCRIPT = """
+local metadata = redis.call('GET', KEYS[1])
+if not metadata then
+    return nil
+end
+local total = tonumber(redis.call('GET', KEYS[3]) or redis.call('LLEN', KEYS[2]))
+local new = total - tonumber(ARGV[1])
+if new <= 0 then
+    return {metadata, total, {}}
+end
+return {metadata, total, redis.call('LRANGE', KEYS[2], -new, -1)}
+"""
+
+# Delete an archived conversation from redis unless it was written after
+# `cutoff` or a turn is in progress. Returns 1 if it was deleted.
+# KEYS: activity key, lease key, then the conversation's keys
+# ARGV: conversation id, cutoff
+ARCHIVE_SCRIPT = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if (score and tonumber(score) > tonumber(ARGV[2])) or redis.call('EXISTS', KEYS[2]) == 1 then
+    return 0
+end
+redis.call('DEL', unpack(KEYS, 3))
+redis.call('ZREM', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Write an archived conversation back unless it is already in redis.
+# Returns 1 if it was restored.
+# KEYS: meta key, messages key, message count key, summary key, evaluation state key, activity key
+# ARGV: conversation id, ttl, now, metadata, message count, summary, evaluation state, then the messages
+RESTORE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[4], 'EX', ARGV[2])
+if #ARGV > 7 then
+    redis.call('RPUSH', KEYS[2], unpack(ARGV, 8))
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+redis.call('SET', KEYS[3], ARGV[5], 'EX', ARGV[2])
+if ARGV[6] ~= '' then
+    redis.call('SET', KEYS[4], ARGV[6], 'EX', ARGV[2])
+end
+if ARGV[7] ~= '' then
+    redis.call('SET', KEYS[5], ARGV[7], 'EX', ARGV[2])
+end
+redis.call('ZADD', KEYS[6], ARGV[3], ARGV[1])
+return 1
+"""
+
+
+class ConversationBusyError(Exception):
+    """Raised when another turn on the conversation is still in progress"""
+
+
+def turn_lease_key(conversation_id: str) -> str:
+    """Key of the lease held while a turn on the conversation is in progress"""
+    return f"turn_lease:{conversation_id}"
+
+
+def summary_key(conversation_id: str) -> str:
+    """Key of the rolling summary of older turns"""
+    return f"conv_summary:{conversation_id}"
+
+
+def evaluation_cache_key(conversation_id: str) -> str:
+    """Key of the cached persuasiveness evaluation, dropped on every append"""
+    return f"eval_cache:{conversation_id}"
+
+
+def evaluation_state_key(conversation_id: str) -> str:
+    """Key of the running incremental evaluation state"""
+    return f"eval_state:{conversation_id}"
+
+
+REDIS_SECONDS = Histogram("debater_redis_command_seconds", "Redis round trip latency, by command", ["command"])
+REDIS_ERRORS = Counter("debater_redis_errors_total", "Failed redis round trips, by command and error", ["command", "error"])
+COLD_TIER = Counter("debater_cold_tier_total", "Conversations moved between redis and the cold store", ["operation"])
+
+
+class _Timed:
+    """Times a redis round trip and counts its failures"""
+
+    def __init__(self, command: str):
+        self.command = command
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        REDIS_SECONDS.observe(time.perf_counter() - self.started, command=self.command)
+        if exc_type is not None:
+            REDIS_ERRORS.inc(command=self.command, error=exc_type.__name__)
+
+
+class InstrumentedPipeline(Pipeline):
+    """Pipeline whose round trip is timed as MULTI or PIPELINE"""
+
+    async def execute(self, raise_on_error: bool = True):
+        with _Timed("MULTI" if self.is_transaction else "PIPELINE"):
+            return await super().execute(raise_on_error)
+
+
+class InstrumentedRedis(redis.Redis):
+    """Redis client recording the latency of every command and pipeline"""
+
+    async def execute_command(self, *args, **options):
+        with _Timed(str(args[0]).upper()):
+            return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction: bool = True, shard_hint=None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
 
 
 class RedisClient:
     def __init__(self, settings: Settings):
+        # REDIS_MAX_CONNECTIONS is this worker's budget, split between the
+        # text and binary pools
+        binary_connections = max(settings.redis_max_connections // 2, 1)
+        pool_kwargs = {
+            "decode_responses": True,
+            "max_connections": max(settings.redis_max_connections - binary_connections, 1),
+            "socket_timeout": settings.redis_socket_timeout,
+            "socket_connect_timeout": settings.redis_socket_timeout,
+        }
         # Use SSL for external connections (upstash), not for local
         if 'upstash.io' in settings.redis_url or settings.redis_url.startswith('rediss://'):
-            self.redis = redis.from_url(
-                settings.redis_url,
-                decode_responses=True,
-                ssl_cert_reqs=None
+            pool_kwargs["ssl_cert_reqs"] = None
+
+        # A single pool is shared by every request handled by this worker
+        self.pool = redis.ConnectionPool.from_url(settings.redis_url, **pool_kwargs)
+        self.redis = InstrumentedRedis(connection_pool=self.pool)
+
+        # Conversation metadata and messages use a compact binary encoding
+        # (see debater.utils.codec), so they are read without decoding
+        self.binary_pool = redis.ConnectionPool.from_url(settings.redis_url, **dict(pool_kwargs, decode_responses=False, max_connections=binary_connections))
+        self.binary = InstrumentedRedis(connection_pool=self.binary_pool)
+
+        # Scripts are sent by SHA after the first call
+        self._start_turn_script = self.binary.register_script(START_TURN_SCRIPT)
+        self._messages_since_script = self.binary.register_script(MESSAGES_SINCE_SCRIPT)
+        self._archive_script = self.binary.register_script(ARCHIVE_SCRIPT)
+        self._restore_script = self.binary.register_script(RESTORE_SCRIPT)
+
+        # Idle conversations are moved to the cold store and restored when a
+        # lookup misses redis (see archive_conversation). The store must be
+        # readable by every replica, or archived conversations would 404 on
+        # the others, so it is only opened when declared shared.
+        self.cold_store = None
+        if settings.cold_store_enabled and settings.cold_store_shared:
+            self.cold_store = ColdStore(settings.cold_store_path)
+        elif settings.cold_store_enabled:
+            logger.warning(
+                "Cold store disabled: COLD_STORE_ENABLED is set but COLD_STORE_SHARED is not. "
+                "Put COLD_STORE_PATH on storage every API and worker process can read and set COLD_STORE_SHARED=true."
             )
-        else:
-            # Local redis without SSL
-            self.redis = redis.from_url(settings.redis_url, decode_responses=True)
 
         self.settings = settings
 
-    def health_check(self) -> bool:
+    async def close(self) -> None:
+        """Close the client and disconnect every pooled connection"""
+        await self.redis.aclose(close_connection_pool=True)
+        await self.binary.aclose(close_connection_pool=True)
+        if self.cold_store:
+            self.cold_store.close()
+
+    async def warm_up(self) -> None:
+        """Open a connection in each pool and load the scripts used on every turn"""
+        await asyncio.gather(self.redis.ping(), self.binary.ping())
+        await asyncio.gather(*[
+            self.binary.script_load(script.script)
+            for script in (self._start_turn_script, self._messages_since_script)
+        ])
+
+    async def health_check(self) -> bool:
         """Check if redis is accessible"""
         try:
-            self.redis.ping()
+            await self.redis.ping()
             return True
         except Exception as e:
             # Log the error but don't fail deployment
-            print(f"Redis health check failed: {e}")
+            logger.warning(f"Redis health check failed: {e}")
             return False
 
-    def test_connection(self) -> dict:
+    async def test_connection(self) -> dict:
         """Test redis connection and basic operations"""
         try:
             # Test ping
-            self.redis.ping()
+            await self.redis.ping()
 
             # Test set/get
-            self.redis.set("test_key", "test_value", ex=60)  # expire in 60 seconds
-            value = self.redis.get("test_key")
+            await self.redis.set("test_key", "test_value", ex=60)  # expire in 60 seconds
+            value = await self.redis.get("test_key")
 
             return {
                 "status": "success",
@@ -56,7 +277,7 @@ class RedisClient:
         """Generate a unique conversation ID"""
         return str(uuid.uuid4())
 
-    def store_conversation_metadata(self, conversation_id: str, topic: str, bot_position: str, first_message: str) -> None:
+    async def store_conversation_metadata(self, conversation_id: str, topic: str, bot_position: str, first_message: str) -> None:
         """Store conversation metadata (topic, position, etc.)"""
         key = f"conv_meta:{conversation_id}"
         metadata = {
@@ -65,64 +286,276 @@ class RedisClient:
             "first_message": first_message
         }
         # Store metadata, expire after 24 hours
-        self.redis.setex(key, 86400, json.dumps(metadata))
+        await self.binary.setex(key, CONVERSATION_TTL, encode_metadata(metadata))
 
-    def get_conversation_metadata(self, conversation_id: str) -> Optional[dict]:
+    async def get_conversation_metadata(self, conversation_id: str) -> Optional[dict]:
         """Get conversation metadata"""
         key = f"conv_meta:{conversation_id}"
-        data = self.redis.get(key)
+        data = await self.binary.get(key)
+        if not data and await self.rehydrate_conversation(conversation_id):
+            data = await self.binary.get(key)
         if data:
-            return json.loads(data)
+            return decode_metadata(data)
         return None
 
-    def add_message(self, conversation_id: str, role: Role, message: str) -> bool:
-        """Add a message to conversation using redis list operations"""
+    async def add_message(self, conversation_id: str, role: Role, message: str, window: int = RESPONSE_WINDOW) -> List[Message]:
+        """
+        Append a message and return the newest `window` messages.
+
+        Push, FIFO trim, TTL refresh and the tail read run as one MULTI/EXEC
+        transaction, so the whole append costs a single round trip. Any
+        cached evaluation of the conversation is invalidated.
+        """
+        meta_key = f"conv_meta:{conversation_id}"
         list_key = f"conv_messages:{conversation_id}"
+        count_key = f"conv_count:{conversation_id}"
 
-        # Create message object
-        message_obj = {
-            "role": role.value,
-            "message": message
-        }
+        pipe = self.binary.pipeline(transaction=True)
+        pipe.delete(evaluation_cache_key(conversation_id))
+        pipe.rpush(list_key, self._encode_message(role, message))
+        # Maintain FIFO: keep only the last 50 messages
+        pipe.ltrim(list_key, -MAX_MESSAGES, -1)
+        # Count every message ever appended, trimmed ones included
+        pipe.incr(count_key)
+        pipe.expire(count_key, CONVERSATION_TTL)
+        pipe.expire(list_key, CONVERSATION_TTL)
+        pipe.expire(meta_key, CONVERSATION_TTL)
+        if self.cold_store:
+            pipe.zadd(ACTIVITY_KEY, {conversation_id: time.time()})
+        pipe.lrange(list_key, -window, -1)
+        results = await pipe.execute()
 
-        # Add to end of list
-        self.redis.rpush(list_key, json.dumps(message_obj))
+        return self._decode_messages(results[-1])
 
-        # Set expiry on the list
-        self.redis.expire(list_key, 86400)
+    async def get_conversation_messages(self, conversation_id: str) -> List[Message]:
+        """Get all messages for a conversation"""
+        return await self.get_messages_range(conversation_id, 0, -1)
 
-        # Maintain FIFO: keep only the last 50 messages
-        list_length = self.redis.llen(list_key)
-        if list_length > 50:
-            # Remove oldest messages, keep only the last 50
-            self.redis.ltrim(list_key, -50, -1)
+    async def get_recent_messages(self, conversation_id: str, n: int) -> List[Message]:
+        """Get the newest `n` messages for a conversation, oldest first"""
+        if n <= 0:
+            return []
+        return await self.get_messages_range(conversation_id, -n, -1)
 
-        return True
+    async def get_messages_range(self, conversation_id: str, start: int, stop: int) -> List[Message]:
+        """
+        Get messages between `start` and `stop` (inclusive, LRANGE semantics).
 
-    def get_conversation_messages(self, conversation_id: str) -> List[Message]:
-        """Get all messages for a conversation"""
+        Only the requested slice is transferred and decoded.
+        """
+        list_key = f"conv_messages:{conversation_id}"
+        messages_data = await self.binary.lrange(list_key, start, stop)
+        return self._decode_messages(messages_data)
+
+    async def start_turn(
+        self,
+        conversation_id: str,
+        message: str,
+        history_size: int = MAX_MESSAGES,
+        lease_token: Optional[str] = None,
+        lease_ttl_ms: int = 45000
+    ) -> Optional[Conversation]:
+        """
+        Begin a user turn on an existing conversation in a single round trip.
+
+        Returns None if the conversation does not exist in redis or in the
+        cold store. Otherwise the user's message is appended and the returned Conversation carries only the
+        newest `history_size` messages (including the one just added), the
+        number of messages ever appended and the rolling summary, if any.
+
+        With a `lease_token` the turn lease (`turn_lease_key`) is taken in
+        the same round trip; ConversationBusyError is raised, and nothing is
+        appended, if another turn already holds it.
+        """
+        meta_key = f"conv_meta:{conversation_id}"
         list_key = f"conv_messages:{conversation_id}"
-        messages_data = self.redis.lrange(list_key, 0, -1)
+        keys = [
+            meta_key,
+            list_key,
+            evaluation_cache_key(conversation_id),
+            f"conv_count:{conversation_id}",
+            turn_lease_key(conversation_id),
+            summary_key(conversation_id),
+            ACTIVITY_KEY
+        ]
+        args = [
+            self._encode_message(Role.USER, message),
+            MAX_MESSAGES,
+            CONVERSATION_TTL,
+            history_size,
+            lease_token or "",
+            lease_ttl_ms,
+            time.time(),
+            conversation_id if self.cold_store else ""
+        ]
+
+        result = await self._start_turn_script(keys=keys, args=args, client=self.binary)
+        if result is None and await self.rehydrate_conversation(conversation_id):
+            result = await self._start_turn_script(keys=keys, args=args, client=self.binary)
+        if result == 0:
+            raise ConversationBusyError(conversation_id)
+        if not result:
+            return None
+
+        metadata_data, messages_data, count, summary_data = result
+        metadata = decode_metadata(metadata_data)
+
+        return Conversation(
+            conversation_id=conversation_id,
+            topic=metadata["topic"],
+            bot_position=metadata["bot_position"],
+            first_message=metadata["first_message"],
+            messages=self._decode_messages(messages_data),
+            message_count=count,
+            summary=ConversationSummary.model_validate_json(summary_data) if summary_data else None
+        )
+
+    async def get_conversation_summary(self, conversation_id: str) -> Optional[ConversationSummary]:
+        """Get the rolling summary of older turns, if one has been written"""
+        data = await self.binary.get(summary_key(conversation_id))
+        return ConversationSummary.model_validate_json(data) if data else None
+
+    async def set_conversation_summary(self, conversation_id: str, summary: ConversationSummary) -> None:
+        """Store the rolling summary, expiring with the conversation"""
+        await self.binary.set(summary_key(conversation_id), summary.model_dump_json(), ex=CONVERSATION_TTL)
 
-        messages = []
-        for msg_data in messages_data:
-            msg_dict = json.loads(msg_data)
-            messages.append(Message(
-                role=Role(msg_dict["role"]),
-                message=msg_dict["message"]
-            ))
+    async def get_messages_since(self, conversation_id: str, seen: int) -> Optional[Tuple[Conversation, int]]:
+        """
+        Get the messages appended after the first `seen` ones.
+
+        Returns None if the conversation does not exist, otherwise the
+        conversation (carrying only the new messages) and the total number
+        of messages ever appended to it. If older messages have been trimmed
+        only the ones still stored are returned.
+        """
+        result = await self._messages_since_script(
+            keys=self._messages_since_keys(conversation_id),
+            args=[seen],
+            client=self.binary
+        )
+        if not result and await self.rehydrate_conversation(conversation_id):
+            result = await self._messages_since_script(
+                keys=self._messages_since_keys(conversation_id),
+                args=[seen],
+                client=self.binary
+            )
+        return self._parse_messages_since(conversation_id, result)
+
+    async def get_many_messages_since(self, requests: List[Tuple[str, int]]) -> List[Optional[Tuple[Conversation, int]]]:
+        """
+        Pipelined get_messages_since for many conversations.
+
+        Takes (conversation_id, seen) pairs and returns results in the same
+        order, fetching all of them in a single round trip.
+        """
+        if not requests:
+            return []
+
+        pipe = self.binary.pipeline(transaction=False)
+        for conversation_id, seen in requests:
+            await self._messages_since_script(
+                keys=self._messages_since_keys(conversation_id),
+                args=[seen],
+                client=pipe
+            )
+        results = await pipe.execute()
 
-        return messages
+        parsed = []
+        for (conversation_id, seen), result in zip(requests, results):
+            if not result and self.cold_store:
+                # Archived conversations are restored and read one by one
+                parsed.append(await self.get_messages_since(conversation_id, seen))
+            else:
+                parsed.append(self._parse_messages_since(conversation_id, result))
+        return parsed
+
+    async def find_conversations_by_topic(self, topic: str, scan_count: int = 500) -> List[str]:
+        """
+        Find conversation ids whose topic contains `topic`.
+
+        Comparison uses normalized text. Metadata keys are scanned
+        incrementally and read with one MGET per scanned batch; archived
+        conversations are matched in the cold store.
+        """
+        wanted = normalize_text(topic)
+        conversation_ids = []
+
+        cursor = 0
+        while True:
+            cursor, keys = await self.binary.scan(cursor, match="conv_meta:*", count=scan_count)
+            if keys:
+                for key, data in zip(keys, await self.binary.mget(keys)):
+                    if data and wanted in normalize_text(decode_metadata(data)["topic"]):
+                        conversation_ids.append(key.decode("utf-8")[len("conv_meta:"):])
+            if cursor == 0:
+                break
+
+        if self.cold_store:
+            hot = set(conversation_ids)
+            conversation_ids += [cid for cid in await self.cold_store.find_by_topic(topic) if cid not in hot]
+        return conversation_ids
+
+    def _messages_since_keys(self, conversation_id: str) -> List[str]:
+        return [
+            f"conv_meta:{conversation_id}",
+            f"conv_messages:{conversation_id}",
+            f"conv_count:{conversation_id}"
+        ]
+
+    def _parse_messages_since(self, conversation_id: str, result) -> Optional[Tuple[Conversation, int]]:
+        """Build the (conversation, total) pair returned by MESSAGES_SINCE_SCRIPT"""
+        if not result:
+            return None
+
+        metadata_data, total, messages_data = result
+        metadata = decode_metadata(metadata_data)
+
+        conversation = Conversation(
+            conversation_id=conversation_id,
+            topic=metadata["topic"],
+            bot_position=metadata["bot_position"],
+            first_message=metadata["first_message"],
+            messages=self._decode_messages(messages_data)
+        )
+        return conversation, int(total)
 
-    def create_conversation(self, topic: str, bot_position: str, first_message: str) -> Conversation:
-        """Create a new conversation"""
-        conversation_id = self.generate_conversation_id()
+    def _encode_message(self, role: Role, message: str) -> bytes:
+        """Serialize a message for storage in the redis list"""
+        return encode_message(role, message)
 
-        # Store metadata
-        self.store_conversation_metadata(conversation_id, topic, bot_position, first_message)
+    def _decode_messages(self, messages_data: List[bytes]) -> List[Message]:
+        """Build Message objects from raw redis list entries, compact or legacy JSON"""
+        decoded = [decode_message(msg_data) for msg_data in messages_data]
+        return MESSAGE_LIST.validate_python([{"role": role, "message": message} for role, message in decoded])
 
-        # Add first message
-        self.add_message(conversation_id, Role.USER, first_message)
+    async def create_conversation(self, topic: str, bot_position: str, first_message: str, conversation_id: Optional[str] = None) -> Conversation:
+        """
+        Create a new conversation.
+
+        Metadata and the first message are written in one MULTI/EXEC round
+        trip, and the returned object is built locally instead of being read
+        back. A pre-generated `conversation_id` may be supplied.
+        """
+        conversation_id = conversation_id or self.generate_conversation_id()
+        meta_key = f"conv_meta:{conversation_id}"
+        list_key = f"conv_messages:{conversation_id}"
+        count_key = f"conv_count:{conversation_id}"
+
+        metadata = {
+            "topic": topic,
+            "bot_position": bot_position,
+            "first_message": first_message
+        }
+
+        pipe = self.binary.pipeline(transaction=True)
+        pipe.set(meta_key, encode_metadata(metadata), ex=CONVERSATION_TTL)
+        pipe.rpush(list_key, self._encode_message(Role.USER, first_message))
+        pipe.expire(list_key, CONVERSATION_TTL)
+        pipe.incr(count_key)
+        pipe.expire(count_key, CONVERSATION_TTL)
+        if self.cold_store:
+            pipe.zadd(ACTIVITY_KEY, {conversation_id: time.time()})
+        await pipe.execute()
 
         # Return conversation object
         return Conversation(
@@ -130,16 +563,16 @@ class RedisClient:
             topic=topic,
             bot_position=bot_position,
             first_message=first_message,
-            messages=self.get_conversation_messages(conversation_id)
+            messages=[Message(role=Role.USER, message=first_message)]
         )
 
-    def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
+    async def get_conversation(self, conversation_id: str) -> Optional[Conversation]:
         """Get full conversation with metadata and messages"""
-        metadata = self.get_conversation_metadata(conversation_id)
+        metadata = await self.get_conversation_metadata(conversation_id)
         if not metadata:
             return None
 
-        messages = self.get_conversation_messages(conversation_id)
+        messages = await self.get_conversation_messages(conversation_id)
 
         return Conversation(
             conversation_id=conversation_id,
@@ -149,8 +582,106 @@ class RedisClient:
             messages=messages
         )
 
-    def delete_conversation(self, conversation_id: str) -> None:
-        """Delete a conversation from redis"""
-        meta_key = f"conv_meta:{conversation_id}"
-        messages_key = f"conv_messages:{conversation_id}"
-        self.redis.delete(meta_key, messages_key)
\ No newline at end of file
+    async def delete_conversation(self, conversation_id: str) -> None:
+        """Delete a conversation from redis and the cold store"""
+        pipe = self.redis.pipeline(transaction=True)
+        pipe.delete(*self._conversation_keys(conversation_id))
+        pipe.zrem(ACTIVITY_KEY, conversation_id)
+        await pipe.execute()
+        if self.cold_store:
+            await self.cold_store.delete(conversation_id)
+
+    async def idle_conversations(self, idle_before: float, limit: int = 500) -> List[str]:
+        """Ids of conversations last written before the `idle_before` timestamp, oldest first"""
+        return await self.redis.zrangebyscore(ACTIVITY_KEY, "-inf", idle_before, start=0, num=limit)
+
+    async def archive_conversation(self, conversation_id: str, idle_before: float) -> bool:
+        """
+        Move an idle conversation from redis to the cold store.
+
+        The raw redis values are copied to the cold store first, then the
+        keys are deleted in one script that gives up if the conversation
+        was written after `idle_before` or has a turn in progress, so a
+        conversation that comes back to life stays in redis (its next
+        archive replaces the copy). Derived keys (the evaluation cache) are
+        dropped. Returns True if the conversation left redis.
+        """
+        if not self.cold_store:
+            return False
+
+        pipe = self.binary.pipeline(transaction=True)
+        pipe.get(f"conv_meta:{conversation_id}")
+        pipe.lrange(f"conv_messages:{conversation_id}", 0, -1)
+        pipe.get(f"conv_count:{conversation_id}")
+        pipe.get(summary_key(conversation_id))
+        pipe.get(evaluation_state_key(conversation_id))
+        metadata_data, messages_data, count, summary_data, state_data = await pipe.execute()
+
+        if metadata_data:
+            await self.cold_store.put(conversation_id, decode_metadata(metadata_data)["topic"], {
+                "metadata": metadata_data,
+                "messages": messages_data,
+                "count": int(count or len(messages_data)),
+                "summary": summary_data,
+                "evaluation_state": state_data
+            })
+
+        # Conversations that already expired only leave the activity set
+        archived = await self._archive_script(
+            keys=[ACTIVITY_KEY, turn_lease_key(conversation_id)] + self._conversation_keys(conversation_id),
+            args=[conversation_id, idle_before],
+            client=self.binary
+        )
+        if archived and metadata_data:
+            COLD_TIER.inc(operation="archived")
+            return True
+        return False
+
+    async def rehydrate_conversation(self, conversation_id: str) -> bool:
+        """
+        Restore an archived conversation into redis.
+
+        Returns True if the conversation is in redis afterwards because it
+        was restored, by this call or a concurrent one; False if there is no
+        cold store or it does not hold the conversation. The cold copy is
+        kept until the conversation is archived again or deleted.
+        """
+        if not self.cold_store:
+            return False
+        snapshot = await self.cold_store.get(conversation_id)
+        if not snapshot:
+            return False
+
+        restored = await self._restore_script(
+            keys=[
+                f"conv_meta:{conversation_id}",
+                f"conv_messages:{conversation_id}",
+                f"conv_count:{conversation_id}",
+                summary_key(conversation_id),
+                evaluation_state_key(conversation_id),
+                ACTIVITY_KEY
+            ],
+            args=[
+                conversation_id,
+                CONVERSATION_TTL,
+                time.time(),
+                snapshot["metadata"],
+                snapshot["count"],
+                snapshot["summary"] or "",
+                snapshot["evaluation_state"] or ""
+            ] + snapshot["messages"],
+            client=self.binary
+        )
+        if restored:
+            COLD_TIER.inc(operation="rehydrated")
+        return True
+
+    def _conversation_keys(self, conversation_id: str) -> List[str]:
+        return [
+            f"conv_meta:{conversation_id}",
+            f"conv_messages:{conversation_id}",
+            f"conv_count:{conversation_id}",
+            summary_key(conversation_id),
+            evaluation_cache_key(conversation_id),
+            evaluation_state_key(conversation_id)
+        ]
\ No newline at end of file
@@ -0,0 +1,51 @@
+import json
+from typing import Any, Union
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+# orjson is several times faster than the standard library for the JSON
+# payloads kept in redis and returned by the API; without it the same
+# output is produced by json, only slower
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Serialize values neither encoder handles natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize to compact JSON text, e.g. for SSE frames"""
+    return dumps(obj).decode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse JSON from bytes or text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson when available.
+
+    Returning one directly from an endpoint also skips FastAPI's
+    response_model validation, for payloads the endpoint just built from
+    already validated models.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -6,5 +6,31 @@ class Settings(BaseSettings):
     app_name: str = "debater"
     mode: str = getenv("MODE", "development")
     redis_url: str = getenv("REDIS_URL", "redis://localhost:6379")
+    redis_max_connections: int = int(getenv("REDIS_MAX_CONNECTIONS", "100"))
+    redis_socket_timeout: float = float(getenv("REDIS_SOCKET_TIMEOUT", "5"))
     openai_api_key: str = getenv("OPENAI_API_KEY", "")
     ai_model: str = getenv("AI_MODEL", "gpt-4-turbo")
+    openai_base_url: str = getenv("OPENAI_BASE_URL", "")
+    llm_max_concurrency: int = int(getenv("LLM_MAX_CONCURRENCY", "16"))
+    llm_max_connections: int = int(getenv("LLM_MAX_CONNECTIONS", "32"))
+    llm_timeout: float = float(getenv("LLM_TIMEOUT", "30"))
+    llm_max_retries: int = int(getenv("LLM_MAX_RETRIES", "3"))
+    topic_cache_size: int = int(getenv("TOPIC_CACHE_SIZE", "1024"))
+    topic_cache_ttl: int = int(getenv("TOPIC_CACHE_TTL", "86400"))
+    warm_up_timeout: float = float(getenv("WARM_UP_TIMEOUT", "5"))
+    turn_lease_ttl: float = float(getenv("TURN_LEASE_TTL", "45"))
+    evaluation_concurrency: int = int(getenv("EVALUATION_CONCURRENCY", "8"))
+    evaluation_job_ttl: int = int(getenv("EVALUATION_JOB_TTL", "3600"))
+    evaluation_worker_processes: int = int(getenv("EVALUATION_WORKER_PROCESSES", "1"))
+    evaluation_worker_concurrency: int = int(getenv("EVALUATION_WORKER_CONCURRENCY", "4"))
+    opening_pool_enabled: bool = getenv("OPENING_POOL_ENABLED", "true").lower() == "true"
+    opening_pool_size: int = int(getenv("OPENING_POOL_SIZE", "5"))
+    opening_pool_max_age: int = int(getenv("OPENING_POOL_MAX_AGE", "21600"))
+    opening_pool_warm_subjects: int = int(getenv("OPENING_POOL_WARM_SUBJECTS", "20"))
+    opening_pool_warm_interval: int = int(getenv("OPENING_POOL_WARM_INTERVAL", "300"))
+    cold_store_enabled: bool = getenv("COLD_STORE_ENABLED", "false").lower() == "true"
+    cold_store_path: str = getenv("COLD_STORE_PATH", "data/conversations.db")
+    cold_store_shared: bool = getenv("COLD_STORE_SHARED", "false").lower() == "true"
+    cold_store_idle_minutes: float = float(getenv("COLD_STORE_IDLE_MINUTES", "30"))
+    cold_store_sweep_interval: int = int(getenv("COLD_STORE_SWEEP_INTERVAL", "60"))
+    cold_store_sweep_batch: int = int(getenv("COLD_STORE_SWEEP_BATCH", "500"))
\ No newline at end of file
@@ -0,0 +1,115 @@
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional
+from debater.utils.locks import RedisLock
+from debater.utils.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Coalesce identical in-flight work into a single call.
+
+    Within a worker, concurrent callers with the same key await one shared
+    future. Across workers a short-lived redis lock elects a leader; other
+    workers wait for the lock to be released and then call `recheck` (e.g. a
+    cache lookup) before falling back to doing the work themselves.
+    """
+
+    def __init__(
+        self,
+        redis_client: Optional[RedisClient] = None,
+        lock_ttl: float = 35.0,
+        wait_timeout: float = 35.0,
+        poll_interval: float = 0.1
+    ):
+        self.redis_client = redis_client
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.local_followers = 0
+        self.remote_waits = 0
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        recheck: Optional[Callable[[], Awaitable[Any]]] = None
+    ) -> Any:
+        """Run `fn` once for all concurrent callers sharing `key`"""
+        future = self._in_flight.get(key)
+        if future:
+            self.local_followers += 1
+            return await asyncio.shield(future)
+
+        future = asyncio.get_event_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await self._run(key, fn, recheck)
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    async def _run(self, key: str, fn: Callable[[], Awaitable[Any]], recheck: Optional[Callable[[], Awaitable[Any]]]) -> Any:
+        if not self.redis_client:
+            self.leaders += 1
+            return await fn()
+
+        lock = RedisLock(
+            self.redis_client,
+            f"singleflight:{hashlib.sha1(key.encode('utf-8')).hexdigest()}",
+            ttl_ms=int(self.lock_ttl * 1000)
+        )
+        try:
+            acquired = await lock.acquire()
+        except Exception as e:
+            logger.warning(f"Single-flight lock unavailable: {e}")
+            acquired = True
+            lock = None
+
+        if acquired:
+            self.leaders += 1
+            try:
+                return await fn()
+            finally:
+                if lock:
+                    await self._release(lock)
+
+        # Another worker is doing the same work; wait for it to finish
+        self.remote_waits += 1
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline and await lock.locked():
+            await asyncio.sleep(self.poll_interval)
+
+        if recheck:
+            result = await recheck()
+            if result is not None:
+                return result
+        return await fn()
+
+    async def _release(self, lock: RedisLock) -> None:
+        try:
+            await lock.release()
+        except Exception as e:
+            logger.warning(f"Single-flight lock release failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Coalescing counters for this worker"""
+        return {
+            "leaders": self.leaders,
+            "local_followers": self.local_followers,
+            "remote_waits": self.remote_waits,
+            "in_flight": len(self._in_flight)
+        }
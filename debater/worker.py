@@ -0,0 +1,102 @@
+"""
+Evaluation worker: runs persuasiveness evaluations queued through the API.
+
+Usage: python -m debater.worker [--processes 1] [--concurrency 4]
+
+Each process has its own redis pool and LLM gateway and runs up to
+`--concurrency` evaluations at a time, so grading load never competes with
+interactive /chat traffic in the API workers. Defaults come from
+EVALUATION_WORKER_PROCESSES and EVALUATION_WORKER_CONCURRENCY. SIGINT and
+SIGTERM stop claiming new jobs and let running ones finish.
+"""
+import signal
+import asyncio
+import logging
+import argparse
+import multiprocessing
+from debater.utils.settings import Settings
+from debater.utils.redis_client import RedisClient
+from debater.utils.single_flight import SingleFlight
+from debater.services.llm_gateway import LLMGateway
+from debater.services.persuasiveness_evaluator import PersuasivenessEvaluator
+from debater.services.evaluation_cache import EvaluationCache
+from debater.services.evaluation_service import EvaluationService
+from debater.services.evaluation_jobs import EvaluationJobQueue, EvaluationWorker
+
+logger = logging.getLogger("debater.worker")
+
+
+async def serve(concurrency: int) -> None:
+    """Run one worker process until it is signalled to stop"""
+    settings = Settings()
+    if not settings.openai_api_key:
+        raise SystemExit("OpenAI API key not configured. Set OPENAI_API_KEY environment variable.")
+
+    redis_client = RedisClient(settings)
+    gateway = LLMGateway(
+        settings.openai_api_key,
+        max_concurrency=concurrency,
+        timeout=settings.llm_timeout,
+        max_retries=settings.llm_max_retries,
+        max_connections=concurrency,
+        base_url=settings.openai_base_url or None
+    )
+    evaluator = PersuasivenessEvaluator(model=settings.ai_model, gateway=gateway)
+    # Shares the API's locks, so concurrent evaluations of one conversation
+    # make a single completion across jobs, processes and the API
+    single_flight = SingleFlight(redis_client, lock_ttl=settings.llm_timeout + 5, wait_timeout=settings.llm_timeout + 5)
+    evaluation_service = EvaluationService(redis_client, evaluator, EvaluationCache(redis_client), single_flight)
+    worker = EvaluationWorker(EvaluationJobQueue(redis_client, settings.evaluation_job_ttl), evaluation_service, concurrency)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info(f"Evaluation worker started with concurrency {concurrency}")
+    try:
+        await worker.run(stop)
+    finally:
+        logger.info(f"Evaluation worker stopping: {worker.processed} jobs processed, {worker.failed} failed")
+        await gateway.close()
+        await redis_client.close()
+
+
+def run_process(concurrency: int) -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(levelname)s %(message)s")
+    asyncio.run(serve(concurrency))
+
+
+def main() -> None:
+    settings = Settings()
+    parser = argparse.ArgumentParser(description="Run queued persuasiveness evaluations")
+    parser.add_argument("--processes", type=int, default=settings.evaluation_worker_processes)
+    parser.add_argument("--concurrency", type=int, default=settings.evaluation_worker_concurrency,
+                        help="evaluations in flight per process")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        run_process(args.concurrency)
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_process, args=(args.concurrency,), name=f"worker-{i}")
+        for i in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward_sigterm(signum, frame):
+        for process in processes:
+            process.terminate()
+
+    # Children receive the terminal's SIGINT themselves; SIGTERM (e.g. from
+    # docker stop) is forwarded, and each child drains its running jobs
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, forward_sigterm)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 import pytest
 import os
+import fakeredis
 from fastapi.testclient import TestClient
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from debater.app import app
 from debater.utils.settings import Settings
+from debater.utils.redis_client import RedisClient
+from debater.utils.cold_store import ColdStore
+from debater.services.evaluation_cache import EvaluationCache
+from debater.services.evaluation_service import EvaluationService
+from debater.services.evaluation_jobs import EvaluationJobQueue
+from debater.services.conversation_summarizer import ConversationSummarizer
 
 
 @pytest.fixture
@@ -43,6 +50,112 @@ def mock_redis():
     return mock_redis
 
 
+class CountingRedis(fakeredis.FakeAsyncRedis):
+    """
+    Fake async redis that counts network round trips.
+
+    Clients created with the same `counter` list share one count, so the
+    decoding and binary clients of a RedisClient are counted together.
+    """
+
+    def __init__(self, *args, counter=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.counter = counter if counter is not None else [0]
+
+    @property
+    def round_trips(self):
+        return self.counter[0]
+
+    @round_trips.setter
+    def round_trips(self, value):
+        self.counter[0] = value
+
+    async def execute_command(self, *args, **options):
+        self.round_trips += 1
+        return await super().execute_command(*args, **options)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        pipe = super().pipeline(transaction=transaction, shard_hint=shard_hint)
+        execute = pipe.execute
+
+        async def counted_execute(*args, **kwargs):
+            # A pipeline is sent to the server in a single round trip
+            self.round_trips += 1
+            return await execute(*args, **kwargs)
+
+        pipe.execute = counted_execute
+        return pipe
+
+
+@pytest.fixture
+def redis_client(mock_settings):
+    """RedisClient backed by an in-memory fake redis server"""
+    client = RedisClient(mock_settings)
+    server = fakeredis.FakeServer()
+    counter = [0]
+    client.redis = CountingRedis(server=server, decode_responses=True, counter=counter)
+    client.binary = CountingRedis(server=server, decode_responses=False, counter=counter)
+    return client
+
+
+@pytest.fixture
+def cold_redis_client(redis_client, tmp_path):
+    """Fake-redis RedisClient with a cold store in a temporary directory"""
+    redis_client.cold_store = ColdStore(str(tmp_path / "conversations.db"))
+    yield redis_client
+    redis_client.cold_store.close()
+
+
+async def _stream(*tokens):
+    """Async generator yielding canned tokens"""
+    for token in tokens:
+        yield token
+
+
+@pytest.fixture
+def chat_services(redis_client):
+    """Patch the app with fake redis and mocked AI services"""
+    topic_detector = Mock()
+    topic_detector.detect_topic_and_position = AsyncMock(
+        return_value=("Remote work", "Office work is better", "Remote work is better")
+    )
+    debate_service = Mock()
+    debate_service.generate_opening_argument = AsyncMock(return_value="Offices build better teams.")
+    debate_service.generate_debate_response = AsyncMock(return_value="Collaboration needs proximity.")
+    debate_service.stream_opening_argument = Mock(side_effect=lambda *args, **kwargs: _stream("Offices ", "build ", "teams."))
+    debate_service.stream_debate_response = Mock(side_effect=lambda *args, **kwargs: _stream("Proximity ", "matters."))
+    debate_service.summarize = AsyncMock(return_value="The user argued commutes waste time.")
+    persuasiveness_evaluator = Mock()
+    persuasiveness_evaluator.model = "gpt-4-turbo"
+    persuasiveness_evaluator.evaluate_conversation = AsyncMock(return_value={
+        "scores": {"overall_persuasiveness": 7},
+        "analysis": {},
+        "summary": "Solid"
+    })
+    persuasiveness_evaluator.evaluate_incremental = AsyncMock(return_value={
+        "scores": {"overall_persuasiveness": 9},
+        "analysis": {},
+        "summary": "Improving"
+    })
+
+    evaluation_service = EvaluationService(redis_client, persuasiveness_evaluator, EvaluationCache(redis_client))
+    with patch("debater.app.redis_client", redis_client), \
+            patch("debater.app.evaluation_service", evaluation_service), \
+            patch("debater.app.evaluation_jobs", EvaluationJobQueue(redis_client)), \
+            patch("debater.app.topic_detector", topic_detector), \
+            patch("debater.app.debate_service", debate_service), \
+            patch("debater.app.persuasiveness_evaluator", persuasiveness_evaluator), \
+            patch("debater.app.opening_pool", None), \
+            patch("debater.app.conversation_summarizer", ConversationSummarizer(redis_client, debate_service)):
+        yield {
+            "redis_client": redis_client,
+            "topic_detector": topic_detector,
+            "debate_service": debate_service,
+            "persuasiveness_evaluator": persuasiveness_evaluator,
+            "evaluation_service": evaluation_service
+        }
+
+
 @pytest.fixture
 def mock_openai_response():
     """Mock OpenAI API response"""
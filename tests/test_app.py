@@ -1,5 +1,14 @@
+import json
+import asyncio
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, AsyncMock, Mock
+from fastapi.testclient import TestClient
+from debater.app import create_app
+from debater.utils.redis_client import turn_lease_key
+from debater.utils.single_flight import SingleFlight
+from debater.models.conversation import ConversationSummary
+from debater.services.debate_service import CONTEXT_MESSAGES
+from debater.services.evaluation_jobs import EvaluationJobQueue, EvaluationWorker
 
 
 class TestHealthEndpoints:
@@ -13,6 +22,29 @@ class TestHealthEndpoints:
         assert "text/html" in response.headers["content-type"]
         assert "Debater Bot" in response.text
 
+    def test_root_page_splits_sse_frames_on_newlines(self, client):
+        """Test that the test page's stream parser splits on newlines, not escaped ones"""
+        page = client.get("/").text
+
+        assert "buffer.split('\\n\\n')" in page
+        assert "frame.split('\\n')" in page
+        assert "\\\\n" not in page
+
+    def test_startup_warms_connections(self, redis_client):
+        """Test that the lifespan pings redis, loads the turn scripts and opens an LLM connection before serving"""
+        gateway = Mock(warm_up=AsyncMock(), close=AsyncMock(), stats=Mock(return_value={}))
+        with patch("debater.app.redis_client", redis_client), \
+                patch("debater.app.llm_gateway", gateway), \
+                patch("debater.app.opening_pool", None):
+            with TestClient(create_app()) as client:
+                warm_up = client.get("/stats").json()["warm_up"]
+
+        assert isinstance(warm_up["redis"], float)
+        assert isinstance(warm_up["llm"], float)
+        gateway.warm_up.assert_awaited_once()
+        loaded = asyncio.run(redis_client.binary.script_exists(redis_client._start_turn_script.sha))
+        assert loaded == [True]
+
     def test_health_endpoint(self, client):
         """Test health check endpoint"""
         response = client.get("/health")
@@ -47,6 +79,305 @@ class TestChatEndpoint:
         assert response.status_code == 422
 
 
+class TestChatFlow:
+    """Test /chat against fake redis and mocked AI services"""
+
+    def test_new_conversation(self, client, chat_services):
+        """Test that a new conversation returns the opener and the opening argument"""
+        response = client.post("/chat", json={"message": "Remote work is better"})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data) == {"conversation_id", "message"}
+        assert [msg["role"] for msg in data["message"]] == ["user", "bot"]
+        assert data["message"][1]["message"] == "Offices build better teams."
+
+    def test_new_conversation_round_trips(self, client, chat_services):
+        """Test that opening a debate costs two redis round trips"""
+        chat_services["redis_client"].redis.round_trips = 0
+
+        client.post("/chat", json={"message": "Remote work is better"})
+
+        assert chat_services["redis_client"].redis.round_trips == 2
+
+    def test_continue_conversation(self, client, chat_services):
+        """Test that a follow-up turn costs three redis round trips, including the lease release"""
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+        client.post("/chat", json={"conversation_id": conversation_id, "message": "Warm up"})
+        chat_services["redis_client"].redis.round_trips = 0
+
+        response = client.post("/chat", json={"conversation_id": conversation_id, "message": "No commute!"})
+
+        assert response.status_code == 200
+        assert chat_services["redis_client"].redis.round_trips == 3
+        assert response.json()["message"][-2]["message"] == "No commute!"
+
+    def test_concurrent_turn_is_rejected(self, client, chat_services):
+        """Test that a turn arriving while another holds the lease gets a 409"""
+        redis_client = chat_services["redis_client"]
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+        asyncio.run(redis_client.redis.set(turn_lease_key(conversation_id), "other-turn"))
+
+        response = client.post("/chat", json={"conversation_id": conversation_id, "message": "No commute!"})
+
+        assert response.status_code == 409
+        assert response.headers["Retry-After"] == "1"
+        assert len(asyncio.run(redis_client.get_conversation_messages(conversation_id))) == 2
+
+        asyncio.run(redis_client.redis.delete(turn_lease_key(conversation_id)))
+        response = client.post("/chat", json={"conversation_id": conversation_id, "message": "No commute!"})
+        assert response.status_code == 200
+        assert not asyncio.run(redis_client.redis.exists(turn_lease_key(conversation_id)))
+
+    def test_prompt_history_is_windowed(self, client, chat_services):
+        """Test that only the prompt's context window is loaded, minus turns already summarized"""
+        redis_client = chat_services["redis_client"]
+        generate = chat_services["debate_service"].generate_debate_response
+        with patch("debater.app.conversation_summarizer", None):
+            conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+            for i in range(12):
+                client.post("/chat", json={"conversation_id": conversation_id, "message": f"Point {i}"})
+
+            history = generate.call_args[0][2]
+            assert len(history) == CONTEXT_MESSAGES
+            assert history[-1] == {"role": "user", "content": "Point 11"}
+            assert generate.call_args.kwargs["summary"] is None
+
+            asyncio.run(redis_client.set_conversation_summary(
+                conversation_id, ConversationSummary(text="Commutes were discussed.", covered=20)
+            ))
+            client.post("/chat", json={"conversation_id": conversation_id, "message": "Point 12"})
+
+        history = generate.call_args[0][2]
+        assert len(history) == 7
+        assert history[-1] == {"role": "user", "content": "Point 12"}
+        assert generate.call_args.kwargs["summary"] == "Commutes were discussed."
+
+    def test_unknown_conversation(self, client, chat_services):
+        """Test that an unknown conversation id returns 404"""
+        response = client.post("/chat", json={"conversation_id": "missing", "message": "Hi"})
+
+        assert response.status_code == 404
+
+
+class TestChatStream:
+    """Test the server-sent events variant of /chat"""
+
+    def _events(self, response):
+        events = []
+        for frame in response.text.strip().split("\n\n"):
+            event, data = frame.split("\n")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+        return events
+
+    def test_stream_new_conversation(self, client, chat_services):
+        """Test that tokens are streamed and the full reply is persisted"""
+        response = client.post("/chat/stream", json={"message": "Remote work is better"})
+
+        assert response.status_code == 200
+        assert "text/event-stream" in response.headers["content-type"]
+        events = self._events(response)
+        assert events[0][0] == "start"
+        assert [data["token"] for event, data in events if event == "token"] == ["Offices ", "build ", "teams."]
+        assert events[-1][0] == "done"
+        assert events[-1][1]["message"][-1] == {"role": "bot", "message": "Offices build teams."}
+
+    def test_stream_continue_conversation(self, client, chat_services):
+        """Test that a streamed reply is appended to an existing conversation"""
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+
+        response = client.post("/chat/stream", json={"conversation_id": conversation_id, "message": "No commute!"})
+
+        messages = self._events(response)[-1][1]["message"]
+        assert [msg["message"] for msg in messages[-2:]] == ["No commute!", "Proximity matters."]
+
+    def test_stream_setup_failure_releases_lease(self, client, chat_services):
+        """Test that a failure before streaming starts does not leave the turn locked"""
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+        chat_services["debate_service"].stream_debate_response = Mock(side_effect=RuntimeError("boom"))
+
+        response = client.post("/chat/stream", json={"conversation_id": conversation_id, "message": "No commute!"})
+
+        assert response.status_code == 500
+        assert not asyncio.run(chat_services["redis_client"].redis.exists(turn_lease_key(conversation_id)))
+
+    def test_stream_unknown_conversation(self, client, chat_services):
+        """Test that an unknown conversation fails before streaming starts"""
+        response = client.post("/chat/stream", json={"conversation_id": "missing", "message": "Hi"})
+
+        assert response.status_code == 404
+
+
+class TestEvaluatePersuasiveness:
+    """Test the persuasiveness evaluation endpoint"""
+
+    def test_evaluation_is_cached_until_conversation_changes(self, client, chat_services):
+        """Test that repeated full evaluations reuse the cached result"""
+        evaluator = chat_services["persuasiveness_evaluator"]
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+
+        first = client.get(f"/evaluate-persuasiveness/{conversation_id}?full=true").json()
+        second = client.get(f"/evaluate-persuasiveness/{conversation_id}?full=true").json()
+
+        assert first["cache"] == "miss"
+        assert second["cache"] == "hit"
+        assert second["computed_at"] == first["computed_at"]
+        assert evaluator.evaluate_conversation.await_count == 1
+
+        client.post("/chat", json={"conversation_id": conversation_id, "message": "No commute!"})
+        third = client.get(f"/evaluate-persuasiveness/{conversation_id}?full=true").json()
+
+        assert third["cache"] == "miss"
+        assert third["message_count"] == 4
+        assert evaluator.evaluate_conversation.await_count == 2
+
+    def test_incremental_evaluation_sends_only_new_turns(self, client, chat_services):
+        """Test that follow-up evaluations only send the turns added since the last one"""
+        evaluator = chat_services["persuasiveness_evaluator"]
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+
+        first = client.get(f"/evaluate-persuasiveness/{conversation_id}").json()
+        client.post("/chat", json={"conversation_id": conversation_id, "message": "No commute!"})
+        second = client.get(f"/evaluate-persuasiveness/{conversation_id}").json()
+        third = client.get(f"/evaluate-persuasiveness/{conversation_id}").json()
+
+        assert first["mode"] == "full"
+        assert second["mode"] == "incremental"
+        new_messages = evaluator.evaluate_incremental.call_args.kwargs["new_messages"]
+        assert [msg["message"] for msg in new_messages] == ["No commute!", "Collaboration needs proximity."]
+        assert evaluator.evaluate_incremental.call_args.kwargs["previous_bot_turns"] == 1
+        assert second["evaluation"]["summary"] == "Improving"
+        assert third["cache"] == "hit"
+        assert evaluator.evaluate_incremental.await_count == 1
+
+    def test_unknown_conversation(self, client, chat_services):
+        """Test that evaluating an unknown conversation returns 404"""
+        response = client.get("/evaluate-persuasiveness/missing")
+
+        assert response.status_code == 404
+
+
+class TestEvaluationJobs:
+    """Test queued evaluations run by the evaluation worker"""
+
+    def test_queued_evaluation_is_pollable(self, client, chat_services):
+        """Test that a queued job is picked up by a worker and its result polled"""
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+
+        response = client.post("/evaluate-persuasiveness/jobs", json={"conversation_id": conversation_id, "full": True})
+
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+        assert client.get(f"/evaluate-persuasiveness/jobs/{job_id}").json()["status"] == "queued"
+        chat_services["persuasiveness_evaluator"].evaluate_conversation.assert_not_awaited()
+
+        worker = EvaluationWorker(EvaluationJobQueue(chat_services["redis_client"]), chat_services["evaluation_service"])
+        job = asyncio.run(worker.queue.claim(timeout=1))
+        assert job["job_id"] == job_id
+        assert client.get(f"/evaluate-persuasiveness/jobs/{job_id}").json()["status"] == "running"
+        asyncio.run(worker.process(job))
+
+        job = client.get(f"/evaluate-persuasiveness/jobs/{job_id}").json()
+        assert job["status"] == "done"
+        assert job["result"]["evaluation"]["summary"] == "Solid"
+        assert job["result"]["mode"] == "full"
+
+    def test_unknown_conversation_and_job(self, client, chat_services):
+        """Test that unknown conversations are not queued and unknown jobs return 404"""
+        response = client.post("/evaluate-persuasiveness/jobs", json={"conversation_id": "missing"})
+
+        assert response.status_code == 404
+        assert client.get("/evaluate-persuasiveness/jobs/missing").status_code == 404
+
+
+class TestBatchEvaluation:
+    """Test the bulk persuasiveness evaluation endpoint"""
+
+    def _results(self, response):
+        return {line["conversation_id"]: line for line in map(json.loads, response.text.splitlines())}
+
+    def test_batch_reports_per_item_status(self, client, chat_services):
+        """Test that failures are reported per conversation without aborting the batch"""
+        evaluator = chat_services["persuasiveness_evaluator"]
+        good = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+        bad = client.post("/chat", json={"message": "Cats are better"}).json()["conversation_id"]
+
+        async def evaluate(conversation_messages, topic, bot_position):
+            if conversation_messages[0]["message"] == "Cats are better":
+                return {"error": "Evaluation failed: boom", "scores": None}
+            return {"scores": {"overall_persuasiveness": 7}, "analysis": {}, "summary": "Solid"}
+
+        evaluator.evaluate_conversation.side_effect = evaluate
+
+        response = client.post(
+            "/evaluate-persuasiveness/batch",
+            json={"conversation_ids": [good, bad, "missing"], "concurrency": 2}
+        )
+
+        assert response.status_code == 200
+        assert "application/x-ndjson" in response.headers["content-type"]
+        results = self._results(response)
+        assert results[good]["status"] == "ok"
+        assert results[good]["evaluation"]["summary"] == "Solid"
+        assert results[bad] == {"conversation_id": bad, "status": "error", "detail": "Evaluation failed: boom"}
+        assert results["missing"]["status"] == "not_found"
+
+    def test_batch_streams_while_loading_and_coalesces(self, client, chat_services):
+        """Test that results arrive before every batch is loaded and share evaluate()'s single-flight keys"""
+        redis_client = chat_services["redis_client"]
+        service = chat_services["evaluation_service"]
+        conversation_ids = [client.post("/chat", json={"message": f"Opener {i}"}).json()["conversation_id"] for i in range(4)]
+        service.single_flight = SingleFlight(redis_client)
+        loads = AsyncMock(wraps=redis_client.get_many_messages_since)
+        keys = []
+        do = service.single_flight.do
+        service.single_flight.do = lambda key, *args: keys.append(key) or do(key, *args)
+
+        async def first_result():
+            with patch.object(redis_client, "get_many_messages_since", loads):
+                async for result in service.evaluate_many(conversation_ids, fetch_batch_size=1):
+                    return result, loads.await_count
+
+        result, loaded_batches = asyncio.run(first_result())
+
+        assert result["status"] == "ok"
+        assert loaded_batches < len(conversation_ids)
+        assert keys[0] == f"evaluate:{result['conversation_id']}:incremental"
+
+    def test_batch_topic_filter(self, client, chat_services):
+        """Test that a topic filter selects matching conversations"""
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+
+        response = client.post("/evaluate-persuasiveness/batch", json={"topic": "remote WORK"})
+
+        assert list(self._results(response)) == [conversation_id]
+
+    def test_batch_requires_selection(self, client, chat_services):
+        """Test that an empty batch request is rejected"""
+        response = client.post("/evaluate-persuasiveness/batch", json={})
+
+        assert response.status_code == 422
+
+
+class TestMetrics:
+    """Test the Prometheus metrics endpoint"""
+
+    def test_metrics_expose_chat_latency(self, client, chat_services):
+        """Test that requests and chat stages are timed per route template"""
+        conversation_id = client.post("/chat", json={"message": "Remote work is better"}).json()["conversation_id"]
+        client.post("/chat", json={"conversation_id": conversation_id, "message": "Commutes waste time"})
+
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert 'debater_http_request_seconds_count{method="POST",route="/chat",status="200"}' in response.text
+        assert conversation_id not in response.text
+        for stage in ("topic_detection", "opening", "start_turn", "generate", "persist"):
+            assert f'debater_chat_stage_seconds_count{{stage="{stage}"}}' in response.text
+        assert 'debater_redis_pool_connections{pool="binary",state="in_use"}' in response.text
+
+
 class TestErrorHandling:
     """Test basic error handling"""
 
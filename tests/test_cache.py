@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import patch
+from debater.utils.cache import LRUCache, normalize_text
+from debater.services.topic_cache import TopicCache, topic_cache_key
+
+
+class TestNormalizeText:
+    """Test cache key normalization"""
+
+    def test_folds_case_whitespace_and_punctuation(self):
+        """Test that near-identical openers share a key"""
+        assert normalize_text("Remote work is BETTER than office work!") == \
+            normalize_text("  remote work is better than office-work ")
+
+
+class TestLRUCache:
+    """Test the in-process LRU cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted first"""
+        cache = LRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_expires_entries(self):
+        """Test that entries past their TTL are dropped"""
+        cache = LRUCache(ttl=10)
+        with patch("debater.utils.cache.time.monotonic", return_value=100):
+            cache.set("a", 1)
+        with patch("debater.utils.cache.time.monotonic", return_value=111):
+            assert cache.get("a") is None
+
+
+class TestTopicCache:
+    """Test the two-tier topic detection cache"""
+
+    @pytest.mark.asyncio
+    async def test_local_and_shared_tiers(self, redis_client):
+        """Test that a result stored by one worker is served to another"""
+        result = ("Remote work", "Office work is better", "Remote work is better")
+        writer = TopicCache(redis_client)
+        reader = TopicCache(redis_client)
+
+        await writer.set("gpt-4-turbo", "Remote work is better!", result)
+
+        assert await reader.get("gpt-4-turbo", "remote work is better") == result
+        assert await reader.get("gpt-4-turbo", "Remote work is better") == result
+        assert await reader.get("gpt-4o", "Remote work is better") is None
+        assert reader.stats() == {"local_hits": 1, "redis_hits": 1, "misses": 1, "local_size": 1}
+
+    @pytest.mark.asyncio
+    async def test_shared_entries_expire_individually(self, redis_client):
+        """Test that every shared entry gets its own TTL, so unread entries are evicted"""
+        cache = TopicCache(redis_client, ttl=60)
+
+        await cache.set("gpt-4-turbo", "Remote work is better", ("A", "B", "C"))
+        await cache.set("gpt-4-turbo", "Cats are better", ("D", "E", "F"))
+
+        keys = await redis_client.redis.keys("topic_cache:*")
+        assert len(keys) == 2
+        for key in keys:
+            assert 0 < await redis_client.redis.ttl(key) <= 60
+        assert topic_cache_key("gpt-4-turbo", cache._field("cats are better!")) in keys
@@ -0,0 +1,123 @@
+import asyncio
+import time
+import httpx
+import openai
+import pytest
+from unittest.mock import AsyncMock, Mock
+from debater.services.llm_gateway import LLM_ERRORS, LLM_RETRIES, LLM_SECONDS, LLMGateway
+
+
+def _rate_limit_error():
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    return openai.RateLimitError("Rate limited", response=httpx.Response(429, request=request), body=None)
+
+
+class TestLLMGateway:
+    """Test the shared LLM gateway"""
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limits(self, mock_openai_response):
+        """Test that a 429 is retried with backoff and then succeeds"""
+        gateway = LLMGateway("test-key", backoff_base=0)
+        gateway.client.chat.completions.create = AsyncMock(side_effect=[_rate_limit_error(), mock_openai_response])
+
+        response = await gateway.complete(model="gpt-4-turbo", messages=[])
+
+        assert response is mock_openai_response
+        assert gateway.stats()["retries"] == 1
+        assert gateway.stats()["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        """Test that persistent failures are raised once retries run out"""
+        gateway = LLMGateway("test-key", max_retries=2, backoff_base=0)
+        gateway.client.chat.completions.create = AsyncMock(side_effect=_rate_limit_error())
+
+        with pytest.raises(openai.RateLimitError):
+            await gateway.complete(label="gives_up", model="gpt-4-turbo", messages=[])
+
+        assert gateway.client.chat.completions.create.await_count == 3
+        assert gateway.stats()["errors"] == 1
+        assert LLM_RETRIES.value(label="gives_up", model="gpt-4-turbo") == 2
+        assert LLM_ERRORS.value(label="gives_up", model="gpt-4-turbo", error="RateLimitError") == 1
+        assert LLM_SECONDS.count(label="gives_up", model="gpt-4-turbo") == 1
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_errors(self):
+        """Test that non-retryable errors fail immediately"""
+        gateway = LLMGateway("test-key", backoff_base=0)
+        gateway.client.chat.completions.create = AsyncMock(side_effect=ValueError("bad request"))
+
+        with pytest.raises(ValueError):
+            await gateway.complete(model="gpt-4-turbo", messages=[])
+
+        assert gateway.client.chat.completions.create.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency(self, mock_openai_response):
+        """Test that completions beyond the cap queue and are counted"""
+        gateway = LLMGateway("test-key", max_concurrency=2)
+        active = 0
+        peak = 0
+
+        async def create(**kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return mock_openai_response
+
+        gateway.client.chat.completions.create = create
+
+        await asyncio.gather(*[gateway.complete(model="gpt-4-turbo", messages=[]) for _ in range(6)])
+
+        stats = gateway.stats()
+        assert peak == 2
+        assert stats["requests"] == 6
+        assert stats["max_queue_depth"] == 4
+        assert stats["in_flight"] == 0
+        assert stats["max_wait_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_deadline_covers_queueing(self, mock_openai_response):
+        """Test that a call queued past its deadline fails without waiting for a slot"""
+        gateway = LLMGateway("test-key", max_concurrency=1)
+
+        async def create(**kwargs):
+            await asyncio.sleep(1)
+            return mock_openai_response
+
+        gateway.client.chat.completions.create = create
+        busy = asyncio.ensure_future(gateway.complete(model="gpt-4-turbo", messages=[]))
+        await asyncio.sleep(0)
+
+        started = time.monotonic()
+        with pytest.raises(openai.APITimeoutError):
+            await gateway.complete(timeout=0.05, model="gpt-4-turbo", messages=[])
+        with pytest.raises(openai.APITimeoutError):
+            async for _ in gateway.stream(timeout=0.05, model="gpt-4-turbo", messages=[]):
+                pass
+
+        assert time.monotonic() - started < 0.5
+        assert gateway.stats()["queue_depth"] == 0
+        busy.cancel()
+
+    @pytest.mark.asyncio
+    async def test_records_cached_prompt_tokens(self, mock_openai_response):
+        """Test that cached and uncached prompt tokens are tracked per label"""
+        gateway = LLMGateway("test-key")
+        mock_openai_response.usage = Mock(prompt_tokens=1200, completion_tokens=80)
+        mock_openai_response.usage.prompt_tokens_details.cached_tokens = 1024
+        gateway.client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+
+        await gateway.complete(label="debate", model="gpt-4-turbo", messages=[])
+        await gateway.complete(label="debate", model="gpt-4-turbo", messages=[])
+
+        assert gateway.stats()["usage"]["debate"] == {
+            "calls": 2,
+            "prompt_tokens": 2400,
+            "cached_tokens": 2048,
+            "completion_tokens": 160,
+            "cached_ratio": 2048 / 2400
+        }
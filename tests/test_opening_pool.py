@@ -0,0 +1,49 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+from debater.services.debate_service import DebateService
+from debater.services.opening_pool import OpeningPool, POPULARITY_KEY
+
+
+@pytest.fixture
+def opening_pool(redis_client):
+    """Opening pool with a mocked opening generator"""
+    debate_service = DebateService("test-key")
+    debate_service.generate_opening_argument = AsyncMock(side_effect=[f"Opening {i}" for i in range(100)])
+    return OpeningPool(redis_client, debate_service, pool_size=3)
+
+
+class TestOpeningPool:
+    """Test the pre-generated opening argument pool"""
+
+    @pytest.mark.asyncio
+    async def test_miss_generates_and_pools(self, opening_pool):
+        """Test that a miss falls back to live generation and pools the result"""
+        first = await opening_pool.get_opening("Remote work", "Office work is better")
+        second = await opening_pool.get_opening("remote work!", "office work is better")
+
+        assert first == second == "Opening 0"
+        assert opening_pool.debate_service.generate_opening_argument.await_count == 1
+        assert opening_pool.stats() == {"hits": 1, "misses": 1}
+
+    @pytest.mark.asyncio
+    async def test_fallback_is_not_pooled(self, opening_pool):
+        """Test that the canned fallback argument never enters the pool"""
+        fallback = opening_pool.debate_service._opening_fallback("Office work is better")
+        opening_pool.debate_service.generate_opening_argument = AsyncMock(return_value=fallback)
+
+        await opening_pool.get_opening("Remote work", "Office work is better")
+
+        assert await opening_pool.take("Remote work", "Office work is better") is None
+
+    @pytest.mark.asyncio
+    async def test_warm_fills_popular_and_evicts_unpopular(self, opening_pool, redis_client):
+        """Test that the warmer fills popular subjects and drops rarely requested ones"""
+        for _ in range(4):
+            await opening_pool.take("Remote work", "Office work is better")
+        await opening_pool.take("Cats", "Dogs are better")
+
+        generated = await opening_pool.warm()
+
+        assert generated == 3
+        assert await opening_pool.take("Remote work", "Office work is better") is not None
+        assert await redis_client.redis.zcard(POPULARITY_KEY) == 1
@@ -0,0 +1,291 @@
+import json
+import time
+import pytest
+import fakeredis
+from unittest.mock import AsyncMock, Mock, patch
+from debater.models.conversation import Role
+from debater.utils.codec import FORMAT_MSGPACK, FORMAT_MSGPACK_ZLIB, decode_message, encode_message
+from debater.utils.redis_client import ACTIVITY_KEY, REDIS_SECONDS, InstrumentedRedis, RedisClient
+from debater.utils import serialization
+from debater.tools.migrate_encoding import migrate
+from debater.models.conversation import ConversationSummary
+from debater.services.conversation_archiver import ConversationArchiver
+from debater.services.evaluation_cache import EvaluationCache
+from debater.services.evaluation_service import EvaluationService
+
+
+class TestRedisClient:
+    """Test the asyncio redis conversation store"""
+
+    @pytest.mark.asyncio
+    async def test_create_and_get_conversation(self, redis_client):
+        """Test that a created conversation can be read back"""
+        conversation = await redis_client.create_conversation("Remote work", "Office work is better", "Remote work is better")
+
+        assert redis_client.redis.round_trips == 1
+        assert [msg.message for msg in conversation.messages] == ["Remote work is better"]
+
+        stored = await redis_client.get_conversation(conversation.conversation_id)
+        assert stored.topic == "Remote work"
+        assert stored.bot_position == "Office work is better"
+        assert [msg.role for msg in stored.messages] == [Role.USER]
+
+    @pytest.mark.asyncio
+    async def test_add_message_keeps_last_50(self, redis_client):
+        """Test that the message list is capped at 50 entries"""
+        for i in range(55):
+            await redis_client.add_message("conv-1", Role.USER, f"message {i}")
+
+        messages = await redis_client.get_conversation_messages("conv-1")
+        assert len(messages) == 50
+        assert messages[0].message == "message 5"
+        assert messages[-1].message == "message 54"
+
+    @pytest.mark.asyncio
+    async def test_add_message_single_round_trip(self, redis_client):
+        """Test that appending a message costs exactly one round trip"""
+        redis_client.redis.round_trips = 0
+
+        await redis_client.add_message("conv-1", Role.USER, "Hello")
+
+        assert redis_client.redis.round_trips == 1
+
+    @pytest.mark.asyncio
+    async def test_add_message_returns_window_and_refreshes_ttl(self, redis_client):
+        """Test that the append returns the newest messages and sets the TTL"""
+        for i in range(12):
+            window = await redis_client.add_message("conv-1", Role.BOT, f"message {i}", window=3)
+
+        assert [msg.message for msg in window] == ["message 9", "message 10", "message 11"]
+        assert await redis_client.redis.ttl("conv_messages:conv-1") > 0
+
+    @pytest.mark.asyncio
+    async def test_windowed_reads(self, redis_client):
+        """Test that tail and range reads return only the requested slice"""
+        for i in range(8):
+            await redis_client.add_message("conv-1", Role.USER, f"message {i}")
+
+        recent = await redis_client.get_recent_messages("conv-1", 3)
+        page = await redis_client.get_messages_range("conv-1", 2, 4)
+
+        assert [msg.message for msg in recent] == ["message 5", "message 6", "message 7"]
+        assert [msg.message for msg in page] == ["message 2", "message 3", "message 4"]
+        assert await redis_client.get_recent_messages("conv-1", 0) == []
+
+    @pytest.mark.asyncio
+    async def test_start_turn_missing_conversation(self, redis_client):
+        """Test that a turn on an unknown conversation writes nothing"""
+        assert await redis_client.start_turn("missing", "Hello") is None
+        assert await redis_client.redis.exists("conv_messages:missing") == 0
+
+    @pytest.mark.asyncio
+    async def test_start_turn_appends_and_returns_window(self, redis_client):
+        """Test that a turn appends the user message and returns metadata plus history"""
+        conversation = await redis_client.create_conversation("Topic", "Position", "First")
+        await redis_client.add_message(conversation.conversation_id, Role.BOT, "Opening")
+        await redis_client.start_turn(conversation.conversation_id, "Warm up the script cache")
+        redis_client.redis.round_trips = 0
+
+        turn = await redis_client.start_turn(conversation.conversation_id, "Second", history_size=2)
+
+        assert redis_client.redis.round_trips == 1
+        assert turn.topic == "Topic"
+        assert turn.bot_position == "Position"
+        assert [msg.message for msg in turn.messages] == ["Warm up the script cache", "Second"]
+
+    @pytest.mark.asyncio
+    async def test_get_many_messages_since_is_pipelined(self, redis_client):
+        """Test that many conversations are loaded in one round trip"""
+        first = await redis_client.create_conversation("Topic", "Position", "One")
+        second = await redis_client.create_conversation("Topic", "Position", "Two")
+        await redis_client.add_message(second.conversation_id, Role.BOT, "Reply")
+        redis_client.redis.round_trips = 0
+
+        results = await redis_client.get_many_messages_since([
+            (first.conversation_id, 0),
+            (second.conversation_id, 1),
+            ("missing", 0)
+        ])
+
+        assert redis_client.redis.round_trips == 1
+        assert [msg.message for msg in results[0][0].messages] == ["One"]
+        assert results[1][1] == 2
+        assert [msg.message for msg in results[1][0].messages] == ["Reply"]
+        assert results[2] is None
+
+    @pytest.mark.asyncio
+    async def test_delete_conversation(self, redis_client):
+        """Test that deleting a conversation removes metadata and messages"""
+        conversation = await redis_client.create_conversation("Topic", "Position", "Hello")
+
+        await redis_client.delete_conversation(conversation.conversation_id)
+
+        assert await redis_client.get_conversation(conversation.conversation_id) is None
+        assert await redis_client.get_conversation_messages(conversation.conversation_id) == []
+
+    @pytest.mark.asyncio
+    async def test_health_check(self, redis_client):
+        """Test health check against a reachable server"""
+        assert await redis_client.health_check() is True
+
+    @pytest.mark.asyncio
+    async def test_commands_and_pipelines_are_timed(self):
+        """Test that every round trip is observed under its command name"""
+        fake = fakeredis.FakeAsyncRedis(decode_responses=True)
+        client = InstrumentedRedis(connection_pool=fake.connection_pool)
+        before = {command: REDIS_SECONDS.count(command=command) for command in ("SET", "MULTI", "PIPELINE")}
+
+        await client.set("a", 1)
+        pipe = client.pipeline(transaction=True)
+        pipe.get("a")
+        pipe.incr("a")
+        assert await pipe.execute() == ["1", 2]
+        await client.pipeline(transaction=False).get("a").execute()
+
+        assert REDIS_SECONDS.count(command="SET") == before["SET"] + 1
+        assert REDIS_SECONDS.count(command="MULTI") == before["MULTI"] + 1
+        assert REDIS_SECONDS.count(command="PIPELINE") == before["PIPELINE"] + 1
+
+    @pytest.mark.asyncio
+    async def test_reads_legacy_json_entries(self, redis_client):
+        """Test that conversations stored as JSON, without a message count, are still readable"""
+        await redis_client.redis.set("conv_meta:old", json.dumps({"topic": "T", "bot_position": "P", "first_message": "Hi"}))
+        for role, message in [("user", "Hi"), ("bot", "Hello"), ("user", "Why?"), ("bot", "Because")]:
+            await redis_client.redis.rpush("conv_messages:old", json.dumps({"role": role, "message": message}))
+
+        evaluator = Mock(model="gpt-4-turbo")
+        evaluator.evaluate_conversation = AsyncMock(return_value={"scores": {"overall_persuasiveness": 7}})
+        evaluation = await EvaluationService(redis_client, evaluator, EvaluationCache(redis_client)).evaluate("old")
+
+        assert evaluation["message_count"] == 4
+        assert len(evaluator.evaluate_conversation.call_args.kwargs["conversation_messages"]) == 4
+
+        conversation = await redis_client.start_turn("old", "Still here")
+
+        assert conversation.topic == "T"
+        assert conversation.message_count == 5
+        assert [msg.message for msg in conversation.messages] == ["Hi", "Hello", "Why?", "Because", "Still here"]
+
+
+class TestColdStorage:
+    """Test archiving idle conversations and restoring them on lookup"""
+
+    @pytest.mark.asyncio
+    async def test_archived_conversation_is_restored_on_lookup(self, cold_redis_client):
+        """Test that an archived conversation leaves redis and reads back unchanged"""
+        conversation = await cold_redis_client.create_conversation("Remote work", "Offices are better", "Hi")
+        cid = conversation.conversation_id
+        await cold_redis_client.add_message(cid, Role.BOT, "Offices build teams. " * 20)
+        await cold_redis_client.set_conversation_summary(cid, ConversationSummary(text="Earlier", covered=2))
+
+        assert await cold_redis_client.archive_conversation(cid, time.time() + 1)
+        assert not await cold_redis_client.redis.exists(f"conv_meta:{cid}", f"conv_messages:{cid}", f"conv_count:{cid}")
+        assert await cold_redis_client.redis.zscore(ACTIVITY_KEY, cid) is None
+
+        restored = await cold_redis_client.get_conversation(cid)
+
+        assert restored.topic == "Remote work"
+        assert [msg.message for msg in restored.messages] == ["Hi", "Offices build teams. " * 20]
+        assert (await cold_redis_client.get_conversation_summary(cid)).text == "Earlier"
+        assert await cold_redis_client.redis.zscore(ACTIVITY_KEY, cid) is not None
+
+    @pytest.mark.asyncio
+    async def test_start_turn_restores_archived_conversation(self, cold_redis_client):
+        """Test that a turn on an archived conversation continues its count"""
+        conversation = await cold_redis_client.create_conversation("T", "P", "Hi")
+        await cold_redis_client.archive_conversation(conversation.conversation_id, time.time() + 1)
+
+        resumed = await cold_redis_client.start_turn(conversation.conversation_id, "Back again")
+
+        assert [msg.message for msg in resumed.messages] == ["Hi", "Back again"]
+        assert resumed.message_count == 2
+        assert await cold_redis_client.start_turn("missing", "Hello") is None
+
+    def test_unshared_cold_store_stays_off(self, mock_settings, tmp_path):
+        """Test that the tier is only enabled on storage declared shared by every replica"""
+        path = str(tmp_path / "conversations.db")
+
+        unshared = RedisClient(mock_settings.model_copy(update={"cold_store_enabled": True, "cold_store_path": path}))
+        shared = RedisClient(mock_settings.model_copy(update={"cold_store_enabled": True, "cold_store_shared": True, "cold_store_path": path}))
+
+        assert unshared.cold_store is None
+        assert shared.cold_store is not None
+        shared.cold_store.close()
+
+    def test_pools_share_the_connection_budget(self, mock_settings):
+        """Test that the text and binary pools together stay within REDIS_MAX_CONNECTIONS"""
+        client = RedisClient(mock_settings.model_copy(update={"redis_max_connections": 9}))
+
+        assert client.pool.max_connections == 5
+        assert client.binary_pool.max_connections == 4
+
+    @pytest.mark.asyncio
+    async def test_no_activity_is_recorded_without_cold_store(self, redis_client):
+        """Test that with the tier off no conversation leaves an entry behind"""
+        conversation = await redis_client.create_conversation("T", "P", "Hi")
+        await redis_client.add_message(conversation.conversation_id, Role.BOT, "Hello")
+        await redis_client.start_turn(conversation.conversation_id, "Again")
+
+        assert not await redis_client.redis.exists(ACTIVITY_KEY)
+
+    @pytest.mark.asyncio
+    async def test_sweep_archives_only_idle_conversations(self, cold_redis_client):
+        """Test that the archiver skips conversations written since the cutoff"""
+        idle = await cold_redis_client.create_conversation("Idle", "P", "Hi")
+        active = await cold_redis_client.create_conversation("Active", "P", "Hi")
+        await cold_redis_client.redis.zadd(ACTIVITY_KEY, {idle.conversation_id: time.time() - 3600})
+
+        archiver = ConversationArchiver(cold_redis_client, idle_seconds=60)
+
+        assert await archiver.sweep() == 1
+        assert await cold_redis_client.cold_store.count() == 1
+        assert await cold_redis_client.redis.exists(f"conv_meta:{active.conversation_id}")
+        assert await cold_redis_client.find_conversations_by_topic("idle") == [idle.conversation_id]
+
+        # Written after the cutoff it was selected with, the conversation stays
+        assert not await cold_redis_client.archive_conversation(active.conversation_id, time.time() - 60)
+
+
+class TestCodec:
+    """Test the compact message encoding"""
+
+    def test_round_trip_and_compression(self):
+        """Test that short messages are packed and long ones compressed"""
+        short = encode_message(Role.USER, "Hello")
+        long = encode_message(Role.BOT, "Offices build better teams. " * 20)
+
+        assert short[0] == FORMAT_MSGPACK
+        assert len(short) < len(json.dumps({"role": "user", "message": "Hello"}))
+        assert long[0] == FORMAT_MSGPACK_ZLIB
+        assert decode_message(short) == (Role.USER, "Hello")
+        assert decode_message(long) == (Role.BOT, "Offices build better teams. " * 20)
+
+    def test_json_without_orjson(self):
+        """Test that the standard library fallback writes and reads the same JSON"""
+        entry = {"digest": "abc", "evaluation": {"scores": {"clarity": 7}}, "summary": "Très bien"}
+        fast = serialization.dumps(entry)
+
+        with patch.object(serialization, "orjson", None):
+            assert serialization.dumps(entry) == fast
+            assert serialization.loads(fast) == entry
+        assert serialization.loads(fast.decode("utf-8")) == entry
+
+    @pytest.mark.asyncio
+    async def test_migration(self, redis_client):
+        """Test that the migration re-encodes legacy entries and keeps TTLs"""
+        await redis_client.redis.set("conv_meta:old", json.dumps({"topic": "T", "bot_position": "P", "first_message": "Hi"}), ex=100)
+        await redis_client.redis.rpush("conv_messages:old", json.dumps({"role": "user", "message": "Hi"}))
+        await redis_client.redis.expire("conv_messages:old", 100)
+        await redis_client.create_conversation("New", "Position", "Hello")
+
+        stats = await migrate(redis_client)
+
+        assert stats["conversations"] == 2
+        assert stats["metadata"] == 1
+        assert stats["messages"] == 1
+        assert stats["bytes_after"] < stats["bytes_before"]
+        assert (await redis_client.binary.lindex("conv_messages:old", 0))[0] == FORMAT_MSGPACK
+        assert await redis_client.redis.ttl("conv_messages:old") > 0
+        assert await redis_client.redis.ttl("conv_meta:old") > 0
+        assert (await redis_client.get_conversation("old")).messages[0].message == "Hi"
+        assert (await migrate(redis_client))["messages"] == 0
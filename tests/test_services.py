@@ -0,0 +1,278 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock
+from debater.services.ai_topic_detector import AITopicDetector
+from debater.models.conversation import Role
+from debater.services.context_builder import ContextBuilder, estimate_tokens
+from debater.services.conversation_summarizer import ConversationSummarizer
+from debater.services.debate_service import DebateService
+from debater.services.persuasiveness_evaluator import PersuasivenessEvaluator
+from debater.services.topic_cache import TopicCache
+from debater.services.structured_output import LLM_PARSE_RESULTS, StructuredOutputError, parse_completion, repair_json
+from debater.models.llm_output import Evaluation, TopicDetection
+
+# A complete set of evaluation scores, as the prompt asks for
+SCORES = {
+    "logical_coherence": 8,
+    "evidence_usage": 7,
+    "emotional_appeal": 6,
+    "counter_argument_handling": 8,
+    "clarity_structure": 7,
+    "overall_persuasiveness": 7
+}
+
+
+class TestDebateService:
+    """Test async debate response generation"""
+
+    @pytest.mark.asyncio
+    async def test_generate_debate_response(self, mock_openai_response):
+        """Test that the completion content is returned"""
+        service = DebateService("test-key")
+        service.gateway.client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+
+        response = await service.generate_debate_response("Topic", "Position", [{"role": "user", "content": "Hi"}])
+
+        assert response == "This is a test response"
+        service.gateway.client.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_prompt_prefix_is_static(self, mock_openai_response):
+        """Test that request-specific content only appears after the system prefix"""
+        service = DebateService("test-key")
+        service.gateway.client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+
+        await service.generate_debate_response("Cats", "Cats are better", [{"role": "user", "content": "Dogs!"}])
+        await service.generate_debate_response("Tea", "Tea is better", [{"role": "user", "content": "Coffee!"}])
+
+        first, second = [call.kwargs["messages"] for call in service.gateway.client.chat.completions.create.call_args_list]
+        assert first[0] == second[0]
+        assert first[0]["role"] == "system"
+        assert "Cats are better" in first[-1]["content"] and "Dogs!" in first[-1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_generate_opening_argument_fallback(self):
+        """Test that a failed completion falls back to a canned argument"""
+        service = DebateService("test-key")
+        service.gateway.client.chat.completions.create = AsyncMock(side_effect=RuntimeError("boom"))
+
+        response = await service.generate_opening_argument("Topic", "cats are better")
+
+        assert "cats are better" in response
+
+
+    @pytest.mark.asyncio
+    async def test_stream_opening_argument(self):
+        """Test that streamed deltas are yielded as they arrive"""
+        async def chunks():
+            for token in ["I ", None, "believe"]:
+                chunk = Mock()
+                chunk.choices = [Mock()]
+                chunk.choices[0].delta.content = token
+                yield chunk
+
+        service = DebateService("test-key")
+        service.gateway.client.chat.completions.create = AsyncMock(return_value=chunks())
+
+        tokens = [token async for token in service.stream_opening_argument("Topic", "Position")]
+
+        assert tokens == ["I ", "believe"]
+        assert service.gateway.client.chat.completions.create.call_args.kwargs["stream"] is True
+
+    @pytest.mark.asyncio
+    async def test_stream_debate_response_fallback(self):
+        """Test that a failed stream yields the fallback response"""
+        service = DebateService("test-key")
+        service.gateway.client.chat.completions.create = AsyncMock(side_effect=RuntimeError("boom"))
+
+        tokens = [token async for token in service.stream_debate_response("Topic", "cats are better")]
+
+        assert len(tokens) == 1
+        assert "cats are better" in tokens[0]
+
+
+class TestContextBuilder:
+    """Test token-budgeted prompt history"""
+
+    def test_fits_newest_messages_to_budget(self):
+        """Test that the newest messages are kept and huge ones truncated"""
+        builder = ContextBuilder(token_budget=100, message_tokens=40)
+        history = [{"role": "user", "content": f"Point {i} " + "x" * 60} for i in range(10)]
+        history.append({"role": "user", "content": "y" * 1000})
+
+        selected = builder.build(history, summary="Earlier, commutes were discussed.")
+
+        assert selected["history"][-1]["content"].startswith("y")
+        assert "[...]" in selected["history"][-1]["content"]
+        assert selected["omitted"] == len(history) - len(selected["history"])
+        used = sum(estimate_tokens(msg["content"]) for msg in selected["history"]) + estimate_tokens(selected["summary"])
+        assert used <= 100
+
+
+class TestConversationSummarizer:
+    """Test the rolling conversation summary"""
+
+    @pytest.mark.asyncio
+    async def test_folds_older_turns(self, redis_client):
+        """Test that everything but the recent window is folded into the summary"""
+        debate_service = Mock()
+        debate_service.summarize = AsyncMock(return_value="Commutes were discussed.")
+        summarizer = ConversationSummarizer(redis_client, debate_service, recent_messages=4, batch=3)
+        conversation = await redis_client.create_conversation("Remote work", "Office work is better", "Remote work is better")
+        for i in range(7):
+            await redis_client.add_message(conversation.conversation_id, Role.BOT, f"message {i}")
+
+        turn = await redis_client.start_turn(conversation.conversation_id, "One more")
+        assert summarizer.pending(turn) == 5
+        assert await summarizer.update(turn)
+
+        folded = debate_service.summarize.call_args[0][3]
+        assert [msg["content"] for msg in folded] == ["Remote work is better", "message 0", "message 1", "message 2", "message 3"]
+        summary = await redis_client.get_conversation_summary(conversation.conversation_id)
+        assert summary.text == "Commutes were discussed."
+        assert summary.covered == 5
+
+        turn = await redis_client.start_turn(conversation.conversation_id, "Another")
+        assert turn.summary == summary
+        assert summarizer.pending(turn) == 1
+        assert not await summarizer.update(turn)
+
+
+class TestStructuredOutput:
+    """Test schema validation and repair of JSON completions"""
+
+    def test_repairs_fenced_and_truncated_json(self):
+        """Test that fences, prose and a cut-off tail are recovered without another call"""
+        assert repair_json('```json\n{"topic": "Tea"}\n```') == {"topic": "Tea"}
+        assert repair_json('Here you go: {"topic": "Tea"} Enjoy!') == {"topic": "Tea"}
+        assert repair_json('{"scores": {"clarity_structure": 8}, "analysis": {"strengths": ["Clear", "Vivid ex') == {
+            "scores": {"clarity_structure": 8},
+            "analysis": {"strengths": ["Clear", "Vivid ex"]}
+        }
+        assert repair_json('{"scores": {"clarity_structure": 8}, "summ') == {"scores": {"clarity_structure": 8}}
+        assert repair_json("I cannot help with that") is None
+
+    def test_parse_outcomes_are_counted(self):
+        """Test that clean, repaired and failed parses are counted separately"""
+        before = {outcome: LLM_PARSE_RESULTS.value(label="test", outcome=outcome) for outcome in ("ok", "repaired", "failed")}
+
+        out_of_range = json.dumps({"scores": dict(SCORES, overall_persuasiveness=12)})
+        parse_completion("test", out_of_range, Evaluation)
+        result = parse_completion("test", '```json\n{"scores": ' + json.dumps(SCORES) + ', "summary": "Go', Evaluation)
+        with pytest.raises(StructuredOutputError):
+            parse_completion("test", '{"topic": "Tea"}', TopicDetection)
+        # A truncated reply missing criteria is not passed off as a partial evaluation
+        with pytest.raises(StructuredOutputError):
+            parse_completion("test", '{"scores": {"logical_coherence": 8, "evid', Evaluation)
+
+        assert result.model_dump()["scores"] == SCORES
+        assert parse_completion("test", out_of_range, Evaluation).scores.overall_persuasiveness == 10
+        assert LLM_PARSE_RESULTS.value(label="test", outcome="ok") == before["ok"] + 2
+        assert LLM_PARSE_RESULTS.value(label="test", outcome="repaired") == before["repaired"] + 1
+        assert LLM_PARSE_RESULTS.value(label="test", outcome="failed") == before["failed"] + 2
+
+
+class TestAITopicDetector:
+    """Test async topic detection"""
+
+    @pytest.mark.asyncio
+    async def test_detect_topic_and_position(self, mock_openai_response):
+        """Test that the JSON completion is unpacked"""
+        mock_openai_response.choices[0].message.content = json.dumps({
+            "topic": "Remote work",
+            "bot_position": "Office work is better",
+            "user_position": "Remote work is better"
+        })
+        detector = AITopicDetector("test-key")
+        detector.gateway.client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+
+        result = await detector.detect_topic_and_position("Remote work is better")
+
+        assert result == ("Remote work", "Office work is better", "Remote work is better")
+        assert detector.gateway.client.chat.completions.create.call_args.kwargs["response_format"] == {"type": "json_object"}
+
+    @pytest.mark.asyncio
+    async def test_detect_topic_recovers_fenced_reply(self, mock_openai_response):
+        """Test that a fenced reply is parsed instead of failing the turn"""
+        mock_openai_response.choices[0].message.content = "```json\n" + json.dumps({
+            "topic": "Remote work",
+            "bot_position": "Office work is better",
+            "user_position": "Remote work is better"
+        }) + "\n```"
+        detector = AITopicDetector("test-key")
+        detector.gateway.client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+
+        result = await detector.detect_topic_and_position("Remote work is better")
+
+        assert result == ("Remote work", "Office work is better", "Remote work is better")
+
+
+    @pytest.mark.asyncio
+    async def test_detect_topic_uses_cache(self, mock_openai_response, redis_client):
+        """Test that a repeated opener does not call the model again"""
+        mock_openai_response.choices[0].message.content = json.dumps({
+            "topic": "Remote work",
+            "bot_position": "Office work is better",
+            "user_position": "Remote work is better"
+        })
+        detector = AITopicDetector("test-key", cache=TopicCache(redis_client))
+        detector.gateway.client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+
+        first = await detector.detect_topic_and_position("Remote work is better")
+        second = await detector.detect_topic_and_position("remote work is better!")
+
+        assert first == second
+        detector.gateway.client.chat.completions.create.assert_awaited_once()
+
+
+class TestPersuasivenessEvaluator:
+    """Test async persuasiveness evaluation"""
+
+    @pytest.mark.asyncio
+    async def test_evaluate_without_bot_messages(self):
+        """Test that conversations without bot messages are not sent to the model"""
+        evaluator = PersuasivenessEvaluator("test-key")
+        evaluator.gateway.client.chat.completions.create = AsyncMock()
+
+        result = await evaluator.evaluate_conversation([{"role": "user", "message": "Hi"}], "Topic", "Position")
+
+        assert result["scores"] is None
+        evaluator.gateway.client.chat.completions.create.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_evaluate_incremental_merges_scores(self, mock_openai_response):
+        """Test that new-turn scores are weighted by bot turns and merged"""
+        mock_openai_response.choices[0].message.content = json.dumps({
+            "scores": dict(SCORES, overall_persuasiveness=9),
+            "analysis": {"strengths": ["Vivid example"]},
+            "summary": "Improving"
+        })
+        evaluator = PersuasivenessEvaluator("test-key")
+        evaluator.gateway.client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+        previous = {
+            "scores": dict(SCORES, overall_persuasiveness=6),
+            "analysis": {"strengths": ["Clear structure"]},
+            "summary": "Solid"
+        }
+
+        result = await evaluator.evaluate_incremental(
+            [{"role": "user", "message": "Hi"}, {"role": "bot", "message": "Hello"}],
+            "Topic", "Position", previous, previous_bot_turns=2
+        )
+
+        assert result["scores"] == dict(SCORES, overall_persuasiveness=7.0)
+        assert result["analysis"] == {"strengths": ["Vivid example", "Clear structure"]}
+        prompt = evaluator.gateway.client.chat.completions.create.call_args.kwargs["messages"][-1]["content"]
+        assert "Bot: Hello" in prompt
+        assert "Clear structure" in prompt
+
+    def test_merge_keeps_criteria_and_summary_missing_from_new_reply(self):
+        """Test that a criterion or summary absent from the new evaluation is carried over"""
+        evaluator = PersuasivenessEvaluator("test-key")
+        previous = {"scores": {"logical_coherence": 7, "evidence_usage": 6, "emotional_appeal": 5}, "summary": "Solid"}
+        new = {"scores": {"logical_coherence": 4, "clarity_structure": 8}, "summary": ""}
+
+        merged = evaluator._merge_evaluations(previous, 2, new, 1)
+
+        assert merged["scores"] == {"logical_coherence": 6.0, "clarity_structure": 8, "evidence_usage": 6, "emotional_appeal": 5}
+        assert merged["summary"] == "Solid"
@@ -0,0 +1,134 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from debater.utils.locks import RedisLock
+from debater.utils.single_flight import SingleFlight
+from debater.services.ai_topic_detector import AITopicDetector
+from debater.services.topic_cache import TopicCache
+
+
+class TestRedisLock:
+    """Test the cross-worker redis lock"""
+
+    @pytest.mark.asyncio
+    async def test_only_owner_releases(self, redis_client):
+        """Test that the lock is exclusive and only its owner can release it"""
+        first = RedisLock(redis_client, "lock:test")
+        second = RedisLock(redis_client, "lock:test")
+
+        assert await first.acquire()
+        assert not await second.acquire()
+        assert not await second.release()
+        assert await second.locked()
+
+        assert await first.release()
+        assert not await first.locked()
+        assert await second.acquire()
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_extends_only_owned_lock(self, redis_client):
+        """Test that a held lock outlives its TTL while kept alive, and a lost one is left alone"""
+        lock = RedisLock(redis_client, "lock:test", ttl_ms=150)
+        other = RedisLock(redis_client, "lock:test", ttl_ms=150)
+        assert await lock.acquire()
+
+        keeper = asyncio.ensure_future(lock.keep_alive(interval=0.05))
+        await asyncio.sleep(0.3)
+        assert await redis_client.redis.get("lock:test") == lock.token
+        keeper.cancel()
+
+        await lock.release()
+        assert await other.acquire()
+        assert not await lock.extend()
+        assert await redis_client.redis.get("lock:test") == other.token
+
+
+class TestSingleFlight:
+    """Test request coalescing"""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_concurrent_calls(self, redis_client):
+        """Test that concurrent callers with the same key share one call"""
+        single_flight = SingleFlight(redis_client)
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*[single_flight.do("key", work) for _ in range(5)])
+
+        assert results == [1] * 5
+        assert calls == 1
+        assert single_flight.stats() == {"leaders": 1, "local_followers": 4, "remote_waits": 0, "in_flight": 0}
+        # The lock is released once the leader finishes
+        assert await single_flight.do("key", work) == 2
+
+    @pytest.mark.asyncio
+    async def test_shares_errors(self):
+        """Test that followers receive the leader's exception"""
+        single_flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(*[single_flight.do("key", work) for _ in range(3)], return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert single_flight.stats()["leaders"] == 1
+
+    @pytest.mark.asyncio
+    async def test_waits_for_other_worker(self, redis_client):
+        """Test that a worker waits on another worker's lock and rechecks"""
+        leader = SingleFlight(redis_client)
+        follower = SingleFlight(redis_client, poll_interval=0.01)
+        shared = {}
+
+        async def lead():
+            await asyncio.sleep(0.05)
+            shared["result"] = "done"
+            return "done"
+
+        async def recheck():
+            return shared.get("result")
+
+        work = AsyncMock(return_value="recomputed")
+        leader_task = asyncio.ensure_future(leader.do("key", lead))
+        await asyncio.sleep(0.01)
+
+        assert await follower.do("key", work, recheck=recheck) == "done"
+        assert await leader_task == "done"
+        work.assert_not_awaited()
+        assert follower.stats()["remote_waits"] == 1
+
+
+class TestTopicDetectionCoalescing:
+    """Test that identical openers share one detection"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_messages(self, redis_client, mock_openai_response):
+        """Test that concurrent detections of the same message make one completion"""
+        mock_openai_response.choices[0].message.content = \
+            '{"topic": "Remote work", "bot_position": "Office work is better", "user_position": "Remote work is better"}'
+        detector = AITopicDetector(
+            api_key="test-key",
+            cache=TopicCache(redis_client),
+            single_flight=SingleFlight(redis_client)
+        )
+
+        async def create(**kwargs):
+            await asyncio.sleep(0.01)
+            return mock_openai_response
+
+        detector.gateway.client.chat.completions.create = AsyncMock(side_effect=create)
+
+        results = await asyncio.gather(*[
+            detector.detect_topic_and_position(message)
+            for message in ["Remote work is better!", "remote work is better", "Remote work is better"]
+        ])
+
+        assert len(set(results)) == 1
+        assert detector.gateway.client.chat.completions.create.await_count == 1